@@ -0,0 +1,264 @@
+"""Versioned JSON API for creating and managing WISPs without the wizard.
+
+Every request needs an "Authorization: Bearer <token>" header with one of the
+tokens in API_TOKENS. WISP answers use the wizard field names in the same
+format as the JSON Lines import and export, and are checked with the wizard
+forms' validation rules (wisp_import.RowValidator).
+"""
+import hmac
+import io
+from flask import Blueprint, current_app, jsonify, request, abort, send_file, url_for
+from sqlalchemy import select, update, null
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import HTTPException
+from models import db, WISP, ArchivedWISP
+from wisp_import import RowValidator, insert_wisps
+from wisp_export import export_schema, flatten_wisp, RECORD_COLUMNS
+from archive import archived_pdf
+from pdf_engines import ENGINES, TEMPLATES, DEFAULT_TEMPLATE, render_options
+from render_limiter import RenderBusy, INTERACTIVE, BULK
+from memory_profile import RenderMemoryExceeded
+
+api = Blueprint('api_v1', __name__, url_prefix='/api/v1')
+
+MAX_BATCH_SIZE = 500
+MAX_PAGE_SIZE = 500
+
+@api.before_request
+def require_token():
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    valid = scheme.lower() == 'bearer' and any(
+        hmac.compare_digest(token.encode('utf-8'), allowed.encode('utf-8'))
+        for allowed in current_app.config['API_TOKENS']
+    )
+    if not valid:
+        response = jsonify(error='A valid API token is required')
+        response.status_code = 401
+        response.headers['WWW-Authenticate'] = 'Bearer'
+        return response
+
+@api.errorhandler(HTTPException)
+def http_error(error):
+    return jsonify(error=error.description), error.code
+
+@api.errorhandler(IntegrityError)
+def conflict(error):
+    db.session.rollback()
+    return jsonify(error='The answers are the same as another WISP\'s'), 409
+
+@api.errorhandler(RenderMemoryExceeded)
+def render_memory_exceeded(error):
+    current_app.logger.warning('%s (%s)', error, request.path)
+    return jsonify(error='This PDF needs more memory than renders are allowed'), 500
+
+@api.errorhandler(RenderBusy)
+def render_busy(error):
+    response = jsonify(error=str(error))
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def _json_body(kind=dict):
+    body = request.get_json(silent=True)
+    if not isinstance(body, kind):
+        abort(400, f"Request body must be a JSON {'object' if kind is dict else 'array'}")
+    return body
+
+def _batch(body, key):
+    items = body.get(key)
+    if not isinstance(items, list) or not items:
+        abort(400, f'"{key}" must be a non-empty array')
+    if len(items) > MAX_BATCH_SIZE:
+        abort(413, f'Batches are limited to {MAX_BATCH_SIZE} items')
+    return items
+
+def _is_id(value):
+    # JSON true/false arrive as bool, which is an int subclass
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _validate(validator, answers):
+    """Return (wisp_data, errors) for a dict of answers, rejecting unknown
+    fields and the record fields (id, created_at, updated_at), which are not answers"""
+    if not isinstance(answers, dict):
+        return None, {'wisp': ['Must be a JSON object']}
+    fields = set(export_schema()[0]) - set(RECORD_COLUMNS)
+    wisp_data, errors = validator.validate(answers)
+    errors.update({name: ['Unknown field'] for name in answers if name not in fields})
+    return wisp_data, errors
+
+def _current_answers(wisp):
+    """Stored answers in the API's input format, as the base for a partial update"""
+    record = flatten_wisp(wisp)
+    for column in RECORD_COLUMNS:
+        del record[column]
+    return record
+
+def _update(wisp, wisp_data):
+    wisp.company_name = wisp_data['company_name']
+    wisp.set_data(wisp_data)
+
+def _record(wisp):
+    record = flatten_wisp(wisp)
+    record['archived'] = isinstance(wisp, ArchivedWISP)
+    record['url'] = url_for('api_v1.get_wisp', wisp_id=wisp.id)
+    return record
+
+def _find_wisp(wisp_id):
+    """The WISP with this id, from the WISP table or else the archive"""
+    return db.session.get(WISP, wisp_id) or db.get_or_404(ArchivedWISP, wisp_id)
+
+def _hot_wisp(wisp_id):
+    """The WISP with this id for a change; archived WISPs are read-only"""
+    wisp = _find_wisp(wisp_id)
+    if isinstance(wisp, ArchivedWISP):
+        abort(409, 'This WISP is archived and read-only; restore it with `flask restore-wisps` first')
+    return wisp
+
+@api.route('/wisps')
+def list_wisps():
+    """WISP summaries in id order, paginated with ?limit= and the ?after= cursor;
+    ?archived=1 lists the archived WISPs instead"""
+    limit = max(1, min(request.args.get('limit', 50, type=int), MAX_PAGE_SIZE))
+    after = request.args.get('after', 0, type=int)
+    archived = request.args.get('archived') == '1'
+    model = ArchivedWISP if archived else WISP
+    # Archived WISPs are out of the review cycle
+    review_due_date = null() if archived else WISP.review_due_date
+    rows = db.session.execute(
+        select(model.id, model.company_name, model.created_at, model.updated_at, review_due_date.label('review_due_date'))
+        .where(model.id > after)
+        .order_by(model.id)
+        .limit(limit + 1)
+    ).all()
+    wisps = [
+        {
+            'id': row.id,
+            'company_name': row.company_name,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+            'review_due_date': row.review_due_date.isoformat() if row.review_due_date else None,
+            'archived': archived,
+            'url': url_for('api_v1.get_wisp', wisp_id=row.id)
+        }
+        for row in rows[:limit]
+    ]
+    next_url = url_for('api_v1.list_wisps', limit=limit, after=wisps[-1]['id'],
+                       archived=1 if archived else None) if len(rows) > limit else None
+    return jsonify(wisps=wisps, next=next_url)
+
+@api.route('/wisps', methods=['POST'])
+def create_wisp():
+    wisp_data, errors = _validate(RowValidator(), _json_body())
+    if errors:
+        return jsonify(errors=errors), 422
+    (wisp_id,), created = insert_wisps([wisp_data])
+    # A repeated request gets the WISP the first one created
+    response = jsonify(_record(db.session.get(WISP, wisp_id)))
+    response.status_code = 201 if created else 200
+    response.headers['Location'] = url_for('api_v1.get_wisp', wisp_id=wisp_id)
+    return response
+
+@api.route('/wisps/<int:wisp_id>')
+def get_wisp(wisp_id):
+    return jsonify(_record(_find_wisp(wisp_id)))
+
+@api.route('/wisps/<int:wisp_id>', methods=['PUT', 'PATCH'])
+def update_wisp(wisp_id):
+    """Replace a WISP's answers (PUT) or change only the given fields (PATCH)"""
+    wisp = _hot_wisp(wisp_id)
+    answers = _json_body()
+    if request.method == 'PATCH':
+        answers = {**_current_answers(wisp), **answers}
+    wisp_data, errors = _validate(RowValidator(), answers)
+    if errors:
+        return jsonify(errors=errors), 422
+    _update(wisp, wisp_data)
+    db.session.commit()
+    return jsonify(_record(wisp))
+
+@api.route('/wisps/<int:wisp_id>', methods=['DELETE'])
+def delete_wisp(wisp_id):
+    db.session.delete(_hot_wisp(wisp_id))
+    db.session.commit()
+    return '', 204
+
+@api.route('/wisps/batch', methods=['POST'])
+def create_wisps():
+    """Create {"wisps": [answers, ...]} in one transaction; nothing is created if any item is invalid.
+    Items with the same answers as an existing WISP get its id instead of a new one."""
+    validator = RowValidator()
+    chunk = []
+    errors = []
+    for index, answers in enumerate(_batch(_json_body(), 'wisps')):
+        wisp_data, item_errors = _validate(validator, answers)
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+        chunk.append(wisp_data)
+    if errors:
+        return jsonify(errors=errors), 422
+    wisp_ids, created = insert_wisps(chunk)
+    return jsonify(ids=wisp_ids, created=created,
+                   urls=[url_for('api_v1.get_wisp', wisp_id=wisp_id) for wisp_id in wisp_ids]), 201
+
+@api.route('/wisps/batch', methods=['PATCH'])
+def update_wisps():
+    """Apply {"wisps": [{"id": ..., changed fields}, ...]} in one transaction, all or nothing"""
+    items = _batch(_json_body(), 'wisps')
+    ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+    wisps = {wisp.id: wisp for wisp in WISP.query.filter(WISP.id.in_([i for i in ids if _is_id(i)]))}
+    missing = [i for i in ids if _is_id(i) and i not in wisps]
+    archived = set(db.session.scalars(select(ArchivedWISP.id).where(ArchivedWISP.id.in_(missing)))) if missing else set()
+    validator = RowValidator()
+    updates = []
+    errors = []
+    for index, (wisp_id, item) in enumerate(zip(ids, items)):
+        wisp = wisps.get(wisp_id) if _is_id(wisp_id) else None
+        if wisp is None:
+            message = 'This WISP is archived and read-only' if wisp_id in archived else 'No WISP with this id'
+            errors.append({'index': index, 'errors': {'id': [message]}})
+            continue
+        changes = {name: value for name, value in item.items() if name != 'id'}
+        wisp_data, item_errors = _validate(validator, {**_current_answers(wisp), **changes})
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+        updates.append((wisp, wisp_data))
+    if errors:
+        return jsonify(errors=errors), 422
+    # Clear the batch's content hashes first and write the new ones in one
+    # flush, so WISPs swapping answers never both hold a hash at once
+    db.session.execute(update(WISP).where(WISP.id.in_(list(wisps))).values(content_hash=None, updated_at=WISP.updated_at))
+    with db.session.no_autoflush:
+        for wisp, wisp_data in updates:
+            _update(wisp, wisp_data)
+    db.session.commit()
+    return jsonify(ids=[wisp.id for wisp, wisp_data in updates])
+
+@api.route('/wisps/batch/delete', methods=['POST'])
+def delete_wisps():
+    """Delete {"ids": [...]} in one transaction; ids that do not exist are ignored"""
+    ids = [wisp_id for wisp_id in _batch(_json_body(), 'ids') if _is_id(wisp_id)]
+    deleted = []
+    for wisp in WISP.query.filter(WISP.id.in_(ids)):
+        db.session.delete(wisp)
+        deleted.append(wisp.id)
+    db.session.commit()
+    return jsonify(deleted=sorted(deleted))
+
+@api.route('/wisps/<int:wisp_id>/pdf')
+def wisp_pdf(wisp_id):
+    """Render a WISP's PDF; queued as a bulk job unless ?priority=interactive"""
+    wisp = _find_wisp(wisp_id)
+    engine = request.args.get('engine', current_app.config['PDF_ENGINE'])
+    template = request.args.get('template', DEFAULT_TEMPLATE)
+    if engine not in ENGINES or template not in TEMPLATES:
+        abort(400, 'Unknown PDF engine or template')
+    priority = INTERACTIVE if request.args.get('priority') == 'interactive' else BULK
+    options = render_options(current_app.config)
+    pdf = archived_pdf(wisp, template, engine, options) if isinstance(wisp, ArchivedWISP) else None
+    if pdf is not None:
+        buffer = io.BytesIO(pdf)
+    else:
+        with current_app.extensions['render_limiter'].slot(priority):
+            buffer = current_app.extensions['render_pool'].render(wisp, template, engine, **options)
+    return send_file(buffer, mimetype='application/pdf', as_attachment=True,
+                     download_name=f'wisp-{wisp.id}-{template}.pdf')
@@ -1,311 +1,162 @@
-from flask import Flask, render_template, request, redirect, url_for, session, send_file, flash
-from flask_sqlalchemy import SQLAlchemy
-from flask_wtf import FlaskForm
-from wtforms import StringField, TextAreaField, SelectField, BooleanField, IntegerField, FieldList, FormField
-from wtforms.fields import DateField
-from wtforms.validators import DataRequired, Email, Optional
-from datetime import datetime
+from flask import Flask, render_template, request, redirect, url_for, session, send_file, flash, Response, stream_with_context, abort, jsonify, make_response, g
+from werkzeug.http import is_resource_modified, http_date
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, date, timedelta
+import hashlib
+import io
 import json
 import os
-from comprehensive_pdf_generator import generate_complete_rightworks_wisp_pdf
+import secrets
+import importlib
+import tempfile
+from models import db, WISP, ArchivedWISP, WizardDraft, init_db, wisp_ids_reused, migrate_storage, storage_stats, parse_review_date, content_hash, dedupe_wisps
+from wisp_import import import_wisps, detect_format, open_text_stream, DEFAULT_CHUNK_SIZE
+from wisp_export import export_wisps, archived_count
+from checklists import CONTROL_FIELDS
+from pdf_engines import ENGINES, DEFAULT_ENGINE, TEMPLATES, DEFAULT_TEMPLATE, RenderPool, render_options, require_pikepdf
+import archive
+from fragment_cache import FragmentCache, templates_digest
+from css_build import build_css, load_manifest
+from render_limiter import RenderLimiter, RenderBusy, INTERACTIVE, BULK
+import memory_profile
+from memory_profile import RenderMemoryExceeded
+from api import api
+from vendor_directory import PrefixIndex, vendor_usage, SOLUTION_FIELDS, VENDOR_LISTS
+import compliance
+import reminders
+import click
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///wisp_generator.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URI', 'sqlite:///wisp_generator.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Archive tier (archive.py): separate database for WISPs moved out by
+# `flask archive-wisps`, and the age in days (since last update) it archives by default
+app.config['SQLALCHEMY_BINDS'] = {'archive': os.environ.get('ARCHIVE_DATABASE_URI', 'sqlite:///wisp_archive.db')}
+app.config['ARCHIVE_AFTER_DAYS'] = int(os.environ.get('ARCHIVE_AFTER_DAYS', 2 * 365))
 
-db = SQLAlchemy(app)
+# Annual review reminders
+app.config['REMINDER_SENDER'] = os.environ.get('REMINDER_SENDER', 'file')
+app.config['REMINDER_FILE'] = os.environ.get('REMINDER_FILE', os.path.join(app.instance_path, 'review_reminders.mbox'))
+app.config['REMINDER_FROM'] = os.environ.get('REMINDER_FROM', 'wisp-generator@localhost')
+app.config['SMTP_HOST'] = os.environ.get('SMTP_HOST', 'localhost')
+app.config['SMTP_PORT'] = int(os.environ.get('SMTP_PORT', 25))
+app.config['SMTP_USERNAME'] = os.environ.get('SMTP_USERNAME')
+app.config['SMTP_PASSWORD'] = os.environ.get('SMTP_PASSWORD')
+app.config['SMTP_USE_TLS'] = os.environ.get('SMTP_USE_TLS') == '1'
 
-# Database Models
-class WISP(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    company_name = db.Column(db.String(200), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    data = db.Column(db.Text)  # JSON storage for all form data
-    
-    def get_data(self):
-        return json.loads(self.data) if self.data else {}
-    
-    def set_data(self, data_dict):
-        self.data = json.dumps(data_dict)
-
-# Form Classes for each step
-class CompanyInfoForm(FlaskForm):
-    # Basic Company Information
-    company_name = StringField('Company Name', validators=[DataRequired()])
-    street_address = StringField('Street Address', validators=[DataRequired()])
-    city = StringField('City', validators=[DataRequired()])
-    state = StringField('State', validators=[DataRequired()])
-    zip_code = StringField('ZIP Code', validators=[DataRequired()])
-    contact_email = StringField('Contact Email', validators=[DataRequired(), Email()])
-    phone_number = StringField('Phone Number')
-    website = StringField('Website')
-    
-    company_size = SelectField('Company Size', choices=[
-        ('', 'Select company size'),
-        ('1-10', '1-10 employees'),
-        ('11-50', '11-50 employees'),
-        ('51-200', '51-200 employees'),
-        ('201-1000', '201-1000 employees'),
-        ('1000+', '1000+ employees')
-    ], validators=[DataRequired()])
-    
-    industry = SelectField('Industry', choices=[
-        ('', 'Select industry'),
-        ('accounting', 'Accounting/CPA'),
-        ('legal', 'Legal Services'),
-        ('healthcare', 'Healthcare'),
-        ('financial', 'Financial Services'),
-        ('consulting', 'Consulting'),
-        ('technology', 'Technology'),
-        ('manufacturing', 'Manufacturing'),
-        ('retail', 'Retail'),
-        ('other', 'Other')
-    ], validators=[DataRequired()])
-    
-    # WISP preparation details
-    prepared_by = StringField('WISP Prepared By (Name)', validators=[DataRequired()],
-        description='Name of person preparing this WISP')
-    annual_review_date = DateField('Annual Review Date', validators=[DataRequired()],
-        description='Date for annual WISP review (typically one year from creation)')
-    
-    # EIN/EFIN Information
-    ein_number = StringField('Employer Identification Number (EIN)')
-    efin_number = StringField('Electronic Filing Identification Number (EFIN)',
-        description='Required for tax preparers who file electronically')
-
-class DataCollectionForm(FlaskForm):
-    # Basic PII Types (for scope section)
-    personal_info_types = SelectField('Types of Personal Information Collected', choices=[
-        ('basic', 'Basic contact information only'),
-        ('financial', 'Financial information (SSN, banking, etc.)'),
-        ('healthcare', 'Healthcare/medical information'),
-        ('employment', 'Employment records and payroll'),
-        ('comprehensive', 'Comprehensive personal data')
-    ], validators=[DataRequired()])
-    
-    data_sources = TextAreaField('Data Collection Sources', 
-        description='Describe how and where you collect personal information')
-    
-    data_retention = SelectField('Data Retention Period', choices=[
-        ('1year', '1 year'),
-        ('3years', '3 years'),
-        ('7years', '7 years'),
-        ('indefinite', 'Indefinite/As required by law')
-    ], validators=[DataRequired()])
-    
-    data_destruction = BooleanField('Do you have a process to destroy data when no longer needed?')
-    
-    # PII Inventory Lists (detailed for template)
-    third_party_apps_1 = StringField('Third-party App #1', 
-        description='Name of third-party application that contains PII')
-    third_party_apps_2 = StringField('Third-party App #2')
-    
-    cloud_providers_1 = StringField('Cloud Provider #1', 
-        description='Name of cloud service provider (e.g., Google Drive, Dropbox)')
-    cloud_providers_2 = StringField('Cloud Provider #2')
-    
-    data_storage_1 = StringField('Data Storage Solution #1', 
-        description='Primary data storage location/method')
-    data_storage_2 = StringField('Data Storage Solution #2')
-    
-    email_providers_1 = StringField('Email Provider #1', 
-        description='Primary email service provider')
-    email_providers_2 = StringField('Email Provider #2')
-    
-    crm_systems_1 = StringField('CRM System #1', 
-        description='Customer Relationship Management systems')
-    crm_systems_2 = StringField('CRM System #2')
-    
-    social_media_contractors_1 = StringField('Social Media Contractor #1', 
-        description='Third-party managing social media accounts')
-    social_media_contractors_2 = StringField('Social Media Contractor #2')
-
-class SystemsForm(FlaskForm):
-    quickbooks = BooleanField('QuickBooks')
-    adp = BooleanField('ADP Payroll')
-    workday = BooleanField('Workday')
-    salesforce = BooleanField('Salesforce')
-    office365 = BooleanField('Microsoft 365')
-    google_workspace = BooleanField('Google Workspace')
-    custom_software = TextAreaField('Other Systems/Software', 
-        description='List any other systems that handle sensitive data')
-
-class SecurityControlsForm(FlaskForm):
-    # FTC Checklist Items
-    qualified_individual_designated = BooleanField('Qualified individual designated')
-    qualified_individual_vendor = StringField('Qualified Individual Vendor/Date')
-    
-    risk_assessment_conducted = BooleanField('Risk assessment conducted')
-    risk_assessment_vendor = StringField('Risk Assessment Vendor/Date')
-    
-    encryption_at_rest = BooleanField('Encryption at rest')
-    encryption_at_rest_vendor = StringField('Encryption at Rest Vendor/Date')
-    
-    encryption_in_transit = BooleanField('Encryption in transit')
-    encryption_in_transit_vendor = StringField('Encryption in Transit Vendor/Date')
-    
-    mfa_enabled = BooleanField('Multi-Factor Authentication (MFA) enabled')
-    mfa_vendor = StringField('MFA Vendor/Date')
-    
-    continuous_monitoring = BooleanField('Continuous monitoring with IDS/RMM or network scan and penetration testing')
-    continuous_monitoring_vendor = StringField('Continuous Monitoring Vendor/Date')
-    
-    security_awareness_training = BooleanField('Security awareness training')
-    security_awareness_vendor = StringField('Security Awareness Training Vendor/Date')
-    
-    assess_providers = BooleanField('Assess providers')
-    assess_providers_vendor = StringField('Assess Providers Vendor/Date')
-    
-    annual_wisp_review = BooleanField('Annual WISP review')
-    annual_wisp_review_vendor = StringField('Annual WISP Review Vendor/Date')
-    
-    wisp_developed = BooleanField('Written Information Security Plan developed')
-    wisp_developed_vendor = StringField('WISP Development Vendor/Date')
-    
-    annual_director_reports = BooleanField('Annual director reports')
-    annual_director_reports_vendor = StringField('Annual Director Reports Vendor/Date')
-    
-    annual_disposal_records = BooleanField('Annual disposal of records')
-    annual_disposal_vendor = StringField('Annual Disposal Vendor/Date')
-    
-    restricted_access_data = BooleanField('Restricted access to data')
-    restricted_access_vendor = StringField('Restricted Access Vendor/Date')
-    
-    complex_passwords_required = BooleanField('Require complex passwords')
-    complex_passwords_vendor = StringField('Complex Passwords Vendor/Date')
-    
-    firewall_protection = BooleanField('Firewall')
-    firewall_vendor = StringField('Firewall Vendor/Date')
-    
-    ids_enabled = BooleanField('Intrusion detection systems (IDS)')
-    ids_vendor = StringField('IDS Vendor/Date')
-    
-    segmented_network = BooleanField('Segmented / IOT / Guest network')
-    segmented_network_vendor = StringField('Segmented Network Vendor/Date')
-    
-    endpoint_security = BooleanField('Endpoint security')
-    endpoint_security_vendor = StringField('Endpoint Security Vendor/Date')
-    
-    third_party_patch_mgmt = BooleanField('Third-party patch management')
-    third_party_patch_vendor = StringField('Third-party Patch Management Vendor/Date')
-    
-    windows_patch_mgmt = BooleanField('Windows patch management')
-    windows_patch_vendor = StringField('Windows Patch Management Vendor/Date')
-    
-    # IRS Security Six
-    antivirus_solution = StringField('Antivirus solution name/provider')
-    endpoint_detection_solution = StringField('Endpoint detection and response solution name/provider')
-    intrusion_detection_solution = StringField('Intrusion detection systems solution name/provider')
-    backup_solution = StringField('Backup solution name/provider')
-    backup_encrypted = BooleanField('Is backup encrypted?')
-    firewall_solution = StringField('Firewall solution name/provider')
-    encryption_solution = StringField('Drive encryption solution name/provider')
-    mfa_solution = StringField('Multifactor authentication solution name/provider')
-    vpn_solution = StringField('VPN solution name/provider')
-    
-    # Password Policy Details
-    password_min_length = SelectField('Minimum Password Length', choices=[
-        ('8', '8 characters'),
-        ('10', '10 characters'),
-        ('12', '12 characters'),
-        ('16', '16 characters')
-    ], default='8')
-    password_complexity = BooleanField('Password complexity requirements enabled')
-    password_history_enabled = BooleanField('Password history enforced (24 max remembered)')
-    password_manager_required = BooleanField('Password manager required for all accounts')
-    default_passwords_changed = BooleanField('Default/temporary passwords changed')
-    password_secure_storage = BooleanField('Passwords stored in secure location')
-    password_manager_mfa = BooleanField('MFA enabled for password manager')
-    
-    # Wireless Security
-    wireless_wpa2_enabled = BooleanField('WPA2/WPA3 encryption enabled')
-    wireless_ssid_hidden = BooleanField('Wireless SSID hidden from public view')
-    wireless_guest_network = BooleanField('Separate guest wireless network available')
-    wireless_admin_password_changed = BooleanField('Default router admin passwords changed')
-    wireless_tx_power_reduced = BooleanField('WLAN transmit power reduced to office area only')
-    wireless_wep_disabled = BooleanField('WEP encryption disabled (not used)')
-    
-    # Additional Security Controls
-    rmm_solution = StringField('Remote Monitoring and Management (RMM) solution')
-    browser_patch_mgmt = BooleanField('Patch management on browsers')
-    stored_passwords_disabled = BooleanField('Stored password feature disabled')
-    incident_response_printed = BooleanField('Incident response plan printed and readily available')
-    security_training_method = StringField('Security awareness training method')
-    unnecessary_software_blocked = BooleanField('Installing unnecessary software disallowed')
-    device_inventory_performed = BooleanField('Inventory of devices containing client data performed')
-    client_data_access_limited = BooleanField('Access to stored client data limited/disabled')
-    client_data_protection_solution = StringField('Client data protection solution name/provider')
-
-class VendorsForm(FlaskForm):
-    vendor_list = TextAreaField('Third-Party Vendors with Data Access', 
-        description='List all vendors, contractors, or service providers who have access to sensitive data')
-    vendor_agreements = BooleanField('Do you have written agreements with all vendors regarding data protection?')
-    vendor_monitoring = BooleanField('Do you regularly monitor vendor compliance?')
-
-class EmployeeAccessForm(FlaskForm):
-    # Basic Employee Access Controls
-    access_control = BooleanField('Do you have role-based access controls?')
-    employee_training = BooleanField('Do you provide regular security awareness training?')
-    training_frequency = SelectField('Training Frequency', choices=[
-        ('', 'Select frequency'),
-        ('quarterly', 'Quarterly'),
-        ('biannual', 'Twice per year'),
-        ('annual', 'Annual'),
-        ('onboarding', 'New employee onboarding only')
-    ])
-    security_awareness_method = StringField('Security Awareness Training Method', 
-        description='How do you conduct security awareness training?')
-    incident_response = BooleanField('Do you have a written incident response plan?')
-    background_checks = BooleanField('Do you conduct background checks for employees with data access?')
-    
-    # Employee Management
-    confidentiality_agreements = BooleanField('All employees sign confidentiality agreements')
-    employee_access_review = BooleanField('Regular review of employee access rights')
-    employee_termination_process = BooleanField('Formal process for revoking access when employees leave')
-    remote_work_policy = BooleanField('Written remote work security policy')
-    
-    # Qualified Individual Information
-    qualified_individual_name = StringField('Qualified Individual Name', validators=[DataRequired()],
-        description='Person responsible for implementing and supervising the information security program')
-    qualified_individual_qualifications = TextAreaField('Qualifications/Experience',
-        description='Describe their cybersecurity qualifications and experience')
-    qualified_individual_supervisor = StringField('Supervisor',
-        description='Who does the Qualified Individual report to?')
-    
-    # Incident Response Team
-    incident_coordinator_name = StringField('Incident Coordinator Name',
-        description='Primary person responsible for coordinating incident response')
-    incident_coordinator_phone = StringField('Incident Coordinator Phone')
-    incident_team_member_1 = StringField('Incident Team Member #1')
-    incident_team_member_1_phone = StringField('Team Member #1 Phone')
-    incident_team_member_2 = StringField('Incident Team Member #2')
-    incident_team_member_2_phone = StringField('Team Member #2 Phone')
-    
-    # Incident Response Contacts
-    tech_company = StringField('IT Support Company Name',
-        description='Primary technology support company')
-    tech_company_phone = StringField('IT Support Phone Number')
-    legal_counsel_name = StringField('Legal Counsel Name')
-    legal_counsel_phone = StringField('Legal Counsel Phone')
-    insurance_broker = StringField('Insurance Broker/Company')
-    insurance_policy = StringField('Insurance Policy Information')
-    
-    # Testing and Monitoring
-    annual_penetration_test = BooleanField('Annual penetration testing conducted')
-    vulnerability_assessments = BooleanField('Regular vulnerability assessments')
-    system_scans = BooleanField('System-wide security scans every six months')
-    security_awareness_testing = BooleanField('Phishing simulation testing for employees')
-    
-    # EFIN Monitoring (for tax preparers)
-    efin_monitoring_process = BooleanField('EFIN monitoring process implemented')
-    efin_status_check_frequency = SelectField('EFIN Status Check Frequency', choices=[
-        ('', 'Not applicable'),
-        ('weekly', 'Weekly'),
-        ('biweekly', 'Bi-weekly'),
-        ('monthly', 'Monthly')
-    ])
+# PDF rendering engine: 'platypus' (flow layout) or 'canvas' (fixed-layout fast path)
+app.config['PDF_ENGINE'] = os.environ.get('PDF_ENGINE', DEFAULT_ENGINE)
+# PDF size options; object streams and linearization require pikepdf
+app.config['PDF_COMPRESS'] = os.environ.get('PDF_COMPRESS', '1') == '1'
+app.config['PDF_SHARED_RESOURCES'] = os.environ.get('PDF_SHARED_RESOURCES') == '1'
+app.config['PDF_OBJECT_STREAMS'] = os.environ.get('PDF_OBJECT_STREAMS') == '1'
+app.config['PDF_LINEARIZE'] = os.environ.get('PDF_LINEARIZE') == '1'
+if app.config['PDF_OBJECT_STREAMS'] or app.config['PDF_LINEARIZE']:
+    # Fail at startup rather than on every download
+    require_pikepdf()
+# PDF render admission control (per process): renders running at once, requests
+# allowed to wait for a slot, and how long they may wait before a 503
+app.config['PDF_RENDER_CONCURRENCY'] = int(os.environ.get('PDF_RENDER_CONCURRENCY', os.cpu_count() or 2))
+app.config['PDF_RENDER_QUEUE'] = int(os.environ.get('PDF_RENDER_QUEUE', 16))
+app.config['PDF_RENDER_QUEUE_TIMEOUT'] = float(os.environ.get('PDF_RENDER_QUEUE_TIMEOUT', 10))
+# Worker processes for PDF rendering, so renders do not hold the web process's
+# GIL; 0 renders in the request thread
+app.config['PDF_RENDER_PROCESSES'] = int(os.environ.get('PDF_RENDER_PROCESSES', 0))
+# Memory limit for cached WISP document and dashboard card HTML; 0 disables the cache
+app.config['FRAGMENT_CACHE_MAX_BYTES'] = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+# Threads serving Flask requests under ASGI (asgi.py), i.e. requests handled at once per process
+app.config['ASGI_THREADS'] = int(os.environ.get('ASGI_THREADS', 16))
+# JSON API (api.py): comma-separated bearer tokens; the API refuses every request when unset
+app.config['API_TOKENS'] = [token.strip() for token in os.environ.get('API_TOKENS', '').split(',') if token.strip()]
+# Memory instrumentation (memory_profile.py): trace allocations with tracemalloc
+# (slow; for investigating RSS growth) and fail renders whose traced peak is
+# over the budget in MB (0 for no budget; needs MEMORY_PROFILE=1)
+app.config['MEMORY_PROFILE'] = os.environ.get('MEMORY_PROFILE') == '1'
+app.config['PDF_RENDER_MEMORY_LIMIT_MB'] = float(os.environ.get('PDF_RENDER_MEMORY_LIMIT_MB', 0))
+# Cache lifetime of fingerprinted static files (built by `flask build-css`)
+app.config['ASSET_MAX_AGE'] = int(os.environ.get('ASSET_MAX_AGE', 365 * 24 * 3600))
+
+db.init_app(app)
+app.register_blueprint(api)
+
+ASSET_MANIFEST = load_manifest()
+
+render_limiter = RenderLimiter(app.config['PDF_RENDER_CONCURRENCY'],
+                               max_queue=app.config['PDF_RENDER_QUEUE'],
+                               timeout=app.config['PDF_RENDER_QUEUE_TIMEOUT'])
+app.extensions['render_limiter'] = render_limiter
+render_pool = RenderPool(app.config['PDF_RENDER_PROCESSES'],
+                         memory_limit=int(app.config['PDF_RENDER_MEMORY_LIMIT_MB'] * memory_profile.MB))
+app.extensions['render_pool'] = render_pool
+
+vendor_index = PrefixIndex()
+
+fragment_cache = FragmentCache(app.config['FRAGMENT_CACHE_MAX_BYTES'])
+# Changes whenever the cached pages' markup (or the stylesheet they link) does,
+# so old fragments and ETags are not reused
+TEMPLATES_DIGEST = templates_digest(os.path.join(app.root_path, app.template_folder), [
+    'base.html', 'dashboard.html', 'wisp/_card.html', 'wisp/view.html', 'wisp/_document.html'
+], extra=json.dumps(ASSET_MANIFEST, sort_keys=True))
+
+@app.template_global()
+def asset_url(name):
+    """URL of the current build of a static asset, e.g. asset_url('app.css')"""
+    manifest = load_manifest() if app.debug else ASSET_MANIFEST
+    return url_for('static', filename=manifest.get(name, name))
+
+@app.after_request
+def cache_fingerprinted_assets(response):
+    """Let browsers keep built assets indefinitely; a rebuild changes their URL"""
+    if request.endpoint == 'static' and request.view_args.get('filename') in ASSET_MANIFEST.values():
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config['ASSET_MAX_AGE']
+        response.cache_control.immutable = True
+    return response
+
+if app.config['MEMORY_PROFILE']:
+    memory_profile.start()
+
+    @app.before_request
+    def start_memory_profile():
+        g.memory_started = memory_profile.profiler.request_started()
+
+    @app.teardown_request
+    def finish_memory_profile(error):
+        if 'memory_started' in g:
+            memory_profile.profiler.request_finished(request.endpoint, g.memory_started)
+
+# Imported on first use so workers start without loading ReportLab or defining
+# every form class. Forking servers can load them once in the master process
+# instead by setting WISP_PRELOAD=1 (see preload_modules).
+LAZY_MODULES = ['comprehensive_pdf_generator', 'canvas_pdf_generator', 'forms', 'wisp_document']
+
+def preload_modules():
+    """Import the lazily loaded modules now, e.g. before a server forks its workers"""
+    for module_name in LAZY_MODULES:
+        importlib.import_module(module_name)
+
+if os.environ.get('WISP_PRELOAD') == '1':
+    preload_modules()
+
+def conditional_page(etag, last_modified, render):
+    """Answer 304 when the client's cached copy is current, else render() with ETag and Last-Modified.
+
+    Pages with pending flash messages are rendered without validators, since
+    the message is part of the page but not of its ETag.
+    """
+    if '_flashes' in session:
+        return render()
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    response = make_response(render())
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
 
 # Routes
 @app.route('/')
@@ -314,12 +165,52 @@ def index():
 
 @app.route('/dashboard')
 def dashboard():
-    wisps = WISP.query.order_by(WISP.updated_at.desc()).all()
-    return render_template('dashboard.html', wisps=wisps)
+    # Only ids and revisions are needed to answer a revalidation or find cached cards
+    wisps = db.session.execute(
+        db.select(WISP.id, WISP.updated_at).order_by(WISP.updated_at.desc())
+    ).all()
+    listing = ','.join(f'{row.id}:{row.updated_at}' for row in wisps)
+    etag = f"dashboard-{hashlib.sha1(listing.encode('utf-8')).hexdigest()[:16]}-{TEMPLATES_DIGEST}"
+    return conditional_page(etag, None, lambda: render_dashboard(wisps))
+
+def render_dashboard(wisps):
+    """Render the dashboard, reusing cached cards and loading only the WISPs whose card is not cached"""
+    cards = {}
+    missing = []
+    for row in wisps:
+        card = fragment_cache.get(('card', row.id, row.updated_at))
+        if card is None:
+            missing.append(row.id)
+        else:
+            cards[row.id] = card
+    if missing:
+        for wisp in WISP.query.filter(WISP.id.in_(missing)):
+            cards[wisp.id] = fragment_cache.set(('card', wisp.id, wisp.updated_at),
+                                                render_template('wisp/_card.html', wisp=wisp))
+
+    cards = [cards[row.id] for row in wisps if row.id in cards]
+    return render_template('dashboard.html', wisps=wisps, cards=cards, binder_enabled=bool(render_pool.processes))
+
+# Drafts of wizards abandoned this long ago are purged when a new wizard starts
+WIZARD_DRAFT_MAX_AGE = timedelta(days=7)
+
+def wizard_draft(create=False):
+    """The WizardDraft of this browser session, or None; create=True starts one if needed"""
+    draft = db.session.get(WizardDraft, session['wizard_draft']) if 'wizard_draft' in session else None
+    if draft is None and create:
+        draft = WizardDraft(id=secrets.token_hex(16))
+        draft.set_steps({})
+        db.session.add(draft)
+        session['wizard_draft'] = draft.id
+    return draft
 
 @app.route('/wizard/start')
 def start_wizard():
-    # Clear any existing session data
+    # Clear any existing wizard data
+    if 'wizard_draft' in session:
+        WizardDraft.query.filter_by(id=session['wizard_draft']).delete()
+    WizardDraft.query.filter(WizardDraft.updated_at < datetime.utcnow() - WIZARD_DRAFT_MAX_AGE).delete()
+    db.session.commit()
     session.clear()
     return redirect(url_for('wizard_step', step=1))
 
@@ -328,87 +219,166 @@ def wizard_step(step):
     if step < 1 or step > 6:
         return redirect(url_for('index'))
     
-    # Form mapping
-    forms = {
-        1: CompanyInfoForm(),
-        2: DataCollectionForm(),
-        3: SystemsForm(),
-        4: SecurityControlsForm(),
-        5: VendorsForm(),
-        6: EmployeeAccessForm()
-    }
-    
-    form = forms[step]
-    
-    if request.method == 'POST' and form.validate_on_submit():
-        # Store form data in session
-        step_key = f'step_{step}'
-        session[step_key] = {}
-        
-        for field in form:
-            if field.name != 'csrf_token':
-                session[step_key][field.name] = field.data
-        
-        # Move to next step or finish
-        if step < 6:
-            return redirect(url_for('wizard_step', step=step + 1))
-        else:
-            return redirect(url_for('wizard_complete'))
-    
-    # Pre-populate form with session data if available
+    from forms import WIZARD_FORMS
+    from wtforms import DateField
+    form_class = WIZARD_FORMS[step - 1]
     step_key = f'step_{step}'
-    if step_key in session:
-        for field_name, value in session[step_key].items():
-            if hasattr(form, field_name):
-                getattr(form, field_name).data = value
+    
+    if request.method == 'POST':
+        form = form_class()
+        if form.validate_on_submit():
+            # Store form data in the draft
+            draft = wizard_draft(create=True)
+            steps = draft.get_steps()
+            steps[step_key] = {
+                field.name: http_date(field.data) if isinstance(field.data, date) else field.data
+                for field in form if field.name != 'csrf_token'
+            }
+            draft.set_steps(steps)
+            db.session.commit()
+            
+            # Move to next step or finish
+            if step < 6:
+                return redirect(url_for('wizard_step', step=step + 1))
+            else:
+                return redirect(url_for('wizard_complete'))
+    else:
+        # Pre-populate form with draft data if available
+        draft = wizard_draft()
+        answers = draft.get_steps().get(step_key, {}) if draft else {}
+        for field_name, value in answers.items():
+            # Dates are stored as HTTP dates, like the saved WISP data
+            unbound = getattr(form_class, field_name, None)
+            if unbound is not None and unbound.field_class is DateField:
+                answers[field_name] = parse_review_date(value)
+        form = form_class(data=answers)
     
     return render_template(f'wizard/step_{step}.html', form=form, step=step)
 
 @app.route('/wizard/complete')
 def wizard_complete():
-    # Collect all session data
+    # A repeated request (double click, refresh) shows the WISP the first one saved
+    token = session.get('wizard_draft')
+    if token:
+        wisp = WISP.query.filter_by(submission_token=token).first()
+    else:
+        wisp = db.session.get(WISP, session.get('wizard_completed', 0))
+    if wisp is not None:
+        return wizard_completed(wisp)
+
+    # Collect all draft data
+    draft = wizard_draft()
+    steps = draft.get_steps() if draft else {}
     wisp_data = {}
     for i in range(1, 7):
         step_key = f'step_{i}'
-        if step_key in session:
-            wisp_data.update(session[step_key])
+        if step_key in steps:
+            wisp_data.update(steps[step_key])
     
     if not wisp_data.get('company_name'):
         flash('Please complete all wizard steps', 'error')
         return redirect(url_for('wizard_step', step=1))
     
-    # Save to database
-    wisp = WISP(company_name=wisp_data['company_name'])
-    wisp.set_data(wisp_data)
-    db.session.add(wisp)
-    db.session.commit()
-    
-    # Clear session
+    # Save to database, unless a WISP with the same answers exists
+    digest = content_hash(wisp_data)
+    wisp = WISP.query.filter_by(content_hash=digest).first()
+    if wisp is None:
+        wisp = WISP(company_name=wisp_data['company_name'], submission_token=draft.id)
+        wisp.set_data(wisp_data)
+        db.session.add(wisp)
+    db.session.delete(draft)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request for this draft (or the same answers) saved it first
+        db.session.rollback()
+        wisp = WISP.query.filter(or_(WISP.submission_token == token, WISP.content_hash == digest)).first()
+        if wisp is None:
+            raise
+    
+    return wizard_completed(wisp)
+
+def wizard_completed(wisp):
+    # Clear session, remembering the WISP for a refresh of the completion page
     session.clear()
-    
-    return render_template('wizard/complete.html', wisp=wisp, wisp_data=wisp_data)
+    session['wizard_completed'] = wisp.id
+    return render_template('wizard/complete.html', wisp=wisp, document=wisp.get_document())
+
+def find_wisp_or_404(wisp_id):
+    """The WISP with this id, from the hot table or else the archive"""
+    wisp = db.session.get(WISP, wisp_id) or db.session.get(ArchivedWISP, wisp_id)
+    if wisp is None:
+        abort(404)
+    return wisp
 
 @app.route('/wisp/<int:wisp_id>')
 def view_wisp(wisp_id):
-    wisp = WISP.query.get_or_404(wisp_id)
-    wisp_data = wisp.get_data()
-    return render_template('wisp/view.html', wisp=wisp, wisp_data=wisp_data)
+    wisp = find_wisp_or_404(wisp_id)
+    tier = 'archived' if isinstance(wisp, ArchivedWISP) else 'wisp'
+    etag = f'{tier}-{wisp.id}-{wisp.updated_at:%Y%m%d%H%M%S%f}-{TEMPLATES_DIGEST}'
+    return conditional_page(etag, wisp.updated_at, lambda: render_wisp_page(wisp))
+
+def render_wisp_page(wisp):
+    """Render the view page around the cached document fragment"""
+    document_html = fragment_cache.get_or_render(
+        ('document', wisp.id, wisp.updated_at),
+        lambda: render_template('wisp/_document.html', wisp=wisp, document=wisp.get_document())
+    )
+    return render_template('wisp/view.html', wisp=wisp, document_html=document_html,
+                           archived=isinstance(wisp, ArchivedWISP))
 
 @app.route('/wisp/<int:wisp_id>/pdf')
 def download_wisp_pdf(wisp_id):
-    wisp = WISP.query.get_or_404(wisp_id)
-    wisp_data = wisp.get_data()
-    
-    # Generate comprehensive PDF using the Rightworks template
-    buffer = generate_complete_rightworks_wisp_pdf(wisp)
+    wisp = find_wisp_or_404(wisp_id)
+    engine = request.args.get('engine', app.config['PDF_ENGINE'])
+    template = request.args.get('template', DEFAULT_TEMPLATE)
+    if engine not in ENGINES or template not in TEMPLATES:
+        abort(400)
+    # Scripted bulk downloads can pass ?priority=bulk to yield to people waiting
+    priority = BULK if request.args.get('priority') == 'bulk' else INTERACTIVE
+    
+    # Archived WISPs come with the PDF rendered when they were archived, which
+    # is served while the template version and render options are unchanged
+    options = render_options(app.config)
+    pdf = archive.archived_pdf(wisp, template, engine, options) if isinstance(wisp, ArchivedWISP) else None
+    if pdf is not None:
+        buffer = io.BytesIO(pdf)
+    else:
+        # Render with the requested document template (Rightworks WISP by default)
+        with render_limiter.slot(priority):
+            buffer = render_pool.render(wisp, template, engine, **options)
+    title = TEMPLATES[template]['title'].replace(' ', '_')
     
     return send_file(
         buffer,
         as_attachment=True,
-        download_name=f"{wisp_data.get('company_name', 'WISP')}_WISP.pdf",
+        download_name=f"{wisp.get_document().company_name or 'WISP'}_{title}.pdf",
         mimetype='application/pdf'
     )
 
+@app.errorhandler(RenderBusy)
+def render_busy(error):
+    return Response('PDF rendering is busy. Please try again in a few seconds.\n', status=503,
+                    headers={'Retry-After': str(error.retry_after)}, mimetype='text/plain')
+
+@app.errorhandler(RenderMemoryExceeded)
+def render_memory_exceeded(error):
+    app.logger.warning('%s (%s)', error, request.path)
+    return Response('This PDF needs more memory than renders are allowed.\n', status=500, mimetype='text/plain')
+
+@app.route('/api/render-stats')
+def render_stats_api():
+    """PDF render queue and fragment cache statistics for this process"""
+    return jsonify(pid=os.getpid(), pdf=render_limiter.stats(), fragment_cache=fragment_cache.stats())
+
+@app.route('/api/memory-stats')
+def memory_stats_api():
+    """Memory use, retained memory per endpoint and top allocation growth sites
+    for this process (MEMORY_PROFILE=1); ?reset=1 takes a new baseline"""
+    if request.args.get('reset') == '1' and memory_profile.is_enabled():
+        memory_profile.profiler.reset_baseline()
+    return jsonify(memory_profile.profiler.report(limit=request.args.get('limit', 15, type=int)))
+
 @app.route('/wisp/<int:wisp_id>/delete', methods=['POST'])
 def delete_wisp(wisp_id):
     wisp = WISP.query.get_or_404(wisp_id)
@@ -417,7 +387,283 @@ def delete_wisp(wisp_id):
     flash('WISP deleted successfully', 'success')
     return redirect(url_for('dashboard'))
 
+@app.route('/wisp/import', methods=['GET', 'POST'])
+def import_wisps_upload():
+    from forms import ImportForm
+    form = ImportForm()
+    result = None
+    
+    if form.validate_on_submit():
+        upload = form.import_file.data
+        fmt = detect_format(upload.filename)
+        if fmt is None:
+            flash('Unsupported file type. Upload a .csv or .jsonl file.', 'error')
+        else:
+            # Stream the upload straight from its temporary file
+            result = import_wisps(open_text_stream(upload.stream, upload.filename), fmt)
+            flash(f'Imported {result.imported} WISPs ({result.duplicates} duplicates skipped, {result.failed} rows failed)',
+                  'error' if result.failed else 'success')
+    
+    return render_template('wisp/import.html', form=form, result=result)
+
+@app.route('/wisp/export.<fmt>')
+def export_wisps_download(fmt):
+    if fmt not in ('csv', 'jsonl'):
+        abort(404)
+    
+    compress = request.args.get('gzip') == '1'
+    include_archived = request.args.get('archived') == '1'
+    filename = f'wisps.{fmt}' + ('.gz' if compress else '')
+    mimetype = 'application/gzip' if compress else ('text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    
+    return Response(
+        stream_with_context(export_wisps(fmt, compress=compress, include_archived=include_archived)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/wisp/binder.pdf')
+def download_binder():
+    """Every WISP (or ?ids=1,2,3) in one PDF, with contents pages and bookmarks.
+    Needs the render worker processes; without them use `flask export-binder`."""
+    from binder import parse_ids, binder_wisps, write_binder
+    if not render_pool.processes:
+        abort(404)
+    engine = request.args.get('engine', app.config['PDF_ENGINE'])
+    template = request.args.get('template', DEFAULT_TEMPLATE)
+    if engine not in ENGINES or template not in TEMPLATES:
+        abort(400)
+    
+    # Rendered on the render pool's worker processes, each render in flight
+    # holding a bulk slot. The contents pages need every WISP's page count, so
+    # the binder is assembled in memory and written to a temporary file before
+    # anything is sent.
+    output = tempfile.TemporaryFile()
+    write_binder(output, binder_wisps(parse_ids(request.args.get('ids'))), render_pool,
+                 template, engine, limiter=render_limiter, priority=BULK, **render_options(app.config))
+    output.seek(0)
+    return send_file(output, mimetype='application/pdf', as_attachment=True, download_name='WISP_Binder.pdf')
+
+@app.route('/compliance')
+def compliance_overview():
+    control = request.args.get('control')
+    if control not in CONTROL_FIELDS:
+        control = None
+    
+    return render_template(
+        'compliance.html',
+        summary=compliance.control_summary(),
+        review_counts=compliance.review_status_counts(),
+        overdue=compliance.overdue_reviews(),
+        control=control,
+        missing=compliance.wisps_missing_control(control) if control else []
+    )
+
+def _json_rows(rows):
+    """Render date and datetime values in query rows as ISO 8601 strings"""
+    return [
+        {key: value.isoformat() if hasattr(value, 'isoformat') else value for key, value in row.items()}
+        for row in rows
+    ]
+
+@app.route('/api/compliance')
+def compliance_api():
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    offset = request.args.get('offset', 0, type=int)
+    control = request.args.get('control')
+    
+    if control is not None:
+        if control not in CONTROL_FIELDS:
+            abort(404)
+        return jsonify(control=control, wisps=_json_rows(compliance.wisps_missing_control(control, limit=limit, offset=offset)))
+    
+    return jsonify(
+        controls=compliance.control_summary(),
+        reviews=compliance.review_status_counts(),
+        overdue=_json_rows(compliance.overdue_reviews(limit=limit, offset=offset))
+    )
+
+@app.route('/api/vendors')
+def vendors_api():
+    """Vendor and solution names from the shared directory starting with ?q=, for autocomplete"""
+    limit = min(request.args.get('limit', 10, type=int), 50)
+    vendor_index.refresh()
+    matches = vendor_index.search(request.args.get('q', ''), limit=limit)
+    response = jsonify(vendors=[{'id': vendor_id, 'name': name} for vendor_id, name in matches])
+    response.cache_control.private = True
+    response.cache_control.max_age = 60
+    return response
+
+@app.route('/api/vendors/usage')
+def vendor_usage_api():
+    """Directory entries by number of WISPs using them, optionally for one ?field="""
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    field = request.args.get('field')
+    if field is not None and field not in SOLUTION_FIELDS + VENDOR_LISTS:
+        abort(404)
+    return jsonify(field=field, vendors=vendor_usage(field, limit=limit))
+
+# CLI Commands
+@app.cli.command('init-db')
+def init_db_command():
+    """Create tables and add any new columns and indexes."""
+    init_db()
+    click.echo('Database is up to date')
+
+@app.cli.command('refresh-compliance')
+def refresh_compliance_command():
+    """Rebuild control rows, review dates and vendor directory links for existing WISPs."""
+    click.echo(f'Refreshed {compliance.refresh_all()} WISPs')
+
+@app.cli.command('migrate-storage')
+@click.option('--batch-size', default=500, show_default=True, help='Rows per transaction')
+@click.option('--pause', default=0.0, show_default=True, help='Seconds to sleep between batches')
+@click.option('--vacuum', is_flag=True, help='VACUUM the SQLite database afterwards to reclaim space')
+def migrate_storage_command(batch_size, pause, vacuum):
+    """Convert WISPs stored as JSON text to the compressed storage format."""
+    before = storage_stats()
+    migrated = migrate_storage(batch_size=batch_size, pause=pause)
+    after = storage_stats()
+    click.echo(f'Migrated {migrated} WISPs')
+    click.echo(f"Stored form data: {before['json_bytes'] + before['blob_bytes']:,} bytes before, "
+               f"{after['json_bytes'] + after['blob_bytes']:,} bytes after")
+    if vacuum:
+        vacuum_database()
+
+def vacuum_database():
+    if db.engine.dialect.name == 'sqlite':
+        with db.engine.connect() as conn:
+            conn.execution_options(isolation_level='AUTOCOMMIT').exec_driver_sql('VACUUM')
+        click.echo('Vacuumed database')
+
+@app.cli.command('dedupe-wisps')
+@click.option('--batch-size', default=500, show_default=True, help='Rows per transaction')
+@click.option('--dry-run', is_flag=True, help='List duplicates without changing anything')
+def dedupe_wisps_command(batch_size, dry_run):
+    """Merge WISPs with identical answers into the oldest copy."""
+    merges = dedupe_wisps(batch_size=batch_size, dry_run=dry_run)
+    for keep_id, drop_ids in merges:
+        click.echo(f"WISP {keep_id}: {'duplicated by' if dry_run else 'merged'} {', '.join(map(str, drop_ids))}")
+    click.echo(f"{'Found' if dry_run else 'Removed'} {sum(len(drop_ids) for _, drop_ids in merges)} duplicate WISPs")
+
+@app.cli.command('archive-wisps')
+@click.option('--older-than-days', type=int, help='Archive WISPs not updated for this many days (default: ARCHIVE_AFTER_DAYS)')
+@click.option('--include-latest', is_flag=True, help="Also archive a company's latest WISP")
+@click.option('--batch-size', default=archive.BATCH_SIZE, show_default=True, help='WISPs per transaction')
+@click.option('--processes', type=int, default=os.cpu_count() or 1, help='Render worker processes (default: CPU count)')
+@click.option('--dry-run', is_flag=True, help='List the WISPs without moving them')
+@click.option('--vacuum', is_flag=True, help='VACUUM the SQLite database afterwards to reclaim space')
+def archive_wisps_command(older_than_days, include_latest, batch_size, processes, dry_run, vacuum):
+    """Move old, superseded WISPs and their PDFs to the archive database."""
+    if wisp_ids_reused():
+        raise click.ClickException('The wisp table would reuse archived ids; run `flask --app app init-db` first')
+    days = app.config['ARCHIVE_AFTER_DAYS'] if older_than_days is None else older_than_days
+    wisp_ids = archive.archive_candidates(datetime.utcnow() - timedelta(days=days), include_latest=include_latest)
+    if dry_run:
+        for wisp_id in wisp_ids:
+            click.echo(f'WISP {wisp_id}')
+        click.echo(f'Found {len(wisp_ids)} WISPs to archive')
+        return
+    pool = RenderPool(processes)
+    try:
+        archived = archive.archive_wisps(wisp_ids, pool, DEFAULT_TEMPLATE, app.config['PDF_ENGINE'],
+                                         batch_size=batch_size, **render_options(app.config))
+    finally:
+        pool.shutdown()
+    stats = archive.archive_stats()
+    click.echo(f"Archived {archived} WISPs; the archive holds {stats['count']} "
+               f"({stats['data_bytes'] + stats['pdf_bytes']:,} bytes)")
+    if vacuum:
+        vacuum_database()
+
+@app.cli.command('restore-wisps')
+@click.argument('ids')
+def restore_wisps_command(ids):
+    """Move archived WISPs (comma-separated ids) back to the WISP table."""
+    restored, skipped, conflicts = archive.restore_wisps([int(part) for part in ids.split(',') if part.strip().isdigit()])
+    for wisp_id in skipped:
+        click.echo(f'WISP {wisp_id}: a WISP with the same answers exists; left in the archive', err=True)
+    for wisp_id in conflicts:
+        click.echo(f'WISP {wisp_id}: a different WISP has this id; left in the archive', err=True)
+    click.echo(f'Restored {len(restored)} WISPs')
+
+@app.cli.command('build-css')
+def build_css_command():
+    """Build the minified, fingerprinted stylesheet from the templates."""
+    path = build_css()
+    size = os.path.getsize(os.path.join(app.static_folder, path))
+    click.echo(f'Wrote static/{path} ({size:,} bytes)')
+
+@app.cli.command('import-wisps')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help='Defaults to the file extension')
+@click.option('--chunk-size', default=DEFAULT_CHUNK_SIZE, show_default=True, help='Rows per insert transaction')
+def import_wisps_command(path, fmt, chunk_size):
+    """Import WISPs from a CSV or JSON Lines file."""
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise click.UsageError('Cannot detect format from file name; pass --format')
+    
+    with open(path, 'rb') as f:
+        result = import_wisps(open_text_stream(f, path), fmt, chunk_size=chunk_size)
+    
+    for row_number, errors in result.errors:
+        for field_name, messages in errors.items():
+            click.echo(f'Row {row_number}: {field_name}: {"; ".join(messages)}', err=True)
+    click.echo(f'Imported {result.imported} WISPs, {result.duplicates} duplicates skipped, {result.failed} rows failed')
+
+@app.cli.command('export-wisps')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default='jsonl', show_default=True)
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip-compress the output')
+@click.option('--output', '-o', type=click.File('wb'), default='-', help='Defaults to stdout')
+@click.option('--include-archived', is_flag=True, help='Also export WISPs moved to the archive database')
+def export_wisps_command(fmt, compress, output, include_archived):
+    """Stream every WISP as JSON Lines or CSV."""
+    for block in export_wisps(fmt, compress=compress, include_archived=include_archived):
+        output.write(block)
+    if not include_archived:
+        archived = archived_count()
+        if archived:
+            click.echo(f'Left out {archived} archived WISPs; pass --include-archived to export them', err=True)
+
+@app.cli.command('export-binder')
+@click.option('--output', '-o', type=click.File('wb'), required=True)
+@click.option('--ids', help='Comma-separated WISP ids; defaults to every WISP')
+@click.option('--template', type=click.Choice(sorted(TEMPLATES)), default=DEFAULT_TEMPLATE, show_default=True)
+@click.option('--engine', type=click.Choice(ENGINES), help='Defaults to PDF_ENGINE')
+@click.option('--processes', type=int, default=os.cpu_count() or 1, help='Render worker processes (default: CPU count)')
+def export_binder_command(output, ids, template, engine, processes):
+    """Combine WISPs into one PDF with contents pages and bookmarks."""
+    from binder import parse_ids, binder_wisps, write_binder
+    pool = RenderPool(processes)
+    try:
+        count = write_binder(output, binder_wisps(parse_ids(ids)), pool, template,
+                             engine or app.config['PDF_ENGINE'], **render_options(app.config))
+    finally:
+        pool.shutdown()
+    click.echo(f'Wrote {count} WISPs to {output.name}', err=True)
+
+@app.cli.command('send-review-reminders')
+@click.option('--days', default=30, show_default=True, help='Remind about reviews due within this many days')
+@click.option('--sender', 'sender_name', type=click.Choice(sorted(reminders.SENDERS)), help='Defaults to REMINDER_SENDER')
+@click.option('--batch-size', default=reminders.DEFAULT_BATCH_SIZE, show_default=True)
+@click.option('--dry-run', is_flag=True, help='Report what would be sent without sending')
+def send_review_reminders_command(days, sender_name, batch_size, dry_run):
+    """Email contacts whose annual WISP review is due. Safe to run from cron."""
+    sender = reminders.get_sender(sender_name or app.config['REMINDER_SENDER'], app.config)
+    reminded, sent = reminders.send_review_reminders(sender, days=days, batch_size=batch_size, dry_run=dry_run)
+    click.echo(f"{'Would send' if dry_run else 'Sent'} {sent} reminder emails covering {reminded} WISPs")
+
+@app.cli.command('import-report')
+@click.option('--top', default=15, show_default=True, help='Number of direct imports to list')
+@click.option('--preload', is_flag=True, help='Measure startup with WISP_PRELOAD=1')
+def import_report_command(top, preload):
+    """Show where app startup time goes, via python -X importtime."""
+    import import_report
+    click.echo(import_report.format_report(import_report.measure_imports('app', preload=preload), top=top))
+
+# Development server; run serve.py in production
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        init_db()
     app.run(debug=True)
\ No newline at end of file
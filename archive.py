@@ -0,0 +1,119 @@
+"""Archive tier for WISPs from earlier review years.
+
+archive_wisps() moves WISPs out of the hot wisp table into ArchivedWISP rows
+in the 'archive' bind, a separate database file (SQLALCHEMY_BINDS). Each row
+keeps the WISP's compressed answers and a zlib-compressed copy of its PDF,
+rendered when it was archived. The control, vendor link and other hot rows
+go away with the WISP, so it drops out of the dashboard, compliance figures
+and review reminders, while its view and PDF URLs keep working from the
+archive.
+
+By default only superseded WISPs are archived: ones with a later WISP for the
+same company. Archived ids are never handed to new WISPs (see
+models.autoincrement_wisp_ids()), so a restored WISP gets its id back.
+"""
+import json
+import zlib
+from datetime import datetime
+from sqlalchemy import select, func
+from models import db, WISP, ArchivedWISP, superseded
+from wisp_storage import encode_data
+from pdf_engines import DEFAULT_TEMPLATE, DEFAULT_ENGINE, template_version
+
+BATCH_SIZE = 50
+
+def options_key(options):
+    """render_options() as stored with an archived PDF"""
+    return json.dumps(options, sort_keys=True, separators=(',', ':'))
+
+def archive_candidates(cutoff, include_latest=False):
+    """Ids of WISPs last updated before cutoff, oldest first; unless
+    include_latest, only those superseded by a later WISP of the same company"""
+    stmt = select(WISP.id).where(WISP.updated_at < cutoff)
+    if not include_latest:
+        stmt = stmt.where(superseded())
+    return db.session.scalars(stmt.order_by(WISP.id)).all()
+
+def archive_wisps(wisp_ids, pool, template=DEFAULT_TEMPLATE, engine=DEFAULT_ENGINE, batch_size=BATCH_SIZE, **options):
+    """Move the WISPs with the given ids to the archive, rendering their PDFs
+    on pool (a pdf_engines.RenderPool). Returns the number archived.
+
+    Each batch is committed to the archive before it is deleted from the hot
+    table, so an interrupted run leaves WISPs in both (the hot copy is served)
+    rather than in neither; running again finishes the move.
+    """
+    archived = 0
+    for start in range(0, len(wisp_ids), batch_size):
+        wisps = WISP.query.filter(WISP.id.in_(wisp_ids[start:start + batch_size])).order_by(WISP.id).all()
+        pdfs = pool.render_many(wisps, template, engine, **options)
+        for wisp, pdf in zip(wisps, pdfs):
+            db.session.merge(ArchivedWISP(
+                id=wisp.id,
+                company_name=wisp.company_name,
+                created_at=wisp.created_at,
+                updated_at=wisp.updated_at,
+                archived_at=datetime.utcnow(),
+                data_blob=wisp.data_blob if wisp.data_blob is not None else encode_data(wisp.get_data()),
+                review_reminder_sent_for=wisp.review_reminder_sent_for,
+                content_hash=wisp.content_hash,
+                pdf_blob=zlib.compress(pdf, 9),
+                pdf_template=template,
+                pdf_engine=engine,
+                pdf_version=template_version(template),
+                pdf_options=options_key(options)
+            ))
+        db.session.commit()
+        for wisp in wisps:
+            db.session.delete(wisp)
+        db.session.commit()
+        db.session.expunge_all()
+        archived += len(wisps)
+    return archived
+
+def restore_wisps(wisp_ids):
+    """Move archived WISPs back to the hot table with their original ids.
+
+    Returns (restored ids, ids skipped because another hot WISP has the same
+    answers, ids in conflict with a different hot WISP of the same id). Skipped
+    and conflicting WISPs stay in the archive.
+    """
+    restored, skipped, conflicts = [], [], []
+    for archived in ArchivedWISP.query.filter(ArchivedWISP.id.in_(wisp_ids)).order_by(ArchivedWISP.id).all():
+        hot = db.session.get(WISP, archived.id)
+        if hot is not None:
+            # Still in the hot table when an archive run was interrupted;
+            # anything else is a different WISP, which must not be lost
+            if hot.get_data() != archived.get_data():
+                conflicts.append(archived.id)
+                continue
+        else:
+            if archived.content_hash and db.session.scalar(select(WISP.id).where(WISP.content_hash == archived.content_hash)):
+                skipped.append(archived.id)
+                continue
+            wisp = WISP(id=archived.id, company_name=archived.company_name, created_at=archived.created_at,
+                        updated_at=archived.updated_at, review_reminder_sent_for=archived.review_reminder_sent_for)
+            wisp.set_data(archived.get_data())
+            db.session.add(wisp)
+            db.session.commit()
+        db.session.delete(archived)
+        db.session.commit()
+        restored.append(archived.id)
+    return restored, skipped, conflicts
+
+def archived_pdf(archived, template, engine, options):
+    """PDF bytes stored for an archived WISP when it was rendered with this
+    template, engine and render options by the current template version, else
+    None (render it from the archived answers)"""
+    stored = (archived.pdf_template, archived.pdf_engine, archived.pdf_version, archived.pdf_options)
+    if stored != (template, engine, template_version(template), options_key(options)) or archived.pdf_blob is None:
+        return None
+    return zlib.decompress(archived.pdf_blob)
+
+def archive_stats():
+    """Archived WISP count and stored answer and PDF bytes"""
+    count, data_bytes, pdf_bytes = db.session.execute(select(
+        func.count(ArchivedWISP.id),
+        func.coalesce(func.sum(func.length(ArchivedWISP.data_blob)), 0),
+        func.coalesce(func.sum(func.length(ArchivedWISP.pdf_blob)), 0)
+    )).one()
+    return {'count': count, 'data_bytes': data_bytes, 'pdf_bytes': pdf_bytes}
@@ -0,0 +1,49 @@
+"""ASGI entry point: ``uvicorn asgi:asgi_app`` (or ``python serve.py``).
+
+The ASGI server keeps connections on an event loop, so slow clients and idle
+keep-alive connections cost no thread. Each Flask request runs on a thread
+pool of ASGI_THREADS threads, so up to that many requests are served at once.
+asgiref's WsgiToAsgi alone would run every request on one shared thread
+(thread_sensitive sync_to_async), one request at a time. PDF renders should go
+to worker processes (PDF_RENDER_PROCESSES) so they do not hold the GIL while
+the pool serves pages. Requires asgiref (pip install asgiref uvicorn).
+"""
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from asgiref.sync import sync_to_async
+    from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+except ImportError:
+    raise RuntimeError('ASGI serving requires asgiref (pip install asgiref uvicorn)')
+from app import app
+
+_executor = ThreadPoolExecutor(app.config['ASGI_THREADS'], thread_name_prefix='asgi')
+
+# WsgiToAsgiInstance.run_wsgi_app without its thread_sensitive sync_to_async wrapper
+_run_wsgi_app = WsgiToAsgiInstance.__dict__['run_wsgi_app'].func
+
+class _ThreadPoolInstance(WsgiToAsgiInstance):
+    async def run_wsgi_app(self, body):
+        await sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=_executor)(self, body)
+
+class _ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await _ThreadPoolInstance(self.wsgi_application)(scope, receive, send)
+
+_wsgi_app = _ThreadPoolWsgiToAsgi(app)
+
+async def asgi_app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    else:
+        await _wsgi_app(scope, receive, send)
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            app.extensions['render_pool'].shutdown()
+            _executor.shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
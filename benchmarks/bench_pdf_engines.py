@@ -0,0 +1,166 @@
+"""Compare the PDF engines: render time, page count and extracted text.
+
+Run from the repository root:
+
+    python benchmarks/bench_pdf_engines.py --runs 50
+    python benchmarks/bench_pdf_engines.py --wisp-id 3
+    python benchmarks/bench_pdf_engines.py --inventory-rows 10,100,1000,2000
+
+Text parity needs pypdf; without it only page counts are compared. The
+inventory run renders the sample with that many rows in each inventory list,
+to check render time grows linearly with the number of entries.
+"""
+import argparse
+import itertools
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from pdf_engines import ENGINES, WISPSnapshot, render_wisp_pdf
+from inventory import PII_CATEGORY_LABELS
+
+SAMPLE_DATA = {
+    'company_name': 'Sample Tax & Accounting LLC',
+    'street_address': '100 Main Street',
+    'city': 'Nashua',
+    'state': 'NH',
+    'zip_code': '03060',
+    'contact_email': 'owner@example.com',
+    'prepared_by': 'Pat Example',
+    'annual_review_date': 'Mon, 04 Aug 2025 00:00:00 GMT',
+    'qualified_individual_designated': True,
+    'qualified_individual_vendor': 'Pat Example',
+    'mfa_enabled': True,
+    'mfa_vendor': 'Microsoft Authenticator',
+    'encryption_at_rest': True,
+    'encryption_at_rest_vendor': 'BitLocker',
+    'antivirus_solution': 'Norton',
+    'backup_solution': 'Carbonite',
+    'backup_encrypted': True,
+    'firewall_solution': 'Cisco',
+    'encryption_solution': 'BitLocker',
+    'mfa_solution': 'Microsoft Authenticator',
+    'vpn_solution': 'ExpressVPN',
+    'password_min_length': '12',
+    'password_complexity': True,
+    'wireless_wpa2_enabled': True,
+    'pii_locations': [
+        {'category': 'third_party_apps', 'name': 'QuickBooks', 'notes': 'Client financials'},
+        {'category': 'cloud_providers', 'name': 'Rightworks', 'notes': 'Hosted tax software and files'},
+        {'category': 'email_providers', 'name': 'Outlook', 'notes': ''}
+    ],
+    'vendors': [
+        {'name': 'ABC IT Services', 'services': 'Remote computer support', 'data_access': 'All systems'}
+    ],
+    'qualified_individual_name': 'Pat Example',
+    'qualified_individual_qualifications': 'Ten years administering office networks. ' * 40,
+    'qualified_individual_supervisor': 'Sam Example'
+}
+
+SAMPLE_DATE = datetime(2025, 8, 4)
+
+class SampleWISP(WISPSnapshot):
+    """Answers rendered as a WISP saved on SAMPLE_DATE"""
+
+    def __init__(self, data):
+        super().__init__(data, company_name=data.get('company_name'), created_at=SAMPLE_DATE, updated_at=SAMPLE_DATE)
+
+def with_inventories(data, rows):
+    """Copy of data with rows entries in each inventory list"""
+    data = dict(data)
+    data['pii_locations'] = [
+        {'category': category, 'name': f'Location {i}', 'notes': 'Names, SSNs and tax returns of individual clients'}
+        for i, category in zip(range(rows), itertools.cycle(PII_CATEGORY_LABELS))
+    ]
+    data['systems'] = [{'name': f'System {i}', 'purpose': 'Client records and billing'} for i in range(rows)]
+    data['vendors'] = [
+        {'name': f'Vendor {i}', 'services': 'Managed IT and remote support', 'data_access': 'Workstations and file server'}
+        for i in range(rows)
+    ]
+    return data
+
+def load_wisp(wisp_id):
+    from app import app
+    from models import WISP
+    with app.app_context():
+        return WISPSnapshot.of(WISP.query.get_or_404(wisp_id))
+
+def extract_words(pdf_bytes):
+    """Return (page_count, words) for a rendered PDF"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return len(re.findall(rb'/Type /Page\b', pdf_bytes)), None
+    import io
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    words = []
+    for page in reader.pages:
+        words.extend(page.extract_text().split())
+    return len(reader.pages), words
+
+def time_engine(engine, wisp, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pdf = render_wisp_pdf(wisp, 'rightworks', engine).getvalue()
+        timings.append(time.perf_counter() - start)
+    return pdf, timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--wisp-id', type=int, help='Render a WISP from the database instead of the built-in sample')
+    parser.add_argument('--inventory-rows', default='10,100,1000',
+                        help='Comma-separated inventory list lengths to time; empty to skip')
+    parser.add_argument('--inventory-runs', type=int, default=3)
+    args = parser.parse_args()
+
+    wisp = load_wisp(args.wisp_id) if args.wisp_id else SampleWISP(SAMPLE_DATA)
+    results = {}
+    for engine in ENGINES:
+        render_wisp_pdf(wisp, 'rightworks', engine)  # Warm up imports and font metrics
+        pdf, timings = time_engine(engine, wisp, args.runs)
+        pages, words = extract_words(pdf)
+        results[engine] = (pdf, timings, pages, words)
+
+    print(f"{'Engine':<10} {'Median':>10} {'Min':>10} {'Pages':>6} {'Size':>9}")
+    for engine, (pdf, timings, pages, words) in results.items():
+        print(f'{engine:<10} {statistics.median(timings) * 1000:>7.2f} ms {min(timings) * 1000:>7.2f} ms {pages:>6} {len(pdf):>9,}')
+
+    baseline = results['platypus']
+    for engine, (pdf, timings, pages, words) in results.items():
+        if engine == 'platypus':
+            continue
+        speedup = statistics.median(baseline[1]) / statistics.median(timings)
+        print(f'\n{engine}: {speedup:.1f}x faster than platypus')
+        print(f"  pages match: {pages == baseline[2]}")
+        if words is None:
+            print('  text parity: skipped (pypdf not installed)')
+        elif words == baseline[3]:
+            print('  text parity: identical')
+        else:
+            first = next((i for i, (a, b) in enumerate(zip(words, baseline[3])) if a != b), min(len(words), len(baseline[3])))
+            print(f'  text parity: differs at word {first}: {words[first:first + 5]} vs {baseline[3][first:first + 5]}')
+
+    if args.inventory_rows:
+        time_inventories([int(rows) for rows in args.inventory_rows.split(',')], args.inventory_runs)
+
+def time_inventories(row_counts, runs):
+    """Median render time per inventory length; ms/row should stay flat as rows grow"""
+    print(f"\n{'Rows':>6} {'Engine':<10} {'Median':>10} {'Per row':>10} {'Pages':>6}")
+    for rows in row_counts:
+        wisp = SampleWISP(with_inventories(SAMPLE_DATA, rows))
+        for engine in ENGINES:
+            pdf, timings = time_engine(engine, wisp, runs)
+            pages, words = extract_words(pdf)
+            median = statistics.median(timings) * 1000
+            # Three lists of rows each
+            print(f'{rows:>6} {engine:<10} {median:>7.1f} ms {median / (3 * rows):>7.3f} ms {pages:>6}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Compare PDF size and render time for each output option.
+
+Run from the repository root:
+
+    python benchmarks/bench_pdf_size.py
+    python benchmarks/bench_pdf_size.py --from-db --engine canvas
+
+The corpus is the built-in benchmark sample, or every WISP in the database with
+--from-db. Object streams and linearization are skipped without pikepdf.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+from pdf_engines import ENGINES, TEMPLATES, WISPSnapshot, render_wisp_pdf
+from bench_pdf_engines import SAMPLE_DATA, SampleWISP
+
+# (label, render_wisp_pdf options, write ASCII85 streams like ReportLab's default)
+OPTION_SETS = [
+    ('reportlab defaults', {}, True),
+    ('uncompressed', {'compress': False}, False),
+    ('compress', {}, False),
+    ('compress + shared', {'shared_resources': True}, False),
+    ('compress + objstm', {'object_streams': True}, False),
+    ('compress + shared + objstm', {'shared_resources': True, 'object_streams': True}, False),
+    ('compress + linearize', {'linearize': True}, False),
+    ('all', {'shared_resources': True, 'object_streams': True, 'linearize': True}, False)
+]
+
+def load_corpus(from_db):
+    if not from_db:
+        return [SampleWISP(SAMPLE_DATA)]
+    from app import app
+    from models import WISP
+    with app.app_context():
+        return [WISPSnapshot.of(wisp) for wisp in WISP.query.order_by(WISP.id)]
+
+def has_pikepdf():
+    try:
+        import pikepdf
+    except ImportError:
+        return False
+    return True
+
+def measure(corpus, template, engine, options, use_a85, runs):
+    """Return (total bytes, median ms per document) for one option set"""
+    rl_config.useA85 = 1 if use_a85 else 0
+    try:
+        size = sum(len(render_wisp_pdf(wisp, template, engine, **options).getvalue()) for wisp in corpus)
+        timings = []
+        for _ in range(runs):
+            for wisp in corpus:
+                start = time.perf_counter()
+                render_wisp_pdf(wisp, template, engine, **options)
+                timings.append(time.perf_counter() - start)
+    finally:
+        rl_config.useA85 = 0
+    return size, statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--from-db', action='store_true', help='Use every WISP in the database as the corpus')
+    parser.add_argument('--template', default='rightworks', choices=list(TEMPLATES))
+    parser.add_argument('--engine', default='platypus', choices=list(ENGINES))
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.from_db)
+    pikepdf_available = has_pikepdf()
+    render_wisp_pdf(corpus[0], args.template, args.engine)  # Warm up imports and font metrics
+
+    print(f'{len(corpus)} document(s), template {args.template}, engine {args.engine}\n')
+    print(f"{'Option set':<28} {'Bytes':>10} {'vs default':>11} {'Median':>10}")
+    baseline = None
+    for label, options, use_a85 in OPTION_SETS:
+        if (options.get('object_streams') or options.get('linearize')) and not pikepdf_available:
+            print(f'{label:<28} {"skipped (pikepdf not installed)":>33}')
+            continue
+        size, median_ms = measure(corpus, args.template, args.engine, options, use_a85, args.runs)
+        baseline = baseline or size
+        print(f'{label:<28} {size:>10,} {100.0 * (size - baseline) / baseline:>+10.1f}% {median_ms:>7.2f} ms')
+
+if __name__ == '__main__':
+    main()
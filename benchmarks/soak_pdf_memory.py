@@ -0,0 +1,103 @@
+"""Soak test: render thousands of PDFs and check that memory stays flat.
+
+Run from the repository root:
+
+    python benchmarks/soak_pdf_memory.py --renders 2000
+    python benchmarks/soak_pdf_memory.py --renders 5000 --engine canvas --no-tracemalloc
+    python benchmarks/soak_pdf_memory.py --wisp-id 3 --through-app
+
+After a warm-up (imports, font metrics, caches filling), the sample WISP is
+rendered repeatedly while RSS and tracemalloc's traced size are sampled every
+--interval renders. The run fails (exit status 1) when either grows by more
+than its limit between the end of the warm-up and the end of the run, and lists
+the allocation sites that grew the most. --through-app downloads the PDF
+through the Flask route with the test client, so send_file buffers and the
+SQLAlchemy session are exercised too; it needs a WISP in the database.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memory_profile
+from memory_profile import MB
+from pdf_engines import ENGINES, render_wisp_pdf
+from bench_pdf_engines import SAMPLE_DATA, SampleWISP, load_wisp
+
+def direct_renderer(wisp, engine):
+    def render():
+        render_wisp_pdf(wisp, 'rightworks', engine).getvalue()
+    return render
+
+def app_renderer(wisp_id, engine):
+    from app import app
+    client = app.test_client()
+    def render():
+        response = client.get(f'/wisp/{wisp_id}/pdf?engine={engine}')
+        if response.status_code != 200:
+            raise SystemExit(f'/wisp/{wisp_id}/pdf returned {response.status_code}')
+        response.close()
+    return render
+
+def sample():
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    return memory_profile.rss_bytes(), traced
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--renders', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--interval', type=int, default=250, help='Renders between memory samples')
+    parser.add_argument('--engine', choices=ENGINES, default='platypus')
+    parser.add_argument('--wisp-id', type=int, help='Render a WISP from the database instead of the built-in sample')
+    parser.add_argument('--through-app', action='store_true', help='Download through the Flask route (needs --wisp-id)')
+    parser.add_argument('--max-traced-growth-mb', type=float, default=1.0)
+    parser.add_argument('--max-rss-growth-mb', type=float, default=20.0)
+    parser.add_argument('--no-tracemalloc', action='store_true', help='Only watch RSS; renders run at full speed')
+    args = parser.parse_args()
+    if args.through_app and not args.wisp_id:
+        parser.error('--through-app needs --wisp-id')
+
+    if args.through_app:
+        render = app_renderer(args.wisp_id, args.engine)
+    else:
+        wisp = load_wisp(args.wisp_id) if args.wisp_id else SampleWISP(SAMPLE_DATA)
+        render = direct_renderer(wisp, args.engine)
+    if not args.no_tracemalloc:
+        memory_profile.start(frames=1)
+
+    for _ in range(args.warmup):
+        render()
+    start_rss, start_traced = sample()
+    baseline = memory_profile.snapshot() if tracemalloc.is_tracing() else None
+    print(f"{'Renders':>8} {'RSS':>10} {'Traced':>10} {'ms/render':>10}")
+    print(f"{0:>8} {start_rss / MB:>7.1f} MB {start_traced / MB:>7.2f} MB")
+
+    started = time.perf_counter()
+    for done in range(1, args.renders + 1):
+        render()
+        if done % args.interval == 0 or done == args.renders:
+            rss, traced = sample()
+            elapsed = (time.perf_counter() - started) / done * 1000
+            print(f'{done:>8} {rss / MB:>7.1f} MB {traced / MB:>7.2f} MB {elapsed:>10.1f}')
+
+    rss_growth = (rss - start_rss) / MB
+    traced_growth = (traced - start_traced) / MB
+    print(f'\nRSS growth {rss_growth:+.1f} MB (limit {args.max_rss_growth_mb} MB), '
+          f'traced growth {traced_growth:+.2f} MB (limit {args.max_traced_growth_mb} MB)')
+    if baseline is not None:
+        print('\nTop allocation growth since warm-up:')
+        for stat in memory_profile.snapshot().compare_to(baseline, 'lineno')[:10]:
+            print(f'  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  {stat.traceback[0]}')
+
+    failed = rss_growth > args.max_rss_growth_mb or (baseline is not None and traced_growth > args.max_traced_growth_mb)
+    print('\nFAIL: memory grew during the soak' if failed else '\nOK: memory stayed flat')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
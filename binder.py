@@ -0,0 +1,121 @@
+"""Firm binder: many WISPs combined into one PDF for auditors.
+
+The WISPs are rendered in parallel on a RenderPool's worker processes and
+merged in order with pypdf, behind contents pages that link to each WISP, with
+a bookmark per WISP. The contents pages list a fixed number of WISPs each, so
+their page count, and with it every WISP's page number, is known once the
+last WISP is rendered.
+"""
+import io
+import math
+from datetime import datetime
+from sqlalchemy import select
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from models import db, WISP, row_data
+from pdf_engines import WISPSnapshot
+from canvas_pdf_generator import LEFT, RIGHT, TOP, RIGHTWORKS_BLUE
+
+BINDER_TITLE = 'WISP Binder'
+ENTRIES_PER_PAGE = 32
+ROW_HEIGHT = 18
+ROW_RULE = colors.Color(0.85, 0.85, 0.85)
+BATCH_SIZE = 100
+
+def parse_ids(value):
+    """WISP ids from a comma-separated string, or None (every WISP) when blank"""
+    if not (value or '').strip():
+        return None
+    return [int(part) for part in value.split(',') if part.strip().isdigit()]
+
+def binder_wisps(ids=None, batch_size=BATCH_SIZE):
+    """WISPSnapshots of the WISPs with the given ids, or of every WISP,
+    ordered by company name and loaded batch_size rows at a time"""
+    stmt = select(WISP.id, WISP.company_name, WISP.created_at, WISP.updated_at).order_by(WISP.company_name, WISP.id)
+    if ids is not None:
+        stmt = stmt.where(WISP.id.in_(ids))
+    rows = db.session.execute(stmt).all()
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        data = dict(
+            (wisp_id, row_data(data_blob, legacy_data))
+            for wisp_id, data_blob, legacy_data in db.session.execute(
+                select(WISP.id, WISP.data_blob, WISP.data).where(WISP.id.in_([row.id for row in batch]))
+            )
+        )
+        for row in batch:
+            yield WISPSnapshot(data[row.id], row.id, row.company_name, row.created_at, row.updated_at)
+
+def write_binder(output, wisps, pool, template=None, engine=None, title=BINDER_TITLE, **options):
+    """Render WISPs (or WISPSnapshots) on pool (a pdf_engines.RenderPool) and
+    write the binder to the binary stream output; returns the number of WISPs.
+    options are passed to pool.render_many (limiter, priority and the PDF options).
+
+    pypdf keeps every page in memory until the contents pages, which need
+    every WISP's page count, are inserted, so nothing is written before the
+    last WISP is rendered."""
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.annotations import Link
+
+    names = []
+    def named(wisps):
+        for wisp in wisps:
+            names.append(wisp.company_name or 'Untitled WISP')
+            yield wisp
+
+    writer = PdfWriter()
+    starts = []
+    for pdf in pool.render_many(named(wisps), template, engine, **options):
+        starts.append(len(writer.pages))
+        writer.append(PdfReader(io.BytesIO(pdf)), import_outline=False)
+
+    contents_pages = max(1, math.ceil(len(names) / ENTRIES_PER_PAGE))
+    entries = [(name, contents_pages + start) for name, start in zip(names, starts)]
+    contents, links = _contents_pdf(title, entries)
+    for index, page in enumerate(PdfReader(contents).pages):
+        writer.insert_page(page, index)
+    for page, rect, target in links:
+        writer.add_annotation(page, Link(rect=rect, target_page_index=target))
+    for name, target in entries:
+        writer.add_outline_item(name, target)
+    writer.add_metadata({'/Title': title})
+    writer.page_mode = '/UseOutlines'
+    writer.write(output)
+    return len(entries)
+
+def _contents_pdf(title, entries):
+    """Contents pages for (name, page index) entries; returns the PDF buffer and
+    (contents page, rect, target page index) of each entry's link"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    links = []
+    generated = datetime.now().strftime('%B %d, %Y')
+    for page, start in enumerate(range(0, max(len(entries), 1), ENTRIES_PER_PAGE)):
+        c.setFillColor(RIGHTWORKS_BLUE)
+        c.setFont('Helvetica-Bold', 20)
+        c.drawString(LEFT, TOP - 20, title if page == 0 else f'{title} (continued)')
+        c.setFillColor(colors.black)
+        c.setFont('Helvetica', 10)
+        c.drawString(LEFT, TOP - 40, f'{len(entries)} WISPs, generated {generated}')
+        c.setStrokeColor(ROW_RULE)
+        y = TOP - 70
+        for name, target in entries[start:start + ENTRIES_PER_PAGE]:
+            c.drawString(LEFT, y, _fit(name, RIGHT - LEFT - 40, 'Helvetica', 10))
+            c.drawRightString(RIGHT, y, str(target + 1))
+            c.line(LEFT, y - 5, RIGHT, y - 5)
+            links.append((page, (LEFT, y - 5, RIGHT, y + ROW_HEIGHT - 5), target))
+            y -= ROW_HEIGHT
+        c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer, links
+
+def _fit(text, width, font, size):
+    """text, shortened with an ellipsis to fit width"""
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + '…', font, size) > width:
+        text = text[:-1]
+    return text + '…'
@@ -0,0 +1,401 @@
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.utils import simpleSplit
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+from reportlab.pdfgen import canvas
+from xml.sax.saxutils import escape
+import io
+from datetime import datetime
+from checklists import FTC_CHECKLIST
+from inventory import INVENTORIES
+from comprehensive_pdf_generator import footer_callback
+
+# Fixed-layout WISP renderer that draws straight onto a ReportLab canvas.
+# The document structure is known in advance, so instead of building a Platypus
+# story (paragraph parsing, frame layout, table splitting) text is positioned
+# with a simple cursor. Only free-text answers go through Paragraph layout.
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+FRAME_PADDING = 6  # SimpleDocTemplate's frame padding, kept so both engines line up
+LEFT = 0.75 * inch + FRAME_PADDING
+RIGHT = PAGE_WIDTH - 0.75 * inch - FRAME_PADDING
+TOP = PAGE_HEIGHT - 0.75 * inch - FRAME_PADDING
+BOTTOM = 1.0 * inch + FRAME_PADDING  # More space for footer
+CONTENT_WIDTH = RIGHT - LEFT
+CENTER = PAGE_WIDTH / 2
+
+RIGHTWORKS_BLUE = colors.Color(0.133, 0.380, 0.682)
+ROW_SHADE = colors.Color(0.95, 0.95, 0.95)
+
+# (font, size, leading, space before, space after, color)
+TITLE = ('Helvetica-Bold', 24, 22, 0, 20, RIGHTWORKS_BLUE)
+PREPARED_FOR = ('Helvetica-Bold', 12, 12, 20, 5, colors.black)
+COMPANY_INFO = ('Helvetica', 10, 12, 2, 2, colors.black)
+DATE_LINE = ('Helvetica', 10, 12, 15, 20, colors.black)
+SECTION_TITLE = ('Helvetica-Bold', 14, 18, 20, 10, RIGHTWORKS_BLUE)
+SUB_SECTION = ('Helvetica-Bold', 12, 18, 20, 10, RIGHTWORKS_BLUE)
+BODY = ('Helvetica', 10, 12, 6, 6, colors.black)
+
+def _centered_col_x(col_widths):
+    """Column edge x positions of a table centred in the content width"""
+    left = LEFT + (CONTENT_WIDTH - sum(col_widths)) / 2
+    return [left + sum(col_widths[:i]) for i in range(len(col_widths) + 1)]
+
+# FTC checklist table geometry, precomputed from the fixed column widths
+FTC_HEADER = ['Description', 'Citation', 'In place', 'Not in place', 'Vendor/Date']
+FTC_COL_WIDTHS = [2.2 * inch, 1.2 * inch, 0.8 * inch, 0.8 * inch, 1.4 * inch]
+FTC_COL_X = _centered_col_x(FTC_COL_WIDTHS)
+CELL_PAD_X = 6
+CELL_PAD_Y = 3
+HEADER_BOTTOM_PAD = 12
+CELL_LEADING = 12  # Table cell leading for plain strings
+DESCRIPTION_LEADING = 10
+FTC_LEADINGS = [DESCRIPTION_LEADING] + [CELL_LEADING] * 4
+
+# Inventory list tables, laid out like the Platypus engine's LongTables
+INVENTORY_COL_X = {
+    name: _centered_col_x([width * inch for column, header, width in columns])
+    for name, (title, columns) in INVENTORIES.items()
+}
+
+FREE_TEXT_STYLE = ParagraphStyle('FreeText', fontName='Helvetica', fontSize=10, leading=12)
+
+PURPOSE_ITEMS = [
+    "Ensure the proper security and confidentiality of PII and other sensitive customer information collected, created and maintained.",
+    "Comply with applicable data security laws; including IRS Publication 4557, 5708 and the FTC Safeguards Rule.",
+    "Document and show auditors/ data safeguards and policies.",
+    "Define an information security program that is appropriate to the Company's size, business and resources, and the amount of PII and other sensitive information maintained by the Company.",
+    "Protect clients from unauthorized access."
+]
+
+SCOPE_ITEMS = [
+    "Applies to all employees, contractors, officers and directors of the Company.",
+    "Applies to any PII storage locations or records.",
+    "Applies to security of PII and sensitive information of both the company and its clients.",
+    "Cataloging existing preventive strategies against data breaches.",
+    "Ongoing evaluation and review of the efficacy of the established protective measures.",
+    "For the purposes of this WISP, PII includes any of the following items to the extent it could be used, alone or in combination with other information, to identify a specific natural person or individual household:"
+]
+
+PII_ITEMS = [
+    "First and last name combination",
+    "Personal phone number",
+    "Purchase history",
+    "Bank account information",
+    "Credit card numbers",
+    "CRM data",
+    "Tax prep software data",
+    "Driver's license information",
+    "Social security number",
+    "Date of birth",
+    "Employment history",
+    "Previous tax returns",
+    "Financial statements",
+    "Private email addresses"
+]
+
+QI_REPORT_TEXT = ("Company's Qualified Individual shall report in writing to the Company's [Board of Directors] [senior management] "
+    "and such report shall include an overall assessment of Company's compliance with the information "
+    "security program and provide specific reporting on the elements provided in this Written Information Security "
+    "Plan, as well as security events and how management responded, and recommendations for changes in the "
+    "information security program.")
+
+def _wrap_static(items, prefix=''):
+    font, size = BODY[0], BODY[1]
+    return [simpleSplit(prefix + item, font, size, CONTENT_WIDTH) for item in items]
+
+# Boilerplate never changes, so its line breaks are computed once at import
+PURPOSE_LINES = _wrap_static(PURPOSE_ITEMS, '• ')
+SCOPE_LINES = _wrap_static(SCOPE_ITEMS, '• ')
+PII_LINES = _wrap_static(PII_ITEMS, '• ')
+QI_REPORT_LINES = _wrap_static([QI_REPORT_TEXT])[0]
+
+class _PageWriter:
+    """Cursor-based text placement with page breaks and the footer on every page"""
+
+    def __init__(self, canvas_obj, shared_resources=False):
+        self.c = canvas_obj
+        self.y = TOP
+        self.prev_space_after = 0
+        self.draw_footer = footer_callback(shared_resources)
+        self.draw_footer(self.c, None)
+
+    def page_break(self):
+        self.c.showPage()
+        self.y = TOP
+        self.prev_space_after = 0
+        self.draw_footer(self.c, None)
+
+    def finish(self):
+        self.c.save()
+
+    def space(self, height):
+        self.y -= height
+        self.prev_space_after = 0
+
+    def _space_before(self, space_before):
+        # Collapse adjacent spacing the way Platypus frames do
+        if self.y < TOP:
+            self.y -= max(space_before - self.prev_space_after, 0)
+
+    def lines(self, lines, style, align='left'):
+        font, size, leading, space_before, space_after, color = style
+        self._space_before(space_before)
+        if self.y - leading * len(lines) < BOTTOM:
+            self.page_break()
+        self.c.setFont(font, size)
+        self.c.setFillColor(color)
+        for line in lines:
+            self.y -= leading
+            baseline = self.y + (leading - size)
+            if align == 'center':
+                self.c.drawCentredString(CENTER, baseline, line)
+            else:
+                self.c.drawString(LEFT, baseline, line)
+        self.y -= space_after
+        self.prev_space_after = space_after
+
+    def text(self, text, style, align='left'):
+        self.lines(simpleSplit(text, style[0], style[1], CONTENT_WIDTH), style, align)
+
+    def free_text(self, text, style=BODY):
+        """Flow layout fallback for user-entered free text of unknown length"""
+        space_before, space_after = style[3], style[4]
+        self._space_before(space_before)
+        paragraph = Paragraph(escape(text).replace('\n', '<br/>'), FREE_TEXT_STYLE)
+        width, height = paragraph.wrap(CONTENT_WIDTH, TOP - BOTTOM)
+        while height > self.y - BOTTOM:
+            parts = paragraph.split(CONTENT_WIDTH, self.y - BOTTOM)
+            if len(parts) < 2:
+                self.page_break()
+                continue
+            first, paragraph = parts[0], parts[1]
+            first.wrap(CONTENT_WIDTH, self.y - BOTTOM)
+            first.drawOn(self.c, LEFT, self.y - first.height)
+            self.page_break()
+            width, height = paragraph.wrap(CONTENT_WIDTH, TOP - BOTTOM)
+        paragraph.drawOn(self.c, LEFT, self.y - height)
+        self.y -= height + space_after
+        self.prev_space_after = space_after
+
+    def table(self, header, rows, col_x, leadings, centered=(), row_shades=(colors.white, ROW_SHADE)):
+        """Draw a grid table, repeating the header row after each page break.
+
+        Each row is a list of cells; a cell is a list of already wrapped lines,
+        spaced by the leading given for its column.
+        """
+        header_height = CELL_LEADING + CELL_PAD_Y + HEADER_BOTTOM_PAD
+
+        def draw_cells(top, cells):
+            for i, cell in enumerate(cells):
+                baseline = top - CELL_PAD_Y - self.c._fontsize
+                for line in cell:
+                    if i in centered:
+                        self.c.drawCentredString((col_x[i] + col_x[i + 1]) / 2, baseline, line)
+                    else:
+                        self.c.drawString(col_x[i] + CELL_PAD_X, baseline, line)
+                    baseline -= leadings[i]
+
+        def draw_header():
+            top = self.y
+            self.c.setFillColor(RIGHTWORKS_BLUE)
+            self.c.rect(col_x[0], top - header_height, col_x[-1] - col_x[0], header_height, stroke=0, fill=1)
+            self.c.setFillColor(colors.whitesmoke)
+            self.c.setFont('Helvetica-Bold', 9)
+            draw_cells(top, [[label] for label in header])
+            self._grid(top, header_height, col_x)
+            self.y -= header_height
+            self.c.setFont('Helvetica', 8)
+
+        if self.y - header_height - CELL_LEADING - 2 * CELL_PAD_Y < BOTTOM:
+            self.page_break()
+        draw_header()
+        for index, row in enumerate(rows):
+            row_height = max(max(len(cell), 1) * leadings[i] for i, cell in enumerate(row)) + 2 * CELL_PAD_Y
+            if self.y - row_height < BOTTOM:
+                self.page_break()
+                draw_header()
+            top = self.y
+            self.c.setFillColor(row_shades[index % len(row_shades)])
+            self.c.rect(col_x[0], top - row_height, col_x[-1] - col_x[0], row_height, stroke=0, fill=1)
+            self.c.setFillColor(colors.black)
+            draw_cells(top, row)
+            self._grid(top, row_height, col_x)
+            self.y -= row_height
+        self.prev_space_after = 0
+
+    def _grid(self, top, height, col_x):
+        self.c.setStrokeColor(colors.black)
+        self.c.setLineWidth(1)
+        self.c.rect(col_x[0], top - height, col_x[-1] - col_x[0], height, stroke=1, fill=0)
+        for x in col_x[1:-1]:
+            self.c.line(x, top, x, top - height)
+
+def _inventory_table(writer, name, rows, blank_rows=0):
+    """Draw an inventory list from rows of cell strings, wrapping each cell to its column"""
+    title, columns = INVENTORIES[name]
+    col_x = INVENTORY_COL_X[name]
+    widths = [col_x[i + 1] - col_x[i] - 2 * CELL_PAD_X for i in range(len(columns))]
+    cells = [[simpleSplit(text, 'Helvetica', 8, width) for text, width in zip(row, widths)] for row in rows]
+    if not cells:
+        cells = [[[] for _ in columns] for _ in range(blank_rows)]
+    writer.table([header for column, header, width in columns], cells, col_x, [DESCRIPTION_LEADING] * len(columns))
+
+def generate_canvas_wisp_pdf(wisp, compress=True, shared_resources=False):
+    """Generate the Rightworks-style WISP PDF with fixed-layout canvas drawing"""
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, pageCompression=1 if compress else 0)
+    document = wisp.get_document()
+
+    company_name = document.company_name or 'Company Name'
+    writer = _PageWriter(c, shared_resources)
+
+    # Title Page
+    writer.lines(['Written', 'Information', 'Security Plan', '(WISP)'], TITLE, align='center')
+    writer.space(20)
+    writer.lines(['PREPARED FOR'], PREPARED_FOR, align='center')
+    writer.lines([company_name], COMPANY_INFO, align='center')
+
+    address_parts = list(document.address_lines)
+    if document.contact_email:
+        address_parts.append(document.contact_email)
+    for part in address_parts:
+        writer.lines([part], COMPANY_INFO, align='center')
+    writer.space(10)
+
+    if document.prepared_by:
+        writer.lines([f"Prepared by: {document.prepared_by}"], DATE_LINE, align='center')
+    writer.lines([f"Created on: {datetime.now().strftime('%B %d, %Y')}"], DATE_LINE, align='center')
+    if document.annual_review_date:
+        review_date_str = document.annual_review_date.strftime('%B %d, %Y')
+        writer.lines([f"Annual Review Date: {review_date_str}"], DATE_LINE, align='center')
+    writer.page_break()
+
+    # I. OBJECTIVE
+    writer.lines(['I. OBJECTIVE'], SECTION_TITLE)
+    writer.text(
+        f"The objective of {company_name}'s (the \"Company\") WISP is to support and document the implementation "
+        "and maintenance of necessary protective measures the Company has selected to protect the personally "
+        "identifiable information (PII) and other sensitive customer data it collects, creates, uses and maintains. This "
+        "WISP has been prepared in line with the requirements and guidelines of the IRS, the Gramm-Leach-Bliley Act "
+        "(GLBA), and the FTC Safeguards Rule. This document will also act as the comprehensive record of all internal "
+        "policies and processes designed to secure information of Company's customers.",
+        BODY
+    )
+    writer.space(15)
+
+    # II. PURPOSE
+    writer.lines(['II. PURPOSE'], SECTION_TITLE)
+    for lines in PURPOSE_LINES:
+        writer.lines(lines, BODY)
+    writer.space(15)
+
+    # III. SCOPE
+    writer.lines(['III. SCOPE'], SECTION_TITLE)
+    for lines in SCOPE_LINES:
+        writer.lines(lines, BODY)
+    writer.space(10)
+    writer.lines(['PII includes'], SECTION_TITLE)
+    for lines in PII_LINES:
+        writer.lines(lines, BODY)
+    writer.page_break()
+
+    # FTC Checklist Table
+    writer.lines(['Checklist: Required FTC Software and Policies'], SECTION_TITLE)
+    description_width = FTC_COL_WIDTHS[0] - 2 * CELL_PAD_X
+    rows = []
+    for description, citation, field, vendor_field in FTC_CHECKLIST:
+        in_place = getattr(document, field)
+        rows.append([
+            simpleSplit(description, 'Helvetica', 8, description_width),
+            [citation],
+            ['✓'] if in_place else [],
+            [] if in_place else ['✓'],
+            (getattr(document, vendor_field) or '').split('\n')
+        ])
+    writer.table(FTC_HEADER, rows, FTC_COL_X, FTC_LEADINGS, centered=(2, 3))
+    writer.page_break()
+
+    # IRS Security Six
+    writer.lines(['Checklist: IRS "Security Six"'], SECTION_TITLE)
+    security_six_items = [
+        ["Use an antivirus", "Antivirus installed:", document.antivirus_solution or ''],
+        ["Use backup software/services", "Backup:", document.backup_solution or ''],
+        ["", "Is it encrypted?", "Yes" if document.backup_encrypted else "No"],
+        ["Use a firewall", "Firewall:", document.firewall_solution or ''],
+        ["Use drive encryption", "Encryption through:", document.encryption_solution or ''],
+        ["Multifactor authentication", "Accessing customer data:", document.mfa_solution or ''],
+        ["Create and secure virtual private networks", "VPN:", document.vpn_solution or '']
+    ]
+    bold_body = ('Helvetica-Bold',) + BODY[1:]
+    for category, label, value in security_six_items:
+        if category:
+            writer.lines([category], bold_body)
+        writer.text(f"{label} {value}", BODY)
+        writer.space(5)
+    writer.text("Endpoint detection and response: " + (document.endpoint_detection_solution or 'Solution name/provider'), BODY)
+    writer.text("Intrusion detection systems: " + (document.intrusion_detection_solution or 'Solution name/provider'), BODY)
+    writer.page_break()
+
+    # Password Policy Section
+    writer.lines(['IRS Publication 4557: Safeguarding Taxpayer Data'], SECTION_TITLE)
+    writer.lines(['Create strong passwords'], SUB_SECTION)
+    password_items = [
+        f"Minimum of {document.password_min_length or '8'} characters",
+        f"Password must meet complexity requirements: {'Enabled' if document.password_complexity else 'Disabled'}",
+        f"Enforce password history: 24 (max) passwords remembered - {'Enabled' if document.password_history_enabled else 'Disabled'}",
+        "Avoid personal information use phrases instead",
+        f"Change default/temporary passwords that come with accounts including printers - {'Yes' if document.default_passwords_changed else 'No'}",
+        f"Store passwords in a secure location like a safe or locked file cabinet - {'Yes' if document.password_secure_storage else 'No'}",
+        f"Use MFA for password manager - {'Yes' if document.password_manager_mfa else 'No'}"
+    ]
+    for item in password_items:
+        writer.text(item, BODY)
+    writer.space(15)
+
+    # Wireless Security Section
+    writer.lines(['Secure wireless networks'], SUB_SECTION)
+    wireless_items = [
+        f"Default login on router? {'Changed' if document.wireless_admin_password_changed else 'Not changed'}",
+        f"Turn off public SSID - {'Yes' if document.wireless_ssid_hidden else 'No'}",
+        f"Change guest wireless network to unidentifiable name - {'Yes' if document.wireless_guest_network else 'No'}",
+        f"Reduce WLAN Transmit power (TX) range to not work outside of office if needed - {'Yes' if document.wireless_tx_power_reduced else 'No'}",
+        f"WPA2 and AES Encryption enabled - {'Yes' if document.wireless_wpa2_enabled else 'No'}",
+        f"Do not use WEP - {'WEP Disabled' if document.wireless_wep_disabled else 'Check WEP status'}"
+    ]
+    for item in wireless_items:
+        writer.text(item, BODY)
+    writer.page_break()
+
+    # PII Inventory List
+    writer.lines(['PII inventory list'], SECTION_TITLE)
+    writer.text("List anywhere that contains PII. Examples include but are not limited to: third-party apps, "
+                "cloud provider(s), data storage(s), email provider(s), CRM(s) and social media contractor(s).", BODY)
+    writer.space(10)
+    pii_rows = [(document.category_label(row.category), row.name, row.notes) for row in document.pii_inventory]
+    _inventory_table(writer, 'pii_locations', pii_rows, blank_rows=6)
+    for name in ('systems', 'vendors'):
+        rows = getattr(document, name)
+        if rows:
+            writer.space(15)
+            writer.lines([INVENTORIES[name][0]], SUB_SECTION)
+            _inventory_table(writer, name, rows)
+    writer.page_break()
+
+    # Qualified Individual Section
+    writer.text("Qualified Individual implementing and supervising the information security program", SECTION_TITLE)
+    qi_name = document.qualified_individual_name or '__________________________________________'
+    qi_qualifications = document.qualified_individual_qualifications or '__________________________________________'
+    qi_supervisor = document.qualified_individual_supervisor or '__________________________________________'
+    writer.text(f"Qualified Individual: {qi_name}", BODY)
+    writer.free_text(f"Qualifications/experience: {qi_qualifications}")
+    writer.text(f"Supervisor: {qi_supervisor}", BODY)
+    writer.space(10)
+    writer.lines(QI_REPORT_LINES, BODY)
+
+    writer.finish()
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,27 @@
+# FTC Safeguards Rule checklist shared by the PDF generator and compliance analytics.
+# Each entry is (description, citation, in-place field, vendor/date field).
+FTC_CHECKLIST = [
+    ('Designate a qualified individual', '16 CFR 314.4 (a)', 'qualified_individual_designated', 'qualified_individual_vendor'),
+    ('Conduct risk assessment', '16 CFR 314.4 (a)', 'risk_assessment_conducted', 'risk_assessment_vendor'),
+    ('Encryption at rest', '16 CFR 314.4 (c) (3)', 'encryption_at_rest', 'encryption_at_rest_vendor'),
+    ('Encryption in transit', '16 CFR 314.4 (c) (3)', 'encryption_in_transit', 'encryption_in_transit_vendor'),
+    ('Multifactor authentication', '16 CFR 314.4 (c) (5)', 'mfa_enabled', 'mfa_vendor'),
+    ('Continuous monitoring with IDS/RMM or network scan and penetration testing', '16 CFR 314.4 (d) (2)', 'continuous_monitoring', 'continuous_monitoring_vendor'),
+    ('Security awareness training', '16 CFR 314.4 (e)', 'security_awareness_training', 'security_awareness_vendor'),
+    ('Assess providers', '16 CFR 314.4 (f)', 'assess_providers', 'assess_providers_vendor'),
+    ('Annual WISP review', '16 CFR 314.4 (g)', 'annual_wisp_review', 'annual_wisp_review_vendor'),
+    ('Develop a Written Information Security Plan', '16 CFR 314.4 (h)', 'wisp_developed', 'wisp_developed_vendor'),
+    ('Annual director reports', '16 CFR 314.4 (h)', 'annual_director_reports', 'annual_director_reports_vendor'),
+    ('Annual disposal of records', 'FTC SWS (1)', 'annual_disposal_records', 'annual_disposal_vendor'),
+    ('Restricted access to data', 'FTC SWS (2)', 'restricted_access_data', 'restricted_access_vendor'),
+    ('Require complex passwords', 'FTC SWS (3)', 'complex_passwords_required', 'complex_passwords_vendor'),
+    ('Firewall', 'FTC SWS (5)', 'firewall_protection', 'firewall_vendor'),
+    ('Intrusion detection systems (IDS)', 'FTC SWS (5)', 'ids_enabled', 'ids_vendor'),
+    ('Segmented / IOT / Guest network', 'FTC SWS (5)', 'segmented_network', 'segmented_network_vendor'),
+    ('Endpoint security', 'FTC SWS (6)', 'endpoint_security', 'endpoint_security_vendor'),
+    ('Third-party patch management', 'FTC SWS (6)', 'third_party_patch_mgmt', 'third_party_patch_vendor'),
+    ('Windows patch management', 'FTC SWS (6)', 'windows_patch_mgmt', 'windows_patch_vendor')
+]
+
+# Boolean fields tracked per WISP in the wisp_control table
+CONTROL_FIELDS = [field for description, citation, field, vendor_field in FTC_CHECKLIST]
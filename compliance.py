@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from sqlalchemy import func, select, case, update
+from models import db, WISP, WISPControl, parse_review_date
+from checklists import FTC_CHECKLIST
+
+REFRESH_BATCH_SIZE = 500
+
+def control_summary():
+    """Count WISPs with each FTC checklist control in place or missing.
+
+    Returns one dict per checklist item, in checklist order.
+    """
+    in_place_count = func.sum(case((WISPControl.in_place, 1), else_=0))
+    stmt = select(WISPControl.control, in_place_count, func.count()).group_by(WISPControl.control)
+    counts = {control: (in_place or 0, total) for control, in_place, total in db.session.execute(stmt)}
+
+    summary = []
+    for description, citation, field, vendor_field in FTC_CHECKLIST:
+        in_place, total = counts.get(field, (0, 0))
+        summary.append({
+            'control': field,
+            'description': description,
+            'citation': citation,
+            'in_place': in_place,
+            'missing': total - in_place,
+            'total': total,
+            'percent_in_place': round(100.0 * in_place / total, 1) if total else None
+        })
+    return summary
+
+def wisps_missing_control(control, limit=50, offset=0):
+    """WISPs that do not have the given control in place, newest first"""
+    stmt = (
+        select(WISP.id, WISP.company_name, WISP.updated_at)
+        .join(WISPControl, WISPControl.wisp_id == WISP.id)
+        .where(WISPControl.control == control, WISPControl.in_place.is_(False))
+        .order_by(WISP.updated_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return [row._asdict() for row in db.session.execute(stmt)]
+
+def overdue_reviews(today=None, limit=50, offset=0):
+    """WISPs whose annual review date has passed, most overdue first"""
+    today = today or date.today()
+    stmt = (
+        select(WISP.id, WISP.company_name, WISP.review_due_date)
+        .where(WISP.review_due_date < today)
+        .order_by(WISP.review_due_date)
+        .limit(limit)
+        .offset(offset)
+    )
+    return [row._asdict() for row in db.session.execute(stmt)]
+
+def review_status_counts(today=None, due_soon_days=30):
+    """Counts of WISPs by review status: overdue, due soon, current and unscheduled"""
+    today = today or date.today()
+    due_soon = today + timedelta(days=due_soon_days)
+    status = case(
+        (WISP.review_due_date.is_(None), 'unscheduled'),
+        (WISP.review_due_date < today, 'overdue'),
+        (WISP.review_due_date <= due_soon, 'due_soon'),
+        else_='current'
+    )
+    counts = {'overdue': 0, 'due_soon': 0, 'current': 0, 'unscheduled': 0}
+    for name, count in db.session.execute(select(status, func.count()).group_by(status)):
+        counts[name] = count
+    return counts
+
+def refresh_all(batch_size=REFRESH_BATCH_SIZE):
+    """Rebuild review dates, control rows and vendor directory links for every WISP.
+
+    Only needed once for WISPs saved before those tables existed; afterwards
+    WISP.set_data keeps them in sync on every save.
+    """
+    refreshed = 0
+    last_id = 0
+    while True:
+        batch = WISP.query.filter(WISP.id > last_id).order_by(WISP.id).limit(batch_size).all()
+        if not batch:
+            break
+        for wisp in batch:
+            data = wisp.get_data()
+            review_due_date = parse_review_date(data.get('annual_review_date'))
+            if wisp.review_due_date != review_due_date:
+                # Keep updated_at as is; this is derived data, not an edit
+                db.session.execute(
+                    update(WISP)
+                    .where(WISP.id == wisp.id)
+                    .values(review_due_date=review_due_date, updated_at=WISP.updated_at)
+                )
+            wisp.sync_controls(data)
+            wisp.sync_vendors(data)
+        last_id = batch[-1].id
+        db.session.commit()
+        refreshed += len(batch)
+        db.session.expunge_all()
+    return refreshed
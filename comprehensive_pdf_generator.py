@@ -1,5 +1,5 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, LongTable, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
@@ -7,6 +7,9 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 import io
 from datetime import datetime
+from xml.sax.saxutils import escape
+from checklists import FTC_CHECKLIST
+from inventory import INVENTORIES
 
 def draw_footer(canvas_obj, doc):
     """Draw footer on each page"""
@@ -24,7 +27,49 @@ def draw_footer(canvas_obj, doc):
     canvas_obj.drawString(x_position, y_position, footer_text)
     canvas_obj.restoreState()
 
-def generate_complete_rightworks_wisp_pdf(wisp):
+FOOTER_FORM = 'RightworksFooter'
+
+def draw_shared_footer(canvas_obj, doc):
+    """Draw the footer from a form XObject that is defined once and reused by every page"""
+    if not canvas_obj.hasForm(FOOTER_FORM):
+        canvas_obj.beginForm(FOOTER_FORM)
+        draw_footer(canvas_obj, doc)
+        canvas_obj.endForm()
+    canvas_obj.doForm(FOOTER_FORM)
+
+def footer_callback(shared_resources=False):
+    """Page callback drawing the footer, shared as one XObject or drawn inline per page"""
+    return draw_shared_footer if shared_resources else draw_footer
+
+INVENTORY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.133, 0.380, 0.682)),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.Color(0.95, 0.95, 0.95)]),
+])
+
+def inventory_table(name, rows, cell_style, blank_rows=0):
+    """Table of an inventory list (see inventory.py) from rows of cell strings.
+
+    A LongTable with the header repeated on each page, so lists of any length
+    split across pages in time linear in the number of rows. With no rows,
+    blank_rows empty rows are printed to fill in by hand.
+    """
+    title, columns = INVENTORIES[name]
+    data = [[header for column, header, width in columns]]
+    for row in rows:
+        data.append([Paragraph(escape(text), cell_style) for text in row])
+    for _ in range(blank_rows if not rows else 0):
+        data.append([Paragraph('&nbsp;', cell_style) for _ in columns])
+    table = LongTable(data, colWidths=[width * inch for column, header, width in columns], repeatRows=1)
+    table.setStyle(INVENTORY_TABLE_STYLE)
+    return table
+
+def generate_complete_rightworks_wisp_pdf(wisp, compress=True, shared_resources=False):
     """Generate a complete Rightworks-style WISP PDF document"""
     
     buffer = io.BytesIO()
@@ -34,19 +79,14 @@ def generate_complete_rightworks_wisp_pdf(wisp):
         topMargin=0.75*inch, 
         bottomMargin=1.0*inch,  # More space for footer
         leftMargin=0.75*inch,
-        rightMargin=0.75*inch
+        rightMargin=0.75*inch,
+        pageCompression=1 if compress else 0
     )
     
-    # Get the data
-    data = wisp.get_data()
+    # Get the typed form data
+    document = wisp.get_document()
     
-    # Helper function to safely get string values
-    def safe_get(key, default='Not specified'):
-        """Safely get a value from data, ensuring it's a string"""
-        value = data.get(key, default)
-        return str(value) if value is not None else default
-    
-    company_name = safe_get('company_name', 'Company Name')
+    company_name = escape(document.company_name or 'Company Name')
     
     # Define styles
     styles = getSampleStyleSheet()
@@ -145,34 +185,23 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     story.append(Paragraph(company_name, company_info_style))
     
     # Company address and contact info
-    address_parts = []
-    if data.get('street_address'):
-        address_parts.append(data.get('street_address'))
-    if data.get('city') and data.get('state'):
-        city_state = f"{data.get('city')}, {data.get('state')}"
-        if data.get('zip_code'):
-            city_state += f" {data.get('zip_code')}"
-        address_parts.append(city_state)
-    if data.get('contact_email'):
-        address_parts.append(data.get('contact_email'))
+    address_parts = list(document.address_lines)
+    if document.contact_email:
+        address_parts.append(document.contact_email)
     
     for part in address_parts:
-        story.append(Paragraph(part, company_info_style))
+        story.append(Paragraph(escape(part), company_info_style))
     
     story.append(Spacer(1, 10))
     
     # Prepared by and dates
-    if data.get('prepared_by'):
-        story.append(Paragraph(f"Prepared by: {data.get('prepared_by')}", date_style))
+    if document.prepared_by:
+        story.append(Paragraph(f"Prepared by: {escape(document.prepared_by)}", date_style))
     
     story.append(Paragraph(f"Created on: {datetime.now().strftime('%B %d, %Y')}", date_style))
     
-    if data.get('annual_review_date'):
-        review_date = data.get('annual_review_date')
-        if hasattr(review_date, 'strftime'):
-            review_date_str = review_date.strftime('%B %d, %Y')
-        else:
-            review_date_str = str(review_date)
+    if document.annual_review_date:
+        review_date_str = document.annual_review_date.strftime('%B %d, %Y')
         story.append(Paragraph(f"Annual Review Date: {review_date_str}", date_style))
     
     # Footer will be automatically added to every page
@@ -254,26 +283,8 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     
     # Add FTC checklist items based on form data
     ftc_items = [
-        ['Designate a qualified individual', '16 CFR 314.4 (a)', data.get('qualified_individual_designated', False), data.get('qualified_individual_vendor', '')],
-        ['Conduct risk assessment', '16 CFR 314.4 (a)', data.get('risk_assessment_conducted', False), data.get('risk_assessment_vendor', '')],
-        ['Encryption at rest', '16 CFR 314.4 (c) (3)', data.get('encryption_at_rest', False), data.get('encryption_at_rest_vendor', '')],
-        ['Encryption in transit', '16 CFR 314.4 (c) (3)', data.get('encryption_in_transit', False), data.get('encryption_in_transit_vendor', '')],
-        ['Multifactor authentication', '16 CFR 314.4 (c) (5)', data.get('mfa_enabled', False), data.get('mfa_vendor', '')],
-        ['Continuous monitoring with IDS/RMM or network scan and penetration testing', '16 CFR 314.4 (d) (2)', data.get('continuous_monitoring', False), data.get('continuous_monitoring_vendor', '')],
-        ['Security awareness training', '16 CFR 314.4 (e)', data.get('security_awareness_training', False), data.get('security_awareness_vendor', '')],
-        ['Assess providers', '16 CFR 314.4 (f)', data.get('assess_providers', False), data.get('assess_providers_vendor', '')],
-        ['Annual WISP review', '16 CFR 314.4 (g)', data.get('annual_wisp_review', False), data.get('annual_wisp_review_vendor', '')],
-        ['Develop a Written Information Security Plan', '16 CFR 314.4 (h)', data.get('wisp_developed', False), data.get('wisp_developed_vendor', '')],
-        ['Annual director reports', '16 CFR 314.4 (h)', data.get('annual_director_reports', False), data.get('annual_director_reports_vendor', '')],
-        ['Annual disposal of records', 'FTC SWS (1)', data.get('annual_disposal_records', False), data.get('annual_disposal_vendor', '')],
-        ['Restricted access to data', 'FTC SWS (2)', data.get('restricted_access_data', False), data.get('restricted_access_vendor', '')],
-        ['Require complex passwords', 'FTC SWS (3)', data.get('complex_passwords_required', False), data.get('complex_passwords_vendor', '')],
-        ['Firewall', 'FTC SWS (5)', data.get('firewall_protection', False), data.get('firewall_vendor', '')],
-        ['Intrusion detection systems (IDS)', 'FTC SWS (5)', data.get('ids_enabled', False), data.get('ids_vendor', '')],
-        ['Segmented / IOT / Guest network', 'FTC SWS (5)', data.get('segmented_network', False), data.get('segmented_network_vendor', '')],
-        ['Endpoint security', 'FTC SWS (6)', data.get('endpoint_security', False), data.get('endpoint_security_vendor', '')],
-        ['Third-party patch management', 'FTC SWS (6)', data.get('third_party_patch_mgmt', False), data.get('third_party_patch_vendor', '')],
-        ['Windows patch management', 'FTC SWS (6)', data.get('windows_patch_mgmt', False), data.get('windows_patch_vendor', '')]
+        [description, citation, getattr(document, field), getattr(document, vendor_field) or '']
+        for description, citation, field, vendor_field in FTC_CHECKLIST
     ]
     
     for item in ftc_items:
@@ -317,24 +328,24 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     
     # Create Security Six section
     security_six_items = [
-        ["Use an antivirus", "Antivirus installed:", data.get('antivirus_solution', '')],
-        ["Use backup software/services", "Backup:", data.get('backup_solution', '')],
-        ["", "Is it encrypted?", "Yes" if data.get('backup_encrypted') else "No"],
-        ["Use a firewall", "Firewall:", data.get('firewall_solution', '')],
-        ["Use drive encryption", "Encryption through:", data.get('encryption_solution', '')],
-        ["Multifactor authentication", "Accessing customer data:", data.get('mfa_solution', '')],
-        ["Create and secure virtual private networks", "VPN:", data.get('vpn_solution', '')]
+        ["Use an antivirus", "Antivirus installed:", document.antivirus_solution or ''],
+        ["Use backup software/services", "Backup:", document.backup_solution or ''],
+        ["", "Is it encrypted?", "Yes" if document.backup_encrypted else "No"],
+        ["Use a firewall", "Firewall:", document.firewall_solution or ''],
+        ["Use drive encryption", "Encryption through:", document.encryption_solution or ''],
+        ["Multifactor authentication", "Accessing customer data:", document.mfa_solution or ''],
+        ["Create and secure virtual private networks", "VPN:", document.vpn_solution or '']
     ]
     
     for item in security_six_items:
         if item[0]:  # Only show the main category if it exists
             story.append(Paragraph(f"<b>{item[0]}</b>", body_style))
-        story.append(Paragraph(f"{item[1]} {item[2]}", body_style))
+        story.append(Paragraph(f"{item[1]} {escape(item[2])}", body_style))
         story.append(Spacer(1, 5))
     
     # Additional IRS items
-    story.append(Paragraph("Endpoint detection and response: " + safe_get('endpoint_detection_solution', 'Solution name/provider'), body_style))
-    story.append(Paragraph("Intrusion detection systems: " + safe_get('intrusion_detection_solution', 'Solution name/provider'), body_style))
+    story.append(Paragraph("Endpoint detection and response: " + escape(document.endpoint_detection_solution or 'Solution name/provider'), body_style))
+    story.append(Paragraph("Intrusion detection systems: " + escape(document.intrusion_detection_solution or 'Solution name/provider'), body_style))
     
     story.append(PageBreak())
     
@@ -343,13 +354,13 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     story.append(Paragraph("Create strong passwords", ParagraphStyle('SubSection', parent=section_title_style, fontSize=12)))
     
     password_items = [
-        f"Minimum of {data.get('password_min_length', '8')} characters",
-        f"Password must meet complexity requirements: {'Enabled' if data.get('password_complexity') else 'Disabled'}",
-        f"Enforce password history: 24 (max) passwords remembered - {'Enabled' if data.get('password_history_enabled') else 'Disabled'}",
+        f"Minimum of {escape(str(document.password_min_length or '8'))} characters",
+        f"Password must meet complexity requirements: {'Enabled' if document.password_complexity else 'Disabled'}",
+        f"Enforce password history: 24 (max) passwords remembered - {'Enabled' if document.password_history_enabled else 'Disabled'}",
         "Avoid personal information use phrases instead",
-        f"Change default/temporary passwords that come with accounts including printers - {'Yes' if data.get('default_passwords_changed') else 'No'}",
-        f"Store passwords in a secure location like a safe or locked file cabinet - {'Yes' if data.get('password_secure_storage') else 'No'}",
-        f"Use MFA for password manager - {'Yes' if data.get('password_manager_mfa') else 'No'}"
+        f"Change default/temporary passwords that come with accounts including printers - {'Yes' if document.default_passwords_changed else 'No'}",
+        f"Store passwords in a secure location like a safe or locked file cabinet - {'Yes' if document.password_secure_storage else 'No'}",
+        f"Use MFA for password manager - {'Yes' if document.password_manager_mfa else 'No'}"
     ]
     
     for item in password_items:
@@ -361,12 +372,12 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     story.append(Paragraph("Secure wireless networks", ParagraphStyle('SubSection', parent=section_title_style, fontSize=12)))
     
     wireless_items = [
-        f"Default login on router? {'Changed' if data.get('wireless_admin_password_changed') else 'Not changed'}",
-        f"Turn off public SSID - {'Yes' if data.get('wireless_ssid_hidden') else 'No'}",
-        f"Change guest wireless network to unidentifiable name - {'Yes' if data.get('wireless_guest_network') else 'No'}",
-        f"Reduce WLAN Transmit power (TX) range to not work outside of office if needed - {'Yes' if data.get('wireless_tx_power_reduced') else 'No'}",
-        f"WPA2 and AES Encryption enabled - {'Yes' if data.get('wireless_wpa2_enabled') else 'No'}",
-        f"Do not use WEP - {'WEP Disabled' if data.get('wireless_wep_disabled') else 'Check WEP status'}"
+        f"Default login on router? {'Changed' if document.wireless_admin_password_changed else 'Not changed'}",
+        f"Turn off public SSID - {'Yes' if document.wireless_ssid_hidden else 'No'}",
+        f"Change guest wireless network to unidentifiable name - {'Yes' if document.wireless_guest_network else 'No'}",
+        f"Reduce WLAN Transmit power (TX) range to not work outside of office if needed - {'Yes' if document.wireless_tx_power_reduced else 'No'}",
+        f"WPA2 and AES Encryption enabled - {'Yes' if document.wireless_wpa2_enabled else 'No'}",
+        f"Do not use WEP - {'WEP Disabled' if document.wireless_wep_disabled else 'Check WEP status'}"
     ]
     
     for item in wireless_items:
@@ -377,71 +388,28 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     # Continue with more sections...
     # PII Inventory List
     story.append(Paragraph("PII inventory list", section_title_style))
-    story.append(Paragraph("List anywhere that contains PII. Examples include but are not limited to:", body_style))
+    story.append(Paragraph("List anywhere that contains PII. Examples include but are not limited to: third-party apps, "
+                           "cloud provider(s), data storage(s), email provider(s), CRM(s) and social media contractor(s).", body_style))
     story.append(Spacer(1, 10))
+    cell_style = ParagraphStyle('CellText', parent=body_style, fontSize=8, leading=10)
+    pii_rows = [(document.category_label(row.category), row.name, row.notes) for row in document.pii_inventory]
+    story.append(inventory_table('pii_locations', pii_rows, cell_style, blank_rows=6))
     
-    # Third-party apps
-    story.append(Paragraph("1. Third-party apps", body_style))
-    apps = [data.get('third_party_apps_1', ''), data.get('third_party_apps_2', '')]
-    for i, app in enumerate(apps, 1):
-        if app:
-            story.append(Paragraph(f"   {chr(96+i)}. {app}", body_style))
-        else:
-            story.append(Paragraph(f"   {chr(96+i)}. __________________________________________________", body_style))
-    
-    # Cloud providers
-    story.append(Paragraph("2. Cloud provider(s)", body_style))
-    clouds = [data.get('cloud_providers_1', ''), data.get('cloud_providers_2', '')]
-    for i, cloud in enumerate(clouds, 1):
-        if cloud:
-            story.append(Paragraph(f"   {chr(96+i)}. {cloud}", body_style))
-        else:
-            story.append(Paragraph(f"   {chr(96+i)}. __________________________________________________", body_style))
-    
-    # Data storage
-    story.append(Paragraph("3. Data storage(s)", body_style))
-    storages = [data.get('data_storage_1', ''), data.get('data_storage_2', '')]
-    for i, storage in enumerate(storages, 1):
-        if storage:
-            story.append(Paragraph(f"   {chr(96+i)}. {storage}", body_style))
-        else:
-            story.append(Paragraph(f"   {chr(96+i)}. __________________________________________________", body_style))
-    
-    # Email providers
-    story.append(Paragraph("4. Email provider(s)", body_style))
-    emails = [data.get('email_providers_1', ''), data.get('email_providers_2', '')]
-    for i, email in enumerate(emails, 1):
-        if email:
-            story.append(Paragraph(f"   {chr(96+i)}. {email}", body_style))
-        else:
-            story.append(Paragraph(f"   {chr(96+i)}. __________________________________________________", body_style))
-    
-    # CRM systems
-    story.append(Paragraph("5. CRM(s)", body_style))
-    crms = [data.get('crm_systems_1', ''), data.get('crm_systems_2', '')]
-    for i, crm in enumerate(crms, 1):
-        if crm:
-            story.append(Paragraph(f"   {chr(96+i)}. {crm}", body_style))
-        else:
-            story.append(Paragraph(f"   {chr(96+i)}. __________________________________________________", body_style))
-    
-    # Social media contractors
-    story.append(Paragraph("6. Social media contractor(s)", body_style))
-    socials = [data.get('social_media_contractors_1', ''), data.get('social_media_contractors_2', '')]
-    for i, social in enumerate(socials, 1):
-        if social:
-            story.append(Paragraph(f"   {chr(96+i)}. {social}", body_style))
-        else:
-            story.append(Paragraph(f"   {chr(96+i)}. __________________________________________________", body_style))
+    for name in ('systems', 'vendors'):
+        rows = getattr(document, name)
+        if rows:
+            story.append(Spacer(1, 15))
+            story.append(Paragraph(INVENTORIES[name][0], ParagraphStyle('SubSection', parent=section_title_style, fontSize=12)))
+            story.append(inventory_table(name, rows, cell_style))
     
     story.append(PageBreak())
     
     # Qualified Individual Section
     story.append(Paragraph("Qualified Individual implementing and supervising the information security program", section_title_style))
     
-    qi_name = data.get('qualified_individual_name', '__________________________________________')
-    qi_qualifications = data.get('qualified_individual_qualifications', '__________________________________________')
-    qi_supervisor = data.get('qualified_individual_supervisor', '__________________________________________')
+    qi_name = escape(document.qualified_individual_name or '__________________________________________')
+    qi_qualifications = escape(document.qualified_individual_qualifications or '__________________________________________')
+    qi_supervisor = escape(document.qualified_individual_supervisor or '__________________________________________')
     
     story.append(Paragraph(f"Qualified Individual: {qi_name}", body_style))
     story.append(Paragraph(f"Qualifications/experience: {qi_qualifications}", body_style))
@@ -463,6 +431,185 @@ def generate_complete_rightworks_wisp_pdf(wisp):
     # Footer will be automatically added to every page
     
     # Build the PDF with footer on every page
-    doc.build(story, onFirstPage=draw_footer, onLaterPages=draw_footer)
+    footer = footer_callback(shared_resources)
+    doc.build(story, onFirstPage=footer, onLaterPages=footer)
+    buffer.seek(0)
+    return buffer
+
+
+def generate_executive_summary_pdf(wisp, compress=True, shared_resources=False):
+    """Generate a short executive summary of a WISP for management review"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        topMargin=0.75*inch,
+        bottomMargin=1.0*inch,
+        leftMargin=0.75*inch,
+        rightMargin=0.75*inch,
+        pageCompression=1 if compress else 0
+    )
+
+    document = wisp.get_document()
+
+    def value(key, default='Not specified'):
+        """Escaped display value, using the select label for select fields"""
+        text = document.label(key, default=None)
+        return escape(str(text)) if text else default
+
+    def status(key, yes, no):
+        return yes if getattr(document, key) else no
+
+    company_name = value('company_name', 'the Company')
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'SummaryTitle',
+        parent=styles['Heading1'],
+        fontSize=22,
+        spaceAfter=10,
+        alignment=TA_CENTER,
+        textColor=colors.Color(0.133, 0.380, 0.682),
+        fontName='Helvetica-Bold'
+    )
+    subtitle_style = ParagraphStyle(
+        'SummarySubtitle',
+        parent=styles['Normal'],
+        fontSize=12,
+        spaceAfter=4,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+    section_title_style = ParagraphStyle(
+        'SectionTitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceBefore=16,
+        spaceAfter=8,
+        textColor=colors.Color(0.133, 0.380, 0.682),
+        fontName='Helvetica-Bold'
+    )
+    body_style = ParagraphStyle(
+        'BodyText',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceBefore=3,
+        spaceAfter=3,
+        alignment=TA_LEFT,
+        fontName='Helvetica'
+    )
+
+    story = []
+
+    # Header
+    story.append(Paragraph("WISP Executive Summary", title_style))
+    story.append(Paragraph(company_name, subtitle_style))
+    story.append(Paragraph(
+        f"Created: {wisp.created_at.strftime('%B %d, %Y')} | Last Updated: {wisp.updated_at.strftime('%B %d, %Y')}",
+        ParagraphStyle('SummaryDates', parent=body_style, alignment=TA_CENTER)
+    ))
+    story.append(Spacer(1, 10))
+
+    # Overview
+    story.append(Paragraph("Overview", section_title_style))
+    story.append(Paragraph(
+        f"This Written Information Security Plan (WISP) has been developed by {company_name} to comply with "
+        "IRS Publication 4557, the Gramm-Leach-Bliley Act (GLBA) and the FTC Safeguards Rule. This summary "
+        "highlights the safeguards currently in place and the items that still need attention.",
+        body_style
+    ))
+    address = escape(', '.join(document.address_lines)) or 'Not specified'
+    for label, text in [
+        ('Industry', value('industry')),
+        ('Company Size', value('company_size')),
+        ('Business Address', address),
+        ('Contact Email', value('contact_email')),
+        ('Qualified Individual', value('qualified_individual_name'))
+    ]:
+        story.append(Paragraph(f"<b>{label}:</b> {text}", body_style))
+
+    # FTC Safeguards Rule coverage
+    in_place = [description for description, citation, field, vendor_field in FTC_CHECKLIST if getattr(document, field)]
+    missing = [description for description, citation, field, vendor_field in FTC_CHECKLIST if not getattr(document, field)]
+    story.append(Paragraph("FTC Safeguards Rule Coverage", section_title_style))
+    story.append(Paragraph(
+        f"<b>{len(in_place)} of {len(FTC_CHECKLIST)}</b> required FTC software and policy controls are in place.",
+        body_style
+    ))
+    if missing:
+        story.append(Paragraph("<b>Controls not yet in place:</b>", body_style))
+        for description in missing:
+            story.append(Paragraph(f"• {description}", body_style))
+
+    # Administrative Safeguards
+    story.append(Paragraph("Administrative Safeguards", section_title_style))
+    for label, text in [
+        ('Role-Based Access Controls', status('access_control', 'Implemented', 'Not implemented')),
+        ('Background Checks', status('background_checks', 'Conducted for data access roles', 'Not conducted')),
+        ('Security Awareness Training', status('employee_training', 'Provided', 'Not provided')),
+        ('Training Frequency', value('training_frequency')),
+        ('Written Incident Response Plan', status('incident_response', 'Documented', 'Not documented'))
+    ]:
+        story.append(Paragraph(f"<b>{label}:</b> {text}", body_style))
+
+    # Technical Safeguards
+    story.append(Paragraph("Technical Safeguards", section_title_style))
+    for label, text in [
+        ('Multi-Factor Authentication', status('mfa_enabled', 'Enabled', 'Not enabled')),
+        ('Complex Passwords Required', status('complex_passwords_required', 'Yes', 'No')),
+        ('Encryption at Rest', status('encryption_at_rest', 'Implemented', 'Not implemented')),
+        ('Encryption in Transit', status('encryption_in_transit', 'Implemented', 'Not implemented')),
+        ('Firewall', value('firewall_solution')),
+        ('Antivirus', value('antivirus_solution')),
+        ('Backups', f"{value('backup_solution')} ({status('backup_encrypted', 'encrypted', 'not encrypted')})"),
+        ('Windows Patch Management', status('windows_patch_mgmt', 'In place', 'Not in place'))
+    ]:
+        story.append(Paragraph(f"<b>{label}:</b> {text}", body_style))
+
+    # Data Handling
+    story.append(Paragraph("Information Collected and Stored", section_title_style))
+    for label, text in [
+        ('Personal Information Types', value('personal_info_types')),
+        ('Data Retention Period', value('data_retention')),
+        ('Data Destruction Process', status('data_destruction', 'Documented', 'Not documented'))
+    ]:
+        story.append(Paragraph(f"<b>{label}:</b> {text}", body_style))
+
+    systems = [name for name, key in [
+        ('QuickBooks', 'quickbooks'),
+        ('ADP Payroll', 'adp'),
+        ('Workday', 'workday'),
+        ('Salesforce', 'salesforce'),
+        ('Microsoft 365', 'office365'),
+        ('Google Workspace', 'google_workspace')
+    ] if getattr(document, key)]
+    story.append(Paragraph(f"<b>Business Systems:</b> {', '.join(systems) if systems else 'None specified'}", body_style))
+    cell_style = ParagraphStyle('CellText', parent=body_style, fontSize=8, leading=10)
+    if document.systems:
+        story.append(Paragraph("<b>Other Systems/Software:</b>", body_style))
+        story.append(inventory_table('systems', document.systems, cell_style))
+    if document.pii_locations:
+        story.append(Paragraph("<b>PII Inventory:</b>", body_style))
+        pii_rows = [(document.category_label(row.category), row.name, row.notes) for row in document.pii_inventory]
+        story.append(inventory_table('pii_locations', pii_rows, cell_style))
+
+    # Vendors
+    story.append(Paragraph("Third-Party Vendors and Service Providers", section_title_style))
+    if document.vendors:
+        story.append(Paragraph("<b>Vendors with Data Access:</b>", body_style))
+        story.append(inventory_table('vendors', document.vendors, cell_style))
+    story.append(Paragraph(f"<b>Written Vendor Agreements:</b> {status('vendor_agreements', 'In place', 'Not in place')}", body_style))
+    story.append(Paragraph(f"<b>Vendor Compliance Monitoring:</b> {status('vendor_monitoring', 'Regularly monitored', 'Not monitored')}", body_style))
+
+    # Annual Review
+    story.append(Paragraph("Annual Review", section_title_style))
+    review_date = document.annual_review_date
+    story.append(Paragraph(
+        f"<b>Next Review Date:</b> {review_date.strftime('%B %d, %Y') if review_date else 'Not scheduled'}",
+        body_style
+    ))
+
+    footer = footer_callback(shared_resources)
+    doc.build(story, onFirstPage=footer, onLaterPages=footer)
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
@@ -0,0 +1,340 @@
+"""Build the site stylesheet from the templates.
+
+Replaces the Tailwind CDN runtime that used to compile styles in the browser.
+The templates are scanned for class names, CSS is generated only for the
+utility classes actually used (the same naming as Tailwind, so the markup is
+unchanged), and the result is appended to the hand-written base styles in
+static/src/base.css, minified and written to static/dist under a content
+hash. static/dist/manifest.json maps the logical name to the current file.
+
+Run `flask --app app build-css` after changing classes in a template.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_CSS = os.path.join(ROOT, 'static', 'src', 'base.css')
+DIST_DIR = os.path.join(ROOT, 'static', 'dist')
+MANIFEST = os.path.join(DIST_DIR, 'manifest.json')
+CONTENT = ['templates/**/*.html']
+
+PALETTE_SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900')
+PALETTE = {
+    'gray': ('#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827'),
+    'red': ('#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d'),
+    'amber': ('#fffbeb', '#fef3c7', '#fde68a', '#fcd34d', '#fbbf24', '#f59e0b', '#d97706', '#b45309', '#92400e', '#78350f'),
+    'yellow': ('#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12'),
+    'green': ('#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d'),
+    'blue': ('#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a'),
+    'indigo': ('#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81'),
+    'purple': ('#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87')
+}
+
+# Brand colors (formerly the inline tailwind.config in base.html)
+COLORS = {
+    'white': '#ffffff',
+    'black': '#000000',
+    'primary': '#2261AE',
+    'secondary': '#2A4159',
+    'accent': '#00B2A9',
+    'bg-main': '#F4F8FA',
+    'primary-50': '#EEF4FF',
+    'primary-100': '#DAE8FF',
+    'primary-500': '#2261AE',
+    'primary-600': '#1E57A0',
+    'primary-700': '#1A4D92',
+    'accent-50': '#E6F9F8',
+    'accent-100': '#CCF3F1',
+    'accent-500': '#00B2A9',
+    'accent-600': '#009E96'
+}
+for _name, _values in PALETTE.items():
+    COLORS.update((f'{_name}-{shade}', value) for shade, value in zip(PALETTE_SHADES, _values))
+
+FONT_FAMILIES = {
+    'sans': "ui-sans-serif,system-ui,-apple-system,'Segoe UI',Roboto,'Helvetica Neue',Arial,sans-serif"
+}
+
+# size: (font-size, line-height)
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'),
+    'sm': ('0.875rem', '1.25rem'),
+    'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'),
+    'xl': ('1.25rem', '1.75rem'),
+    '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'),
+    '4xl': ('2.25rem', '2.5rem'),
+    '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1')
+}
+
+FONT_WEIGHTS = {'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700'}
+
+RADII = {'': '0.25rem', 'sm': '0.125rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem',
+         '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px', 'none': '0px'}
+
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'card': '0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06)',
+    'card-lg': '0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05)',
+    'none': '0 0 #0000'
+}
+
+MAX_WIDTHS = {'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+              '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem'}
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px'}
+PSEUDO_CLASSES = ('hover', 'focus')
+
+TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter',
+    'all': 'all',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform'
+}
+
+SIDES = {'': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'),
+         't': ('-top',), 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',)}
+
+CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+
+def spacing(value):
+    """Length for a spacing scale step: 4 -> 1rem, 0.5 -> 0.125rem"""
+    if value == '0':
+        return '0px'
+    if value == 'px':
+        return '1px'
+    if value == 'auto':
+        return 'auto'
+    try:
+        return f'{float(value) / 4:g}rem'
+    except ValueError:
+        return None
+
+def size(value):
+    """Length for w-* and h-*: the spacing scale plus fractions and keywords"""
+    if value == 'full':
+        return '100%'
+    if value == 'screen':
+        return '100vh'
+    if '/' in value:
+        numerator, _, denominator = value.partition('/')
+        if numerator.isdigit() and denominator.isdigit():
+            return f'{int(numerator) / int(denominator) * 100:.6f}'.rstrip('0').rstrip('.') + '%'
+        return None
+    return spacing(value)
+
+def color(value):
+    """CSS color for a theme color name, with an optional /opacity modifier"""
+    name, _, opacity = value.partition('/')
+    if name == 'transparent' and not opacity:
+        return 'transparent'
+    if name == 'current' and not opacity:
+        return 'currentColor'
+    hex_value = COLORS.get(name)
+    if hex_value is None or (opacity and not opacity.isdigit()):
+        return None
+    if not opacity:
+        return hex_value
+    return f'rgb({_rgb(hex_value)} / {int(opacity) / 100:g})'
+
+def _rgb(hex_value):
+    return ' '.join(str(int(hex_value[i:i + 2], 16)) for i in (1, 3, 5))
+
+def _box(prop, sides, value, negative=False):
+    if value is None:
+        return None
+    if negative:
+        value = f'-{value}'
+    return [(f'{prop}{side}', value) for side in SIDES[sides]]
+
+def _gradient_from(value):
+    css = color(value)
+    if css is None or not css.startswith(('#', 'rgb(')):
+        return None
+    rgb = _rgb(css) if css.startswith('#') else css[4:css.index('/')].strip()
+    return [('--tw-gradient-from', css), ('--tw-gradient-to', f'rgb({rgb} / 0)'),
+            ('--tw-gradient-stops', 'var(--tw-gradient-from), var(--tw-gradient-to)')]
+
+def _font_size(value):
+    font_size, line_height = FONT_SIZES[value]
+    return [('font-size', font_size), ('line-height', line_height)]
+
+def _transition(value):
+    return [('transition-property', TRANSITIONS[value]),
+            ('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'),
+            ('transition-duration', '150ms')]
+
+def _keys(mapping):
+    return '|'.join(re.escape(key) for key in sorted(mapping, key=len, reverse=True) if key)
+
+# (pattern, builder) in output order; later rules win over earlier ones, as in
+# Tailwind (e.g. pt-4 overrides p-6, border-b-2 overrides border). A builder
+# returns a list of (property, value) or (selector suffix, declarations).
+UTILITIES = [
+    (r'(static|fixed|absolute|relative|sticky)', lambda v: [('position', v)]),
+    (r'z-(\d+)', lambda v: [('z-index', v)]),
+    (r'col-span-(\d+)', lambda v: [('grid-column', f'span {v} / span {v}')]),
+    (r'(-?)m()-(.+)', lambda n, s, v: _box('margin', s, spacing(v), n)),
+    (r'(-?)m([xy])-(.+)', lambda n, s, v: _box('margin', s, spacing(v), n)),
+    (r'(-?)m([trbl])-(.+)', lambda n, s, v: _box('margin', s, spacing(v), n)),
+    (r'(block|inline-block|inline|flex|inline-flex|grid|table|hidden)',
+     lambda v: [('display', 'none' if v == 'hidden' else v)]),
+    (r'h-(.+)', lambda v: _box('height', '', size(v))),
+    (r'w-(.+)', lambda v: _box('width', '', size(v))),
+    (rf'max-w-({_keys(MAX_WIDTHS)})', lambda v: [('max-width', MAX_WIDTHS[v])]),
+    (r'flex-(1|auto|none)', lambda v: [('flex', {'1': '1 1 0%', 'auto': '1 1 auto', 'none': 'none'}[v])]),
+    (r'flex-shrink-0|shrink-0', lambda: [('flex-shrink', '0')]),
+    (r'cursor-(pointer|help|default|not-allowed)', lambda v: [('cursor', v)]),
+    (r'list-(inside|outside)', lambda v: [('list-style-position', v)]),
+    (r'list-(disc|decimal|none)', lambda v: [('list-style-type', v)]),
+    (r'grid-cols-(\d+)', lambda v: [('grid-template-columns', f'repeat({v}, minmax(0, 1fr))')]),
+    (r'flex-(row|col)', lambda v: [('flex-direction', 'column' if v == 'col' else 'row')]),
+    (r'flex-(wrap|nowrap)', lambda v: [('flex-wrap', v)]),
+    (r'items-(start|end|center|baseline|stretch)',
+     lambda v: [('align-items', {'start': 'flex-start', 'end': 'flex-end'}.get(v, v))]),
+    (r'justify-(start|end|center|between|around)',
+     lambda v: [('justify-content', {'start': 'flex-start', 'end': 'flex-end', 'between': 'space-between',
+                                      'around': 'space-around'}.get(v, v))]),
+    (r'gap-(.+)', lambda v: _box('gap', '', spacing(v))),
+    (r'space-x-(.+)', lambda v: spacing(v) and (CHILDREN, [('margin-left', spacing(v))])),
+    (r'space-y-(.+)', lambda v: spacing(v) and (CHILDREN, [('margin-top', spacing(v))])),
+    (r'divide-y', lambda: (CHILDREN, [('border-top-width', '1px'), ('border-bottom-width', '0')])),
+    (r'divide-(.+)', lambda v: color(v) and (CHILDREN, [('border-color', color(v))])),
+    (r'overflow-(hidden|auto|visible|scroll)', lambda v: [('overflow', v)]),
+    (r'overflow-(x|y)-(hidden|auto|visible|scroll)', lambda axis, v: [(f'overflow-{axis}', v)]),
+    (r'whitespace-(normal|nowrap|pre|pre-line|pre-wrap)', lambda v: [('white-space', v)]),
+    (rf'rounded(?:-({_keys(RADII)}))?', lambda v: [('border-radius', RADII[v or ''])]),
+    (r'border()(?:-(\d+))?', lambda s, v: _box('border', s, f"{v or 1}px")),
+    (r'border-([xy])(?:-(\d+))?', lambda s, v: [(f'border{side}-width', f"{v or 1}px") for side in SIDES[s]]),
+    (r'border-([trbl])(?:-(\d+))?', lambda s, v: [(f'border{side}-width', f"{v or 1}px") for side in SIDES[s]]),
+    (r'border-(.+)', lambda v: color(v) and [('border-color', color(v))]),
+    (r'bg-(.+)', lambda v: color(v) and [('background-color', color(v))]),
+    (r'bg-gradient-to-(t|tr|r|br|b|bl|l|tl)',
+     lambda v: [('background-image', 'linear-gradient(to {}, var(--tw-gradient-stops))'.format(
+         ' '.join({'t': 'top', 'r': 'right', 'b': 'bottom', 'l': 'left'}[c] for c in v)))]),
+    (r'from-(.+)', _gradient_from),
+    (r'to-(.+)', lambda v: color(v) and [('--tw-gradient-to', color(v))]),
+    (r'p()-(.+)', lambda s, v: _box('padding', s, spacing(v))),
+    (r'p([xy])-(.+)', lambda s, v: _box('padding', s, spacing(v))),
+    (r'p([trbl])-(.+)', lambda s, v: _box('padding', s, spacing(v))),
+    (r'text-(left|center|right|justify)', lambda v: [('text-align', v)]),
+    (rf'font-({_keys(FONT_FAMILIES)})', lambda v: [('font-family', FONT_FAMILIES[v])]),
+    (rf'text-({_keys(FONT_SIZES)})', _font_size),
+    (rf'font-({_keys(FONT_WEIGHTS)})', lambda v: [('font-weight', FONT_WEIGHTS[v])]),
+    (r'text-(.+)', lambda v: color(v) and [('color', color(v))]),
+    (r'underline', lambda: [('text-decoration-line', 'underline')]),
+    (rf'shadow(?:-({_keys(SHADOWS)}))?', lambda v: [('box-shadow', SHADOWS[v or ''])]),
+    (r'ring(?:-(\d+))?', lambda v: [('box-shadow', f"0 0 0 {v or 3}px var(--tw-ring-color, rgb(59 130 246 / 0.5))")]),
+    (r'ring-(.+)', lambda v: color(v) and [('--tw-ring-color', color(v))]),
+    (r'transition(?:-(all|colors|opacity|shadow|transform))?', lambda v: _transition(v or '')),
+    (r'duration-(\d+)', lambda v: [('transition-duration', f'{v}ms')])
+]
+UTILITIES = [(re.compile(pattern), build) for pattern, build in UTILITIES]
+
+def resolve(utility):
+    """(rank, selector suffix, declarations) for a utility without variants, or None"""
+    for rank, (pattern, build) in enumerate(UTILITIES):
+        match = pattern.fullmatch(utility)
+        if not match:
+            continue
+        result = build(*match.groups())
+        if not result:
+            continue
+        if isinstance(result, tuple):
+            return rank, result[0], result[1]
+        return rank, '', result
+    return None
+
+def escape_class(name):
+    return re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', name)
+
+def build_rule(class_name):
+    """(sort key, breakpoint, CSS rule) for a class name such as md:hover:bg-primary/10, or None"""
+    *variants, utility = class_name.split(':')
+    screens = [v for v in variants if v in SCREENS]
+    pseudo = [v for v in variants if v in PSEUDO_CLASSES]
+    if len(screens) + len(pseudo) != len(variants) or len(screens) > 1:
+        return None
+    resolved = resolve(utility)
+    if resolved is None:
+        return None
+    rank, suffix, declarations = resolved
+    selector = '.' + escape_class(class_name) + ''.join(f':{p}' for p in pseudo) + suffix
+    rule = selector + ' { ' + '; '.join(f'{prop}: {value}' for prop, value in declarations) + ' }'
+    screen = screens[0] if screens else None
+    pseudo_rank = max((PSEUDO_CLASSES.index(p) + 1 for p in pseudo), default=0)
+    return (list(SCREENS).index(screen) + 1 if screen else 0, pseudo_rank, rank, class_name), screen, rule
+
+def scan_candidates(patterns=CONTENT, root=ROOT):
+    """Every token in the content files that could be a class name.
+
+    Like Tailwind, this over-matches (Jinja expressions, text) and relies on
+    build_rule ignoring anything that is not a utility. Class names must
+    appear whole in the templates, not be assembled from pieces.
+    """
+    candidates = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern), recursive=True):
+            with open(path, encoding='utf-8') as f:
+                candidates.update(re.findall(r"[^\s<>\"'`{}%=(),]+", f.read()))
+    return candidates
+
+def generate_utilities(candidates):
+    """CSS for the used utilities, in override order, one media query per breakpoint"""
+    blocks = {}
+    for _, screen, rule in sorted(filter(None, map(build_rule, candidates))):
+        blocks.setdefault(screen, []).append(rule)
+    css = blocks.pop(None, [])
+    for screen, rules in blocks.items():
+        css.append(f'@media (min-width: {SCREENS[screen]}) {{\n' + '\n'.join(rules) + '\n}')
+    return '\n'.join(css)
+
+def minify(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r' ?([{}:;,>~]) ?', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+def build_css(output_dir=DIST_DIR, name='app.css'):
+    """Write the minified, fingerprinted stylesheet and update the manifest.
+
+    Returns the path of the new file relative to static/. Older builds of the
+    same stylesheet are removed.
+    """
+    with open(SOURCE_CSS, encoding='utf-8') as f:
+        css = minify(f.read() + '\n' + generate_utilities(scan_candidates()))
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    stem, ext = os.path.splitext(name)
+    filename = f'{stem}.{digest}{ext}'
+
+    os.makedirs(output_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(output_dir, f'{stem}.*{ext}')):
+        if os.path.basename(old) != filename:
+            os.remove(old)
+    with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+        f.write(css)
+
+    manifest = load_manifest()
+    manifest[name] = f'dist/{filename}'
+    with open(MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return manifest[name]
+
+def load_manifest():
+    """{logical name: path under static/} for the built assets, or {} before the first build"""
+    try:
+        with open(MANIFEST, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
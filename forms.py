@@ -0,0 +1,344 @@
+from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileRequired, FileAllowed
+from wtforms import Form, StringField, TextAreaField, SelectField, BooleanField, IntegerField, FieldList, FormField
+from wtforms.fields import DateField
+from wtforms.fields.core import UnboundField
+from wtforms.validators import DataRequired, Email, Optional
+from functools import lru_cache
+import itertools
+from inventory import PII_CATEGORIES, MAX_ROWS
+
+class InventoryField(FieldList):
+    """Repeatable inventory rows (see inventory.py); rows without a name are blank,
+    so they are neither validated nor included in data"""
+
+    @staticmethod
+    def _is_filled(entry):
+        return bool((entry.form.name.data or '').strip())
+
+    def validate(self, form, extra_validators=()):
+        self.errors = []
+        for row_number, entry in enumerate(self.entries, 1):
+            if self._is_filled(entry) and not entry.validate(form):
+                # Flat messages, so they read like any other field's errors
+                self.errors.extend(f'Row {row_number} {column}: {message}'
+                                   for column, messages in entry.errors.items() for message in messages)
+        self._run_validation_chain(form, itertools.chain(self.validators, extra_validators))
+        return len(self.errors) == 0
+
+    @property
+    def data(self):
+        return [{column: (value or '').strip() for column, value in entry.data.items()}
+                for entry in self.entries if self._is_filled(entry)]
+
+# Suggest names from the shared vendor directory (/api/vendors) as the user types
+VENDOR_AUTOCOMPLETE = {'data-autocomplete': 'vendors', 'autocomplete': 'off'}
+
+# Inventory row forms; rows are plain Forms since the page's CSRF token covers them
+class PIILocationEntryForm(Form):
+    category = SelectField('Type', choices=PII_CATEGORIES)
+    name = StringField('Name')
+    notes = StringField('PII held / notes')
+
+class SystemEntryForm(Form):
+    name = StringField('System / Software')
+    purpose = StringField('Used for / data handled')
+
+class VendorEntryForm(Form):
+    name = StringField('Vendor', render_kw=VENDOR_AUTOCOMPLETE)
+    services = StringField('Services / type of access')
+    data_access = StringField('Data they can access')
+
+# Form Classes for each step
+class CompanyInfoForm(FlaskForm):
+    # Basic Company Information
+    company_name = StringField('Company Name', validators=[DataRequired()])
+    street_address = StringField('Street Address', validators=[DataRequired()])
+    city = StringField('City', validators=[DataRequired()])
+    state = StringField('State', validators=[DataRequired()])
+    zip_code = StringField('ZIP Code', validators=[DataRequired()])
+    contact_email = StringField('Contact Email', validators=[DataRequired(), Email()])
+    phone_number = StringField('Phone Number')
+    website = StringField('Website')
+    
+    company_size = SelectField('Company Size', choices=[
+        ('', 'Select company size'),
+        ('1-10', '1-10 employees'),
+        ('11-50', '11-50 employees'),
+        ('51-200', '51-200 employees'),
+        ('201-1000', '201-1000 employees'),
+        ('1000+', '1000+ employees')
+    ], validators=[DataRequired()])
+    
+    industry = SelectField('Industry', choices=[
+        ('', 'Select industry'),
+        ('accounting', 'Accounting/CPA'),
+        ('legal', 'Legal Services'),
+        ('healthcare', 'Healthcare'),
+        ('financial', 'Financial Services'),
+        ('consulting', 'Consulting'),
+        ('technology', 'Technology'),
+        ('manufacturing', 'Manufacturing'),
+        ('retail', 'Retail'),
+        ('other', 'Other')
+    ], validators=[DataRequired()])
+    
+    # WISP preparation details
+    prepared_by = StringField('WISP Prepared By (Name)', validators=[DataRequired()],
+        description='Name of person preparing this WISP')
+    annual_review_date = DateField('Annual Review Date', validators=[DataRequired()],
+        description='Date for annual WISP review (typically one year from creation)')
+    
+    # EIN/EFIN Information
+    ein_number = StringField('Employer Identification Number (EIN)')
+    efin_number = StringField('Electronic Filing Identification Number (EFIN)',
+        description='Required for tax preparers who file electronically')
+
+class DataCollectionForm(FlaskForm):
+    # Basic PII Types (for scope section)
+    personal_info_types = SelectField('Types of Personal Information Collected', choices=[
+        ('basic', 'Basic contact information only'),
+        ('financial', 'Financial information (SSN, banking, etc.)'),
+        ('healthcare', 'Healthcare/medical information'),
+        ('employment', 'Employment records and payroll'),
+        ('comprehensive', 'Comprehensive personal data')
+    ], validators=[DataRequired()])
+    
+    data_sources = TextAreaField('Data Collection Sources', 
+        description='Describe how and where you collect personal information')
+    
+    data_retention = SelectField('Data Retention Period', choices=[
+        ('1year', '1 year'),
+        ('3years', '3 years'),
+        ('7years', '7 years'),
+        ('indefinite', 'Indefinite/As required by law')
+    ], validators=[DataRequired()])
+    
+    data_destruction = BooleanField('Do you have a process to destroy data when no longer needed?')
+    
+    # PII Inventory List (one row per app, provider or location holding PII)
+    pii_locations = InventoryField(FormField(PIILocationEntryForm), 'PII Inventory',
+        min_entries=2, max_entries=MAX_ROWS,
+        description='Every application, provider or storage location that contains PII')
+
+class SystemsForm(FlaskForm):
+    quickbooks = BooleanField('QuickBooks')
+    adp = BooleanField('ADP Payroll')
+    workday = BooleanField('Workday')
+    salesforce = BooleanField('Salesforce')
+    office365 = BooleanField('Microsoft 365')
+    google_workspace = BooleanField('Google Workspace')
+    systems = InventoryField(FormField(SystemEntryForm), 'Other Systems/Software',
+        min_entries=1, max_entries=MAX_ROWS,
+        description='List any other systems that handle sensitive data')
+
+class SecurityControlsForm(FlaskForm):
+    # FTC Checklist Items
+    qualified_individual_designated = BooleanField('Qualified individual designated')
+    qualified_individual_vendor = StringField('Qualified Individual Vendor/Date')
+    
+    risk_assessment_conducted = BooleanField('Risk assessment conducted')
+    risk_assessment_vendor = StringField('Risk Assessment Vendor/Date')
+    
+    encryption_at_rest = BooleanField('Encryption at rest')
+    encryption_at_rest_vendor = StringField('Encryption at Rest Vendor/Date')
+    
+    encryption_in_transit = BooleanField('Encryption in transit')
+    encryption_in_transit_vendor = StringField('Encryption in Transit Vendor/Date')
+    
+    mfa_enabled = BooleanField('Multi-Factor Authentication (MFA) enabled')
+    mfa_vendor = StringField('MFA Vendor/Date')
+    
+    continuous_monitoring = BooleanField('Continuous monitoring with IDS/RMM or network scan and penetration testing')
+    continuous_monitoring_vendor = StringField('Continuous Monitoring Vendor/Date')
+    
+    security_awareness_training = BooleanField('Security awareness training')
+    security_awareness_vendor = StringField('Security Awareness Training Vendor/Date')
+    
+    assess_providers = BooleanField('Assess providers')
+    assess_providers_vendor = StringField('Assess Providers Vendor/Date')
+    
+    annual_wisp_review = BooleanField('Annual WISP review')
+    annual_wisp_review_vendor = StringField('Annual WISP Review Vendor/Date')
+    
+    wisp_developed = BooleanField('Written Information Security Plan developed')
+    wisp_developed_vendor = StringField('WISP Development Vendor/Date')
+    
+    annual_director_reports = BooleanField('Annual director reports')
+    annual_director_reports_vendor = StringField('Annual Director Reports Vendor/Date')
+    
+    annual_disposal_records = BooleanField('Annual disposal of records')
+    annual_disposal_vendor = StringField('Annual Disposal Vendor/Date')
+    
+    restricted_access_data = BooleanField('Restricted access to data')
+    restricted_access_vendor = StringField('Restricted Access Vendor/Date')
+    
+    complex_passwords_required = BooleanField('Require complex passwords')
+    complex_passwords_vendor = StringField('Complex Passwords Vendor/Date')
+    
+    firewall_protection = BooleanField('Firewall')
+    firewall_vendor = StringField('Firewall Vendor/Date')
+    
+    ids_enabled = BooleanField('Intrusion detection systems (IDS)')
+    ids_vendor = StringField('IDS Vendor/Date')
+    
+    segmented_network = BooleanField('Segmented / IOT / Guest network')
+    segmented_network_vendor = StringField('Segmented Network Vendor/Date')
+    
+    endpoint_security = BooleanField('Endpoint security')
+    endpoint_security_vendor = StringField('Endpoint Security Vendor/Date')
+    
+    third_party_patch_mgmt = BooleanField('Third-party patch management')
+    third_party_patch_vendor = StringField('Third-party Patch Management Vendor/Date')
+    
+    windows_patch_mgmt = BooleanField('Windows patch management')
+    windows_patch_vendor = StringField('Windows Patch Management Vendor/Date')
+    
+    # IRS Security Six
+    antivirus_solution = StringField('Antivirus solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    endpoint_detection_solution = StringField('Endpoint detection and response solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    intrusion_detection_solution = StringField('Intrusion detection systems solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    backup_solution = StringField('Backup solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    backup_encrypted = BooleanField('Is backup encrypted?')
+    firewall_solution = StringField('Firewall solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    encryption_solution = StringField('Drive encryption solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    mfa_solution = StringField('Multifactor authentication solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    vpn_solution = StringField('VPN solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+    
+    # Password Policy Details
+    password_min_length = SelectField('Minimum Password Length', choices=[
+        ('8', '8 characters'),
+        ('10', '10 characters'),
+        ('12', '12 characters'),
+        ('16', '16 characters')
+    ], default='8')
+    password_complexity = BooleanField('Password complexity requirements enabled')
+    password_history_enabled = BooleanField('Password history enforced (24 max remembered)')
+    password_manager_required = BooleanField('Password manager required for all accounts')
+    default_passwords_changed = BooleanField('Default/temporary passwords changed')
+    password_secure_storage = BooleanField('Passwords stored in secure location')
+    password_manager_mfa = BooleanField('MFA enabled for password manager')
+    
+    # Wireless Security
+    wireless_wpa2_enabled = BooleanField('WPA2/WPA3 encryption enabled')
+    wireless_ssid_hidden = BooleanField('Wireless SSID hidden from public view')
+    wireless_guest_network = BooleanField('Separate guest wireless network available')
+    wireless_admin_password_changed = BooleanField('Default router admin passwords changed')
+    wireless_tx_power_reduced = BooleanField('WLAN transmit power reduced to office area only')
+    wireless_wep_disabled = BooleanField('WEP encryption disabled (not used)')
+    
+    # Additional Security Controls
+    rmm_solution = StringField('Remote Monitoring and Management (RMM) solution', render_kw=VENDOR_AUTOCOMPLETE)
+    browser_patch_mgmt = BooleanField('Patch management on browsers')
+    stored_passwords_disabled = BooleanField('Stored password feature disabled')
+    incident_response_printed = BooleanField('Incident response plan printed and readily available')
+    security_training_method = StringField('Security awareness training method')
+    unnecessary_software_blocked = BooleanField('Installing unnecessary software disallowed')
+    device_inventory_performed = BooleanField('Inventory of devices containing client data performed')
+    client_data_access_limited = BooleanField('Access to stored client data limited/disabled')
+    client_data_protection_solution = StringField('Client data protection solution name/provider', render_kw=VENDOR_AUTOCOMPLETE)
+
+class VendorsForm(FlaskForm):
+    vendors = InventoryField(FormField(VendorEntryForm), 'Third-Party Vendors with Data Access',
+        min_entries=2, max_entries=MAX_ROWS,
+        description='List all vendors, contractors, or service providers who have access to sensitive data')
+    vendor_agreements = BooleanField('Do you have written agreements with all vendors regarding data protection?')
+    vendor_monitoring = BooleanField('Do you regularly monitor vendor compliance?')
+
+class EmployeeAccessForm(FlaskForm):
+    # Basic Employee Access Controls
+    access_control = BooleanField('Do you have role-based access controls?')
+    employee_training = BooleanField('Do you provide regular security awareness training?')
+    training_frequency = SelectField('Training Frequency', choices=[
+        ('', 'Select frequency'),
+        ('quarterly', 'Quarterly'),
+        ('biannual', 'Twice per year'),
+        ('annual', 'Annual'),
+        ('onboarding', 'New employee onboarding only')
+    ])
+    security_awareness_method = StringField('Security Awareness Training Method', 
+        description='How do you conduct security awareness training?')
+    incident_response = BooleanField('Do you have a written incident response plan?')
+    background_checks = BooleanField('Do you conduct background checks for employees with data access?')
+    
+    # Employee Management
+    confidentiality_agreements = BooleanField('All employees sign confidentiality agreements')
+    employee_access_review = BooleanField('Regular review of employee access rights')
+    employee_termination_process = BooleanField('Formal process for revoking access when employees leave')
+    remote_work_policy = BooleanField('Written remote work security policy')
+    
+    # Qualified Individual Information
+    qualified_individual_name = StringField('Qualified Individual Name', validators=[DataRequired()],
+        description='Person responsible for implementing and supervising the information security program')
+    qualified_individual_qualifications = TextAreaField('Qualifications/Experience',
+        description='Describe their cybersecurity qualifications and experience')
+    qualified_individual_supervisor = StringField('Supervisor',
+        description='Who does the Qualified Individual report to?')
+    
+    # Incident Response Team
+    incident_coordinator_name = StringField('Incident Coordinator Name',
+        description='Primary person responsible for coordinating incident response')
+    incident_coordinator_phone = StringField('Incident Coordinator Phone')
+    incident_team_member_1 = StringField('Incident Team Member #1')
+    incident_team_member_1_phone = StringField('Team Member #1 Phone')
+    incident_team_member_2 = StringField('Incident Team Member #2')
+    incident_team_member_2_phone = StringField('Team Member #2 Phone')
+    
+    # Incident Response Contacts
+    tech_company = StringField('IT Support Company Name',
+        description='Primary technology support company')
+    tech_company_phone = StringField('IT Support Phone Number')
+    legal_counsel_name = StringField('Legal Counsel Name')
+    legal_counsel_phone = StringField('Legal Counsel Phone')
+    insurance_broker = StringField('Insurance Broker/Company')
+    insurance_policy = StringField('Insurance Policy Information')
+    
+    # Testing and Monitoring
+    annual_penetration_test = BooleanField('Annual penetration testing conducted')
+    vulnerability_assessments = BooleanField('Regular vulnerability assessments')
+    system_scans = BooleanField('System-wide security scans every six months')
+    security_awareness_testing = BooleanField('Phishing simulation testing for employees')
+    
+    # EFIN Monitoring (for tax preparers)
+    efin_monitoring_process = BooleanField('EFIN monitoring process implemented')
+    efin_status_check_frequency = SelectField('EFIN Status Check Frequency', choices=[
+        ('', 'Not applicable'),
+        ('weekly', 'Weekly'),
+        ('biweekly', 'Bi-weekly'),
+        ('monthly', 'Monthly')
+    ])
+
+# Wizard steps in order; step N uses WIZARD_FORMS[N - 1]
+WIZARD_FORMS = [
+    CompanyInfoForm,
+    DataCollectionForm,
+    SystemsForm,
+    SecurityControlsForm,
+    VendorsForm,
+    EmployeeAccessForm
+]
+
+def iter_wizard_fields():
+    """Yield (name, field_class) for every wizard field in step and definition order"""
+    for form_class in WIZARD_FORMS:
+        # Same ordering WTForms uses when binding fields to a form instance
+        unbound = [(name, attr) for name, attr in vars(form_class).items() if isinstance(attr, UnboundField)]
+        unbound.sort(key=lambda item: (item[1].creation_counter, item[0]))
+        for name, field in unbound:
+            yield name, field.field_class
+
+@lru_cache(maxsize=None)
+def wizard_choice_labels():
+    """Map each select field name to its {value: label} choices"""
+    labels = {}
+    for form_class in WIZARD_FORMS:
+        for name, attr in vars(form_class).items():
+            if isinstance(attr, UnboundField) and attr.field_class is SelectField:
+                labels[name] = dict(attr.kwargs.get('choices', []))
+    return labels
+
+class ImportForm(FlaskForm):
+    import_file = FileField('WISP Data File', validators=[
+        FileRequired(),
+        FileAllowed(['csv', 'jsonl', 'ndjson', 'json', 'gz'], 'Upload a CSV or JSON Lines file')
+    ], description='CSV with a header row, or JSON Lines with one object per line, using wizard field names')
@@ -0,0 +1,92 @@
+"""In-process cache of rendered HTML fragments.
+
+The WISP document on the view page and each dashboard card are rendered once
+per WISP revision and reused until the WISP is saved again. Keys include the
+WISP id and updated_at, so an edit makes the old entry unreachable and it ages
+out of the LRU instead of needing explicit invalidation.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from markupsafe import Markup
+
+class FragmentCache:
+    """Least recently used cache of rendered fragments, bounded by total size in bytes.
+
+    A max_bytes of 0 disables caching; every lookup then renders.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached fragment for key, or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store a fragment, evicting the least recently used ones to stay under max_bytes"""
+        value = Markup(value)
+        cost = len(value.encode('utf-8'))
+        if cost > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.encode('utf-8'))
+            self._entries[key] = value
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.encode('utf-8'))
+                self.evictions += 1
+        return value
+
+    def get_or_render(self, key, render):
+        """Cached fragment for key, calling render() to produce it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = self.set(key, render())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+def templates_digest(template_folder, names, extra=''):
+    """Short digest of the named templates' sources.
+
+    Used in cache keys and ETags so a deploy that changes the markup does not
+    serve fragments (or 304s) rendered by the old templates. extra is mixed in
+    for other inputs of the pages, such as the asset manifest.
+    """
+    digest = hashlib.sha1(extra.encode('utf-8'))
+    for name in names:
+        with open(os.path.join(template_folder, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
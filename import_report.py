@@ -0,0 +1,66 @@
+"""Report what app startup spends its time importing, using ``python -X importtime``.
+
+Run directly (``python import_report.py``) or through ``flask --app app import-report``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+def measure_imports(module='app', preload=False):
+    """Import module in a fresh interpreter and return a list of
+    (name, depth, self_us, cumulative_us) in import order."""
+    env = dict(os.environ)
+    env['WISP_PRELOAD'] = '1' if preload else '0'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'Importing {module} failed:\n{result.stderr}')
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_part, cumulative_part, name_part = line[len('import time:'):].split('|')
+        name = name_part.strip()
+        depth = (len(name_part) - len(name_part.lstrip()) - 1) // 2
+        rows.append((name, depth, int(self_part), int(cumulative_part)))
+    return rows
+
+def format_report(rows, module='app', top=15):
+    """Summarize the total import time and the slowest direct imports of module"""
+    # importtime lists children before their parent, so collect each top-level
+    # import's direct children until the parent's own line appears
+    total = 0
+    direct = []
+    children = []
+    for name, depth, self_us, cumulative in rows:
+        if depth == 1:
+            children.append((name, cumulative))
+        elif depth == 0:
+            if name == module:
+                total = cumulative
+                direct = children
+            children = []
+    direct.sort(key=lambda item: item[1], reverse=True)
+
+    lines = [f'Total import time for {module}: {total / 1000:.1f} ms', '']
+    lines.append(f"{'Module':<40} {'Cumulative':>12} {'Share':>7}")
+    for name, cumulative in direct[:top]:
+        share = 100.0 * cumulative / total if total else 0
+        lines.append(f'{name:<40} {cumulative / 1000:>9.1f} ms {share:>6.1f}%')
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--preload', action='store_true', help='Measure with WISP_PRELOAD=1')
+    args = parser.parse_args()
+    print(format_report(measure_imports(args.module, preload=args.preload), module=args.module, top=args.top))
+
+if __name__ == '__main__':
+    main()
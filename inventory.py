@@ -0,0 +1,93 @@
+"""Repeatable inventory lists: where PII is kept, business systems and vendors.
+
+Each list is stored in the WISP answers as an array of row objects, e.g.
+"vendors": [{"name": "ABC IT", "services": "Remote support", "data_access": "All systems"}].
+Answers saved before the lists existed used fixed *_1/*_2 fields and free-text
+areas; upgrade_legacy_inventories converts those when they are read.
+"""
+import json
+
+# PII location types, in the order the PDF lists them
+PII_CATEGORIES = [
+    ('third_party_apps', 'Third-party app'),
+    ('cloud_providers', 'Cloud provider'),
+    ('data_storage', 'Data storage'),
+    ('email_providers', 'Email provider'),
+    ('crm_systems', 'CRM'),
+    ('social_media_contractors', 'Social media contractor'),
+    ('other', 'Other')
+]
+PII_CATEGORY_LABELS = dict(PII_CATEGORIES)
+
+# Inventory field -> (title, [(column, header, width in inches)]). Every row has
+# a 'name' column; rows without a name are blank and dropped.
+INVENTORIES = {
+    'pii_locations': ('PII inventory list', [
+        ('category', 'Type', 1.5),
+        ('name', 'Name', 2.3),
+        ('notes', 'PII held / notes', 2.6)
+    ]),
+    'systems': ('Other systems and software', [
+        ('name', 'System / software', 2.4),
+        ('purpose', 'Used for / data handled', 4.0)
+    ]),
+    'vendors': ('Third-party vendors with data access', [
+        ('name', 'Vendor', 1.8),
+        ('services', 'Services / type of access', 2.3),
+        ('data_access', 'Data they can access', 2.3)
+    ])
+}
+
+# Rows accepted per list from the wizard or an import
+MAX_ROWS = 2000
+
+def parse_inventory(value):
+    """Rows of an inventory list from an array, or from JSON text (a CSV cell)"""
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValueError('Inventory lists must be a JSON array of objects')
+    if not isinstance(value, list) or not all(isinstance(row, dict) for row in value):
+        raise ValueError('Inventory lists must be a JSON array of objects')
+    if len(value) > MAX_ROWS:
+        raise ValueError(f'Inventory lists are limited to {MAX_ROWS} rows')
+    return value
+
+def _split_lines(text):
+    """(name, description) pairs from a free-text list, one entry per line.
+
+    Leading bullets are dropped and 'Name: description' is split at the first colon.
+    """
+    for line in (text or '').splitlines():
+        line = line.strip().lstrip('-*•').strip()
+        if line:
+            name, _, description = line.partition(':')
+            yield name.strip(), description.strip()
+
+def upgrade_legacy_inventories(data):
+    """Answers with the inventory lists filled in from legacy fields where missing"""
+    if all(field in data for field in INVENTORIES):
+        return data
+    data = dict(data)
+    if 'pii_locations' not in data:
+        data['pii_locations'] = [
+            {'category': category, 'name': data[f'{category}_{i}'], 'notes': ''}
+            for category, label in PII_CATEGORIES
+            for i in (1, 2)
+            if data.get(f'{category}_{i}')
+        ]
+    if 'systems' not in data:
+        data['systems'] = [{'name': name, 'purpose': purpose}
+                           for name, purpose in _split_lines(data.get('custom_software'))]
+    if 'vendors' not in data:
+        data['vendors'] = [{'name': name, 'services': services, 'data_access': ''}
+                           for name, services in _split_lines(data.get('vendor_list'))]
+    return data
+
+def ordered_pii_locations(rows):
+    """PII location rows grouped by category in PII_CATEGORIES order, keeping entry order within each"""
+    order = {category: i for i, (category, label) in enumerate(PII_CATEGORIES)}
+    return sorted(rows, key=lambda row: order.get(row.category, len(order)))
@@ -0,0 +1,157 @@
+"""Opt-in memory instrumentation for tracking down RSS growth (MEMORY_PROFILE=1).
+
+tracemalloc traces every Python allocation and slows the process down, so it
+only runs when enabled. While tracing, each request records what it left
+allocated when it finished and each PDF render records its peak, so growth can
+be pinned on an endpoint or on rendering. report() compares a snapshot with a
+baseline taken after the first request and lists the allocation sites that
+grew the most.
+
+Per-request and per-render figures are exact when the process serves one
+request at a time; concurrent requests in other threads allocate into the
+same counters.
+"""
+import os
+import threading
+import tracemalloc
+
+MB = 1024 * 1024
+TRACE_FRAMES = 10
+MAX_ENDPOINTS = 50
+
+# Allocations made by the instrumentation itself or by the import system
+IGNORED_FILES = [tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>', '<unknown>']
+
+class RenderMemoryExceeded(Exception):
+    """Raised when a render's traced peak is over the memory budget"""
+
+    def __init__(self, peak, limit):
+        super().__init__(f'PDF render peaked at {peak / MB:.1f} MB, over the {limit / MB:.1f} MB budget')
+        self.peak = peak
+        self.limit = limit
+
+    def __reduce__(self):
+        # Rebuilt from (peak, limit) when raised in a render worker process
+        return type(self), (self.peak, self.limit)
+
+def start(frames=TRACE_FRAMES):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+def is_enabled():
+    return tracemalloc.is_tracing()
+
+def rss_bytes():
+    """Resident set size of this process (Linux), or its peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def measure_render(render, limit=0):
+    """Run render() and return (its result, traced peak in bytes above the
+    size at the start, or None when not tracing). Raises RenderMemoryExceeded
+    when the peak is over limit bytes."""
+    if not tracemalloc.is_tracing():
+        return render(), None
+    start_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = render()
+    peak = tracemalloc.get_traced_memory()[1] - start_size
+    if limit and peak > limit:
+        raise RenderMemoryExceeded(peak, limit)
+    return result, peak
+
+class MemoryProfiler:
+    """Per-endpoint retained memory, render peaks and the baseline snapshot of one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._renders = {'count': 0, 'peak_total': 0, 'peak_max': 0, 'over_budget': 0}
+        self._baseline = None
+
+    def request_started(self):
+        """Traced size at the start of a request"""
+        return tracemalloc.get_traced_memory()[0]
+
+    def request_finished(self, endpoint, started):
+        retained = tracemalloc.get_traced_memory()[0] - started
+        with self._lock:
+            stats = self._requests.get(endpoint)
+            if stats is None:
+                if len(self._requests) >= MAX_ENDPOINTS:
+                    return
+                stats = self._requests[endpoint] = {'count': 0, 'retained_total': 0, 'retained_max': 0}
+            stats['count'] += 1
+            stats['retained_total'] += retained
+            stats['retained_max'] = max(stats['retained_max'], retained)
+        if self._baseline is None:
+            self.reset_baseline()
+
+    def record_render(self, peak, over_budget=False):
+        if peak is None:
+            return
+        with self._lock:
+            self._renders['count'] += 1
+            self._renders['peak_total'] += peak
+            self._renders['peak_max'] = max(self._renders['peak_max'], peak)
+            self._renders['over_budget'] += over_budget
+
+    def reset_baseline(self):
+        """Take the snapshot later growth is measured against"""
+        self._baseline = snapshot()
+
+    def top_growth(self, limit=15):
+        """Allocation sites that grew the most since the baseline snapshot"""
+        if self._baseline is None:
+            return []
+        return [
+            {
+                'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff,
+                'size': stat.size
+            }
+            for stat in snapshot().compare_to(self._baseline, 'lineno')[:limit]
+        ]
+
+    def report(self, limit=15):
+        """Process memory, per-endpoint and render figures and the top growth sites"""
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            requests = sorted(self._requests.items(), key=lambda item: item[1]['retained_total'], reverse=True)
+            renders = dict(self._renders)
+        return {
+            'enabled': is_enabled(),
+            'pid': os.getpid(),
+            'rss_bytes': rss_bytes(),
+            'traced_bytes': current,
+            'traced_peak_bytes': peak,
+            'requests': [
+                {
+                    'endpoint': endpoint,
+                    'count': stats['count'],
+                    'retained_avg': stats['retained_total'] // stats['count'],
+                    'retained_max': stats['retained_max']
+                }
+                for endpoint, stats in requests[:limit]
+            ],
+            'renders': {
+                'count': renders['count'],
+                'peak_avg': renders['peak_total'] // renders['count'] if renders['count'] else 0,
+                'peak_max': renders['peak_max'],
+                'over_budget': renders['over_budget']
+            },
+            'top_growth': self.top_growth(limit) if is_enabled() else []
+        }
+
+def snapshot():
+    """tracemalloc snapshot without the instrumentation's own allocations"""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES]
+    )
+
+profiler = MemoryProfiler()
@@ -0,0 +1,369 @@
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text, select, update, bindparam, func, exists, MetaData
+from sqlalchemy import exc
+from sqlalchemy.orm import aliased
+from sqlalchemy.schema import CreateIndex, CreateTable
+from datetime import datetime, date
+import hashlib
+from werkzeug.http import parse_date
+import json
+import time
+import warnings
+from checklists import CONTROL_FIELDS
+from wisp_storage import encode_data, decode_data
+
+db = SQLAlchemy()
+
+def parse_review_date(value):
+    """Parse an annual review date as stored by the wizard (HTTP date) or as ISO"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    parsed = parse_date(value)
+    if parsed:
+        return parsed.date()
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+def content_hash(data):
+    """SHA-256 of a WISP's answers, ignoring key order and blank answers.
+
+    Two WISPs with the same hash are duplicates; the unique index on
+    WISP.content_hash keeps a repeated submission from being saved twice.
+    """
+    answers = {key: value for key, value in data.items() if value not in (None, '', [], {})}
+    canonical = json.dumps(answers, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def row_data(data_blob, data):
+    """Answers from a WISP row's storage columns, for queries that skip the ORM"""
+    if data_blob is not None:
+        return decode_data(data_blob)
+    return json.loads(data) if data else {}
+
+class DocumentMixin:
+    """get_document() for models that store a WISP's answers"""
+
+    def get_document(self):
+        """Typed WISPDocument view of the form data, built once per loaded WISP"""
+        document = getattr(self, '_document', None)
+        if document is None:
+            from wisp_document import load_document
+            document = self._document = load_document(self.get_data())
+        return document
+
+# Database Models
+class WISP(DocumentMixin, db.Model):
+    __table_args__ = (
+        # For superseded(): a company's WISPs regardless of capitalization
+        db.Index('ix_wisp_company_name_lower', func.lower(db.text('company_name'))),
+        # Never hand out the id of a deleted or archived WISP again; archived
+        # WISPs keep serving their URLs (autoincrement_wisp_ids())
+        {'sqlite_autoincrement': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    company_name = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    data = db.Column(db.Text)  # Legacy JSON storage, NULL once the row is in data_blob
+    data_blob = db.Column(db.LargeBinary)  # Compressed form data (see wisp_storage)
+    review_due_date = db.Column(db.Date, index=True)  # Parsed from annual_review_date for SQL queries
+    review_reminder_sent_for = db.Column(db.Date)  # review_due_date the last reminder was sent for
+    content_hash = db.Column(db.String(64), unique=True, index=True)  # See content_hash(); NULL until dedupe-wisps has checked older rows
+    submission_token = db.Column(db.String(32), unique=True, index=True)  # Wizard draft id the WISP was completed from
+
+    controls = db.relationship('WISPControl', backref='wisp', cascade='all, delete-orphan')
+    vendor_links = db.relationship('WISPVendor', backref='wisp', cascade='all, delete-orphan')
+
+    def get_data(self):
+        return row_data(self.data_blob, self.data)
+
+    def set_data(self, data_dict):
+        self.data_blob = encode_data(data_dict)
+        self.data = None
+        self._document = None
+        self.review_due_date = parse_review_date(data_dict.get('annual_review_date'))
+        self.content_hash = content_hash(data_dict)
+        self.sync_controls(data_dict)
+        self.sync_vendors(data_dict)
+
+    def sync_controls(self, data_dict):
+        """Update the normalized control rows, touching only the ones that changed"""
+        existing = {control.control: control for control in self.controls}
+        for field in CONTROL_FIELDS:
+            in_place = bool(data_dict.get(field))
+            control = existing.get(field)
+            if control is None:
+                self.controls.append(WISPControl(control=field, in_place=in_place))
+            elif control.in_place != in_place:
+                control.in_place = in_place
+
+    def sync_vendors(self, data_dict):
+        """Point the vendor link rows at the directory entries for the answers' vendor and solution names"""
+        from vendor_directory import vendor_names, resolve_vendors
+        names = list(vendor_names(data_dict))
+        vendor_ids = resolve_vendors(name for field, name in names)
+        wanted = {(field, vendor_ids[name]) for field, name in names}
+        for link in list(self.vendor_links):
+            if (link.field, link.vendor_id) in wanted:
+                wanted.discard((link.field, link.vendor_id))
+            else:
+                self.vendor_links.remove(link)
+        for field, vendor_id in sorted(wanted):
+            self.vendor_links.append(WISPVendor(field=field, vendor_id=vendor_id))
+
+def superseded():
+    """SQL condition for WISPs replaced by a later WISP (higher id) of the same company"""
+    later = aliased(WISP)
+    return exists().where(
+        func.lower(later.company_name) == func.lower(WISP.company_name),
+        later.id > WISP.id
+    )
+
+class WISPControl(db.Model):
+    """One row per WISP and FTC checklist control, so compliance can be aggregated in SQL"""
+    __tablename__ = 'wisp_control'
+    __table_args__ = (
+        db.Index('ix_wisp_control_control_in_place', 'control', 'in_place'),
+    )
+
+    wisp_id = db.Column(db.Integer, db.ForeignKey('wisp.id', ondelete='CASCADE'), primary_key=True)
+    control = db.Column(db.String(64), primary_key=True)
+    in_place = db.Column(db.Boolean, nullable=False, default=False)
+
+class Vendor(db.Model):
+    """Shared directory of vendor and solution names (see vendor_directory)"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)  # Spelling it was first entered with
+    normalized_name = db.Column(db.String(200), nullable=False, unique=True)
+
+class WISPVendor(db.Model):
+    """One row per WISP field naming a directory vendor, so vendor use can be aggregated in SQL"""
+    __tablename__ = 'wisp_vendor'
+    __table_args__ = (
+        db.Index('ix_wisp_vendor_vendor_field', 'vendor_id', 'field'),
+    )
+
+    wisp_id = db.Column(db.Integer, db.ForeignKey('wisp.id', ondelete='CASCADE'), primary_key=True)
+    field = db.Column(db.String(64), primary_key=True)
+    vendor_id = db.Column(db.Integer, db.ForeignKey('vendor.id'), primary_key=True)
+
+class WizardDraft(db.Model):
+    """Answers of a wizard in progress, one row per browser session.
+
+    Kept in the database rather than the session cookie because the inventory
+    lists can hold far more than the 4 KB a cookie allows.
+    """
+    __tablename__ = 'wizard_draft'
+
+    id = db.Column(db.String(32), primary_key=True)
+    data_blob = db.Column(db.LargeBinary, nullable=False)  # {'step_N': answers} (see wisp_storage)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    def get_steps(self):
+        return decode_data(self.data_blob)
+
+    def set_steps(self, steps):
+        self.data_blob = encode_data(steps)
+
+class ArchivedWISP(DocumentMixin, db.Model):
+    """A WISP moved out of the wisp table by archive-wisps (see archive.py).
+
+    Lives in the 'archive' bind, a separate database file, with the PDF
+    rendered when it was archived. Keeps the WISP's id, so its view and PDF
+    URLs stay the same.
+    """
+    __bind_key__ = 'archive'
+    __tablename__ = 'archived_wisp'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    company_name = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    data_blob = db.Column(db.LargeBinary, nullable=False)  # Compressed form data (see wisp_storage)
+    review_reminder_sent_for = db.Column(db.Date)
+    content_hash = db.Column(db.String(64), index=True)
+    pdf_blob = db.deferred(db.Column(db.LargeBinary))  # zlib-compressed PDF rendered at archive time; loaded on access
+    pdf_template = db.Column(db.String(32))  # Template, engine, template_version() and
+    pdf_engine = db.Column(db.String(32))    # render_options() pdf_blob was rendered with
+    pdf_version = db.Column(db.String(16))
+    pdf_options = db.Column(db.String(200))  # See archive.options_key()
+
+    def get_data(self):
+        return decode_data(self.data_blob)
+
+def init_db():
+    """Create missing tables, then add columns and indexes introduced since the
+    database was first created (db.create_all() never alters existing tables)."""
+    db.create_all()
+    autoincrement_wisp_ids()
+    for bind_key, metadata in db.metadatas.items():
+        engine = db.engines[bind_key]
+        inspector = inspect(engine)
+        for table in metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    with engine.begin() as conn:
+                        conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            with warnings.catch_warnings():
+                # SQLite reflection skips expression indexes such as
+                # ix_wisp_company_name_lower; IF NOT EXISTS covers those
+                warnings.simplefilter('ignore', exc.SAWarning)
+                existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    with engine.begin() as conn:
+                        conn.execute(CreateIndex(index, if_not_exists=True))
+
+def wisp_ids_reused():
+    """True when SQLite may reuse the ids of deleted WISPs: the wisp table was
+    created without AUTOINCREMENT (run init_db())"""
+    engine = db.engines[None]
+    if engine.dialect.name != 'sqlite':
+        return False
+    with engine.connect() as conn:
+        sql = conn.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'wisp'"))
+    return 'AUTOINCREMENT' not in sql.upper()
+
+def autoincrement_wisp_ids():
+    """Rebuild a SQLite wisp table created without AUTOINCREMENT, and start new
+    ids after the highest one in the wisp table or the archive.
+
+    Without AUTOINCREMENT SQLite gives a new row the highest id in use plus
+    one, so once the WISP with the highest id was archived or deleted a new
+    WISP would take its id and its URLs. Other databases never reuse ids.
+    """
+    engine = db.engines[None]
+    if engine.dialect.name != 'sqlite':
+        return
+    with db.engines['archive'].connect() as conn:
+        archived_max = conn.scalar(select(func.max(ArchivedWISP.id))) or 0
+    reused = wisp_ids_reused()
+    with engine.begin() as conn:
+        if reused:
+            # SQLite cannot add AUTOINCREMENT to a table: copy the rows into a
+            # new table; init_db() then recreates the indexes
+            table = WISP.__table__
+            existing = {column['name'] for column in inspect(conn).get_columns(table.name)}
+            columns = ', '.join(column.name for column in table.columns if column.name in existing)
+            conn.execute(CreateTable(table.to_metadata(MetaData(), name='wisp_autoincrement')))
+            conn.execute(text(f'INSERT INTO wisp_autoincrement ({columns}) SELECT {columns} FROM wisp'))
+            conn.execute(text('DROP TABLE wisp'))
+            conn.execute(text('ALTER TABLE wisp_autoincrement RENAME TO wisp'))
+        high = max(conn.scalar(select(func.max(WISP.id))) or 0, archived_max)
+        seq = conn.scalar(text("SELECT seq FROM sqlite_sequence WHERE name = 'wisp'"))
+        if seq is None:
+            conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('wisp', :high)"), {'high': high})
+        elif seq < high:
+            conn.execute(text("UPDATE sqlite_sequence SET seq = :high WHERE name = 'wisp'"), {'high': high})
+
+def migrate_storage(batch_size=500, pause=0):
+    """Move rows still stored as JSON text into the compressed data_blob format.
+
+    Works in keyset batches with one short transaction each, sleeping pause
+    seconds in between, so it can run while the app is serving requests.
+    Returns the number of rows migrated.
+    """
+    migrated = 0
+    last_id = 0
+    statement = (
+        update(WISP.__table__)
+        .where(WISP.id == bindparam('wisp_id'))
+        # Keep updated_at as is; re-encoding is not an edit
+        .values(data_blob=bindparam('blob'), data=None, updated_at=WISP.updated_at)
+    )
+    while True:
+        rows = db.session.execute(
+            select(WISP.id, WISP.data)
+            .where(WISP.id > last_id, WISP.data.is_not(None), WISP.data_blob.is_(None))
+            .order_by(WISP.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return migrated
+        db.session.execute(statement, [{'wisp_id': wisp_id, 'blob': encode_data(json.loads(data))} for wisp_id, data in rows])
+        db.session.commit()
+        migrated += len(rows)
+        last_id = rows[-1].id
+        if pause:
+            time.sleep(pause)
+
+def dedupe_wisps(batch_size=500, dry_run=False):
+    """Merge WISPs with identical answers into the oldest copy, and store the
+    content hash of WISPs saved before content hashes existed.
+
+    Scans every WISP in keyset batches (holding one hash per WISP in memory),
+    then deletes the newer copies with their control and vendor rows and
+    backfills content_hash, one short transaction per batch. The kept copy
+    takes the latest review_reminder_sent_for of its group, so reminders are
+    not sent again. Returns [(kept id, [removed ids])]; dry_run only reports.
+    """
+    groups = {}
+    missing = {}
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(WISP.id, WISP.content_hash, WISP.data_blob, WISP.data)
+            .where(WISP.id > last_id)
+            .order_by(WISP.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            digest = row.content_hash
+            if digest is None:
+                digest = missing[row.id] = content_hash(row_data(row.data_blob, row.data))
+            groups.setdefault(digest, []).append(row.id)
+        last_id = rows[-1].id
+    merges = [(ids[0], ids[1:]) for ids in groups.values() if len(ids) > 1]
+    if dry_run:
+        return merges
+
+    for start in range(0, len(merges), batch_size):
+        for keep_id, drop_ids in merges[start:start + batch_size]:
+            keep = db.session.get(WISP, keep_id)
+            reminded = [keep.review_reminder_sent_for]
+            for wisp in WISP.query.filter(WISP.id.in_(drop_ids)):
+                reminded.append(wisp.review_reminder_sent_for)
+                db.session.delete(wisp)
+                missing.pop(wisp.id, None)
+            reminded = [value for value in reminded if value is not None]
+            if reminded:
+                # Keep updated_at as is; merging copies is not an edit
+                db.session.execute(
+                    update(WISP)
+                    .where(WISP.id == keep_id)
+                    .values(review_reminder_sent_for=max(reminded), updated_at=WISP.updated_at)
+                )
+        db.session.commit()
+
+    statement = (
+        update(WISP.__table__)
+        .where(WISP.id == bindparam('wisp_id'))
+        .values(content_hash=bindparam('digest'), updated_at=WISP.updated_at)
+    )
+    pending = list(missing.items())
+    for start in range(0, len(pending), batch_size):
+        db.session.execute(statement, [{'wisp_id': wisp_id, 'digest': digest} for wisp_id, digest in pending[start:start + batch_size]])
+        db.session.commit()
+    return merges
+
+def storage_stats():
+    """Return (rows, bytes) stored as legacy JSON and as compressed blobs"""
+    json_rows, json_bytes, blob_rows, blob_bytes = db.session.execute(select(
+        func.count(WISP.data),
+        func.coalesce(func.sum(func.length(WISP.data)), 0),
+        func.count(WISP.data_blob),
+        func.coalesce(func.sum(func.length(WISP.data_blob)), 0)
+    )).one()
+    return {'json_rows': json_rows, 'json_bytes': json_bytes, 'blob_rows': blob_rows, 'blob_bytes': blob_bytes}
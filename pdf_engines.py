@@ -0,0 +1,277 @@
+import importlib
+import io
+import multiprocessing
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import memory_profile
+from memory_profile import RenderMemoryExceeded
+
+# Bump when any template's output changes, so cached renders are invalidated
+ENGINE_VERSION = '4'
+
+DEFAULT_ENGINE = 'platypus'
+DEFAULT_TEMPLATE = 'rightworks'
+
+ENGINES = ('platypus', 'canvas')
+
+# Template name -> version, title and {engine: (module, function)}. Modules are
+# imported on first use so ReportLab stays out of app startup. A template's
+# version is bumped when only that template's output changes.
+TEMPLATES = {
+    'rightworks': {
+        'version': '2',
+        'title': 'WISP',
+        'engines': {
+            'platypus': ('comprehensive_pdf_generator', 'generate_complete_rightworks_wisp_pdf'),
+            'canvas': ('canvas_pdf_generator', 'generate_canvas_wisp_pdf')
+        }
+    },
+    'executive_summary': {
+        'version': '1',
+        'title': 'WISP Executive Summary',
+        'engines': {
+            'platypus': ('comprehensive_pdf_generator', 'generate_executive_summary_pdf')
+        }
+    }
+}
+
+def get_renderer(template=None, engine=None):
+    """Return the render function for template and engine.
+
+    Templates without a fast path for the requested engine fall back to the
+    default (flow layout) engine.
+    """
+    template = template or DEFAULT_TEMPLATE
+    if template not in TEMPLATES:
+        raise ValueError(f'Unknown PDF template: {template}')
+    if engine and engine not in ENGINES:
+        raise ValueError(f'Unknown PDF engine: {engine}')
+    engines = TEMPLATES[template]['engines']
+    module_name, function_name = engines.get(engine or DEFAULT_ENGINE, engines[DEFAULT_ENGINE])
+    return getattr(importlib.import_module(module_name), function_name)
+
+def render_options(config):
+    """PDF size options from app config, as keyword arguments for render_wisp_pdf"""
+    return {
+        'compress': config['PDF_COMPRESS'],
+        'shared_resources': config['PDF_SHARED_RESOURCES'],
+        'object_streams': config['PDF_OBJECT_STREAMS'],
+        'linearize': config['PDF_LINEARIZE']
+    }
+
+def render_wisp_pdf(wisp, template=None, engine=None, compress=True, shared_resources=False,
+                    object_streams=False, linearize=False):
+    """Render a WISP to a PDF buffer with the named template and engine.
+
+    compress deflates page content streams, shared_resources draws content
+    repeated on every page (the footer) once as a form XObject, object_streams
+    packs the small page and font objects into one compressed stream, and
+    linearize reorders the file for fast web view. The last two require pikepdf.
+    """
+    renderer = get_renderer(template, engine)
+    with _binary_streams():
+        buffer = renderer(wisp, compress=compress, shared_resources=shared_resources)
+    if object_streams or linearize:
+        buffer = optimize_pdf(buffer, object_streams=object_streams, linearize=linearize)
+    return buffer
+
+_a85_lock = threading.Lock()
+_a85_renders = 0
+_a85_default = None
+
+@contextmanager
+def _binary_streams():
+    """Write compressed streams as binary while renders are running.
+
+    ReportLab's default ASCII85 wrapping keeps files 7-bit clean but makes
+    every compressed stream 25% larger. ReportLab only reads the setting from
+    the process-wide rl_config, so it is switched off for as long as any
+    render is running and restored when the last one finishes.
+    """
+    global _a85_renders, _a85_default
+    from reportlab import rl_config
+    with _a85_lock:
+        if not _a85_renders:
+            _a85_default = rl_config.useA85
+            rl_config.useA85 = 0
+        _a85_renders += 1
+    try:
+        yield
+    finally:
+        with _a85_lock:
+            _a85_renders -= 1
+            if not _a85_renders:
+                rl_config.useA85 = _a85_default
+
+def require_pikepdf():
+    """Import pikepdf, or raise RuntimeError when it is not installed"""
+    try:
+        import pikepdf
+    except ImportError:
+        raise RuntimeError('Object streams and linearized PDF output require pikepdf (pip install pikepdf)')
+    return pikepdf
+
+def optimize_pdf(buffer, object_streams=False, linearize=False):
+    """Rewrite a PDF buffer with qpdf (through pikepdf)"""
+    pikepdf = require_pikepdf()
+    mode = pikepdf.ObjectStreamMode.generate if object_streams else pikepdf.ObjectStreamMode.preserve
+    output = io.BytesIO()
+    with pikepdf.open(buffer) as pdf:
+        pdf.save(output, object_stream_mode=mode, linearize=linearize)
+    output.seek(0)
+    return output
+
+class WISPSnapshot:
+    """Picklable copy of what the renderers read from a WISP: its answers and
+    record fields. Sent to render worker processes in place of the WISP."""
+
+    def __init__(self, data, id=None, company_name=None, created_at=None, updated_at=None):
+        self.data = data
+        self.id = id
+        self.company_name = company_name
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def of(cls, wisp):
+        return cls(wisp.get_data(), wisp.id, wisp.company_name, wisp.created_at, wisp.updated_at)
+
+    def get_data(self):
+        return self.data
+
+    def get_document(self):
+        from wisp_document import load_document
+        return load_document(self.data)
+
+def _preload_renderers():
+    for template in TEMPLATES.values():
+        for module_name, _ in template['engines'].values():
+            importlib.import_module(module_name)
+
+def _start_worker(trace):
+    if trace:
+        memory_profile.start()
+    _preload_renderers()
+
+def _render_bytes(wisp, template, engine, options, memory_limit=0):
+    """(PDF bytes, traced peak or None) of a WISP or WISPSnapshot"""
+    return memory_profile.measure_render(
+        lambda: render_wisp_pdf(wisp, template, engine, **options).getvalue(), memory_limit
+    )
+
+class RenderPool:
+    """Runs render_wisp_pdf in worker processes.
+
+    Rendering is CPU-bound and holds the GIL, so in-thread renders stall every
+    other request the process is serving. With processes > 0 the calling thread
+    only waits on the result, leaving the interpreter free for I/O-bound
+    requests. Workers are spawned (not forked from a threaded server) on first
+    use and import the renderers once, so the script that starts the server
+    must guard its startup code with ``if __name__ == '__main__'``. With
+    processes = 0 renders run in the calling thread.
+
+    When memory_profile is tracing, workers trace too, and renders whose peak
+    is over memory_limit bytes raise RenderMemoryExceeded.
+    """
+
+    def __init__(self, processes=0, memory_limit=0):
+        self.processes = processes
+        self.memory_limit = memory_limit
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.processes, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_start_worker, initargs=(memory_profile.is_enabled(),)
+                )
+            return self._executor
+
+    def render(self, wisp, template=None, engine=None, **options):
+        """Render like render_wisp_pdf, in a worker process when the pool is enabled"""
+        if not self.processes:
+            return self._record(lambda: memory_profile.measure_render(
+                lambda: render_wisp_pdf(wisp, template, engine, **options), self.memory_limit
+            ))
+        executor = self._get_executor()
+        try:
+            pdf = self._record(executor.submit(
+                _render_bytes, WISPSnapshot.of(wisp), template, engine, options, self.memory_limit
+            ).result)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        return io.BytesIO(pdf)
+
+    def render_many(self, wisps, template=None, engine=None, limiter=None, priority=None, **options):
+        """Render each of an iterable of WISPs (or WISPSnapshots), yielding the
+        PDF bytes in input order. With the pool enabled, up to two renders per
+        worker process are in flight at once, so wisps are read ahead only that far.
+
+        With a render_limiter.RenderLimiter, each render holds a slot of the
+        given priority while it runs, so the limiter counts every render in
+        flight. Slots are released as renders finish, not as results are read.
+        """
+        if not self.processes:
+            for wisp in wisps:
+                with limiter.slot(priority) if limiter else nullcontext():
+                    pdf = self._record(lambda: _render_bytes(wisp, template, engine, options, self.memory_limit))
+                yield pdf
+            return
+        executor = self._get_executor()
+        pending = deque()
+        try:
+            for wisp in wisps:
+                snapshot = WISPSnapshot.of(wisp)
+                started = limiter.acquire(priority) if limiter else None
+                try:
+                    future = executor.submit(_render_bytes, snapshot, template, engine, options, self.memory_limit)
+                except BaseException:
+                    if limiter:
+                        limiter.release(priority, started)
+                    raise
+                if limiter:
+                    future.add_done_callback(lambda _, started=started: limiter.release(priority, started))
+                pending.append(future)
+                if len(pending) >= 2 * self.processes:
+                    yield self._record(pending.popleft().result)
+            while pending:
+                yield self._record(pending.popleft().result)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _record(self, render):
+        """Return the result of render() -> (result, peak), recording the peak in this process's memory profile"""
+        try:
+            result, peak = render()
+        except RenderMemoryExceeded as error:
+            memory_profile.profiler.record_render(error.peak, over_budget=True)
+            raise
+        memory_profile.profiler.record_render(peak)
+        return result
+
+    def _discard(self, executor):
+        # A worker died (e.g. killed for memory); start a fresh pool next time
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+def template_version(template=None):
+    """Version string of a template's output, e.g. '3.1' for engine 3, template 1"""
+    template = template or DEFAULT_TEMPLATE
+    return f"{ENGINE_VERSION}.{TEMPLATES[template]['version']}"
@@ -0,0 +1,151 @@
+import mailbox
+import smtplib
+from collections import defaultdict
+from datetime import date, timedelta
+from email.message import EmailMessage
+from sqlalchemy import or_, update
+from models import db, WISP, superseded
+
+DEFAULT_BATCH_SIZE = 500
+
+class FileSender:
+    """Appends reminder emails to a local mbox file instead of sending them"""
+
+    def __init__(self, path, from_address):
+        self.path = path
+        self.from_address = from_address
+
+    def send(self, messages):
+        box = mailbox.mbox(self.path)
+        box.lock()
+        try:
+            for message in messages:
+                box.add(message)
+            box.flush()
+        finally:
+            box.unlock()
+            box.close()
+
+class SMTPSender:
+    """Sends reminder emails over one SMTP connection per batch.
+
+    For local testing point it at a debugging server, e.g.
+    ``python -m aiosmtpd -n -l localhost:1025``.
+    """
+
+    def __init__(self, host, port, from_address, username=None, password=None, use_tls=False):
+        self.host = host
+        self.port = port
+        self.from_address = from_address
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def send(self, messages):
+        with smtplib.SMTP(self.host, self.port) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for message in messages:
+                smtp.send_message(message)
+
+SENDERS = {
+    'file': lambda config: FileSender(config['REMINDER_FILE'], config['REMINDER_FROM']),
+    'smtp': lambda config: SMTPSender(
+        config['SMTP_HOST'],
+        config['SMTP_PORT'],
+        config['REMINDER_FROM'],
+        username=config.get('SMTP_USERNAME'),
+        password=config.get('SMTP_PASSWORD'),
+        use_tls=config.get('SMTP_USE_TLS', False)
+    )
+}
+
+def get_sender(name, config):
+    """Build the sender registered under name from app config"""
+    if name not in SENDERS:
+        raise ValueError(f'Unknown reminder sender: {name}')
+    return SENDERS[name](config)
+
+def iter_due_batches(days, today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield batches of WISPs due for review within days that have not been
+    reminded for their current due date. Only a company's latest WISP is
+    reminded about; earlier ones it has replaced are skipped.
+
+    Uses the indexed review_due_date column and keyset pagination, so only due
+    WISPs are ever loaded.
+    """
+    today = today or date.today()
+    cutoff = today + timedelta(days=days)
+    last_id = 0
+    while True:
+        batch = (
+            WISP.query
+            .filter(
+                WISP.review_due_date <= cutoff,
+                or_(WISP.review_reminder_sent_for.is_(None), WISP.review_reminder_sent_for != WISP.review_due_date),
+                WISP.id > last_id,
+                ~superseded()
+            )
+            .order_by(WISP.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield batch
+
+def build_messages(wisps, from_address, today=None):
+    """Build one reminder email per contact address covering all of their due WISPs"""
+    today = today or date.today()
+    by_recipient = defaultdict(list)
+    for wisp in wisps:
+        recipient = wisp.get_document().contact_email
+        if recipient:
+            by_recipient[recipient].append(wisp)
+
+    messages = []
+    for recipient, recipient_wisps in by_recipient.items():
+        lines = []
+        for wisp in sorted(recipient_wisps, key=lambda w: w.review_due_date):
+            status = 'overdue since' if wisp.review_due_date < today else 'due'
+            lines.append(f"- {wisp.company_name} (WISP #{wisp.id}): {status} {wisp.review_due_date.strftime('%B %d, %Y')}")
+
+        message = EmailMessage()
+        message['From'] = from_address
+        message['To'] = recipient
+        message['Subject'] = 'Annual WISP review reminder'
+        message.set_content(
+            "IRS regulations require that your Written Information Security Plan be reviewed "
+            "and updated annually. The following WISPs are due for their annual review:\n\n"
+            + '\n'.join(lines)
+            + "\n\nPlease review your security practices and update your WISP if needed.\n"
+        )
+        messages.append(message)
+    return messages
+
+def send_review_reminders(sender, days=30, today=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Send reminders for WISPs due within days and record that they were sent.
+
+    Returns (wisps_reminded, messages_sent).
+    """
+    reminded = 0
+    sent = 0
+    for batch in iter_due_batches(days, today=today, batch_size=batch_size):
+        messages = build_messages(batch, sender.from_address, today=today)
+        if not dry_run:
+            sender.send(messages)
+            # Keep updated_at as is; sending a reminder is not an edit
+            db.session.execute(
+                update(WISP)
+                .where(WISP.id.in_([wisp.id for wisp in batch]))
+                .values(review_reminder_sent_for=WISP.review_due_date, updated_at=WISP.updated_at),
+                execution_options={'synchronize_session': False}
+            )
+            db.session.commit()
+        reminded += len(batch)
+        sent += len(messages)
+        db.session.expunge_all()
+    return reminded, sent
@@ -0,0 +1,146 @@
+"""Admission control for CPU-bound PDF rendering.
+
+A RenderLimiter caps how many renders run at once in a process. Requests over
+the limit wait in a bounded priority queue (interactive downloads ahead of
+bulk jobs) and are turned away with RenderBusy when the queue is full or the
+wait times out, so a burst of downloads cannot tie up every worker thread or
+exhaust memory while the wizard pages wait behind it.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+INTERACTIVE = 0
+BULK = 1
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BULK: 'bulk'}
+
+class RenderBusy(Exception):
+    """Raised when a render is not admitted; retry_after is a suggested delay in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f'PDF rendering is at capacity, retry in {retry_after}s')
+        self.retry_after = retry_after
+
+class RenderLimiter:
+    """Concurrency limit with a bounded priority wait queue.
+
+    max_concurrent renders run at once, of which at most max_bulk are bulk
+    jobs. The slots bulk jobs cannot take are reserved for interactive
+    downloads; with a single slot, one interactive render may run alongside
+    the bulk job holding it rather than wait behind it, so max_running, the
+    most renders that can run at once, is then 2. Up to max_queue requests wait, interactive ones first and otherwise in arrival
+    order, for at most timeout seconds.
+    """
+
+    def __init__(self, max_concurrent, max_queue=16, timeout=10.0, max_bulk=None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_bulk = max(1, self.max_concurrent - 1) if max_bulk is None else max_bulk
+        self.reserved = max(1, self.max_concurrent - self.max_bulk)
+        self.max_running = max(self.max_concurrent, self.max_bulk + self.reserved)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._order = itertools.count()
+        self._active = {INTERACTIVE: 0, BULK: 0}
+        self._admitted = {INTERACTIVE: 0, BULK: 0}
+        self._rejected = 0
+        self._timed_out = 0
+        self._waits = deque(maxlen=1000)
+        self._max_wait = 0.0
+        self._render_avg = 1.0
+
+    def _has_capacity(self, priority):
+        full = sum(self._active.values()) >= self.max_concurrent
+        if priority == BULK:
+            return not full and self._active[BULK] < self.max_bulk
+        return not full or self._active[INTERACTIVE] < self.reserved
+
+    def retry_after(self):
+        """Seconds until a queued request would likely start, from the average render time"""
+        backlog = len(self._waiting) + 1
+        return min(60, max(1, math.ceil(self._render_avg * backlog / self.max_concurrent)))
+
+    def acquire(self, priority=INTERACTIVE):
+        """Wait for a render slot; raises RenderBusy when the queue is full or the wait times out"""
+        start = time.monotonic()
+        with self._cond:
+            if not self._waiting and self._has_capacity(priority):
+                return self._admit(priority, start)
+            if len(self._waiting) >= self.max_queue:
+                self._rejected += 1
+                raise RenderBusy(self.retry_after())
+
+            ticket = (priority, next(self._order))
+            heapq.heappush(self._waiting, ticket)
+            deadline = start + self.timeout
+            while not (self._waiting[0] == ticket and self._has_capacity(priority)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._timed_out += 1
+                    self._cond.notify_all()
+                    raise RenderBusy(self.retry_after())
+                self._cond.wait(remaining)
+            heapq.heappop(self._waiting)
+            # Another slot may still be free for the next request in line
+            self._cond.notify_all()
+            return self._admit(priority, start)
+
+    def _admit(self, priority, start):
+        wait = time.monotonic() - start
+        self._active[priority] += 1
+        self._admitted[priority] += 1
+        self._waits.append(wait)
+        self._max_wait = max(self._max_wait, wait)
+        return time.monotonic()
+
+    def release(self, priority, started):
+        with self._cond:
+            self._active[priority] -= 1
+            self._render_avg = 0.8 * self._render_avg + 0.2 * (time.monotonic() - started)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority=INTERACTIVE):
+        """Hold a render slot for the duration of the with block"""
+        started = self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority, started)
+
+    def stats(self):
+        """Current load and cumulative counters, for tuning the limits"""
+        with self._cond:
+            waits = sorted(self._waits)
+            queued = [priority for priority, _ in self._waiting]
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_running': self.max_running,
+                'max_bulk': self.max_bulk,
+                'interactive_reserved': self.reserved,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.timeout,
+                'active': {PRIORITY_NAMES[p]: n for p, n in self._active.items()},
+                'queued': {name: queued.count(p) for p, name in PRIORITY_NAMES.items()},
+                'admitted': {PRIORITY_NAMES[p]: n for p, n in self._admitted.items()},
+                'rejected': self._rejected,
+                'timed_out': self._timed_out,
+                'wait_ms': {
+                    'p50': round(_percentile(waits, 0.5) * 1000, 1),
+                    'p95': round(_percentile(waits, 0.95) * 1000, 1),
+                    'max': round(self._max_wait * 1000, 1)
+                },
+                'render_avg_ms': round(self._render_avg * 1000, 1)
+            }
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
@@ -0,0 +1,33 @@
+"""Production entry point: serves the app over ASGI with uvicorn.
+
+    python serve.py --host 0.0.0.0 --port 8000 --workers 4
+
+Creates or upgrades the database tables once, then starts the workers. Use
+this instead of ``python app.py``, which runs Flask's debug server.
+"""
+import argparse
+import os
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=os.environ.get('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', 1)),
+                        help='Server processes (default: WEB_CONCURRENCY or 1)')
+    parser.add_argument('--log-level', default='info')
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit('serve.py requires uvicorn and asgiref (pip install asgiref uvicorn)')
+
+    from app import app, init_db
+    with app.app_context():
+        init_db()
+
+    uvicorn.run('asgi:asgi_app', host=args.host, port=args.port, workers=args.workers,
+                log_level=args.log_level, proxy_headers=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+# Read by app.py when it is first imported
+_db_dir = tempfile.mkdtemp(prefix='wisp-tests-')
+os.environ['DATABASE_URI'] = f"sqlite:///{os.path.join(_db_dir, 'wisp.db')}"
+os.environ['ARCHIVE_DATABASE_URI'] = f"sqlite:///{os.path.join(_db_dir, 'archive.db')}"
+
+@pytest.fixture
+def app():
+    """The app with empty databases"""
+    from app import app
+    from models import db, init_db
+    with app.app_context():
+        db.drop_all()
+        init_db()
+        yield app
+        db.session.remove()
+        db.drop_all()
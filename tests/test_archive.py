@@ -0,0 +1,108 @@
+"""Archived WISP ids are never reused, restoring never deletes a WISP, and
+exports and the API can still reach archived WISPs."""
+import json
+from datetime import datetime
+from sqlalchemy import MetaData, text
+from sqlalchemy.schema import CreateTable
+import archive
+from models import db, WISP, ArchivedWISP, init_db, wisp_ids_reused
+from pdf_engines import RenderPool
+from wisp_export import export_wisps
+from wisp_storage import encode_data
+
+def add_wisp(company_name, **answers):
+    wisp = WISP(company_name=company_name)
+    wisp.set_data(dict(answers, company_name=company_name))
+    db.session.add(wisp)
+    db.session.commit()
+    return wisp.id
+
+def test_new_wisp_does_not_take_an_archived_id(app):
+    abc = [add_wisp('ABC', prepared_by='2023'), add_wisp('ABC', prepared_by='2024')]
+    other = add_wisp('XYZ')
+    assert archive.archive_wisps(abc, RenderPool(0)) == 2
+    db.session.delete(db.session.get(WISP, other))
+    db.session.commit()
+
+    new_id = add_wisp('New Co')
+    assert new_id not in abc + [other]
+
+    response = app.test_client().get(f'/wisp/{abc[0]}')
+    assert response.status_code == 200
+    assert b'ABC' in response.data
+
+    assert archive.restore_wisps(abc) == (abc, [], [])
+    assert db.session.get(WISP, abc[0]).get_data()['prepared_by'] == '2023'
+
+def test_restore_keeps_a_different_wisp_with_the_same_id(app):
+    wisp_id = add_wisp('ABC')
+    archive.archive_wisps([wisp_id], RenderPool(0))
+    # A WISP created with this id while it was archived, e.g. before the upgrade
+    wisp = WISP(id=wisp_id, company_name='Other Co')
+    wisp.set_data({'company_name': 'Other Co'})
+    db.session.add(wisp)
+    db.session.commit()
+
+    assert archive.restore_wisps([wisp_id]) == ([], [], [wisp_id])
+    assert db.session.get(WISP, wisp_id).company_name == 'Other Co'
+    assert db.session.get(ArchivedWISP, wisp_id).company_name == 'ABC'
+
+def test_restore_finishes_an_interrupted_archive(app):
+    wisp_id = add_wisp('ABC')
+    archive.archive_wisps([wisp_id], RenderPool(0))
+    wisp = WISP(id=wisp_id, company_name='ABC')
+    wisp.set_data({'company_name': 'ABC'})
+    db.session.add(wisp)
+    db.session.commit()
+
+    assert archive.restore_wisps([wisp_id]) == ([wisp_id], [], [])
+    assert db.session.get(ArchivedWISP, wisp_id) is None
+
+def test_init_db_adds_autoincrement_to_an_existing_table(app):
+    db.drop_all()
+    legacy = WISP.__table__.to_metadata(MetaData())
+    legacy.dialect_options['sqlite']['autoincrement'] = False
+    with db.engine.begin() as conn:
+        conn.execute(CreateTable(legacy))
+        conn.execute(text("INSERT INTO wisp (id, company_name, created_at, updated_at) VALUES "
+                          "(1, 'ABC', '2024-01-01', '2024-01-01'), (2, 'XYZ', '2024-01-01', '2024-01-01')"))
+    db.create_all(bind_key='archive')
+    db.session.add(ArchivedWISP(id=3, company_name='Old Co', created_at=datetime(2022, 1, 1), updated_at=datetime(2022, 1, 1),
+                                data_blob=encode_data({'company_name': 'Old Co'})))
+    db.session.commit()
+    assert wisp_ids_reused()
+
+    init_db()
+
+    assert not wisp_ids_reused()
+    assert [wisp.company_name for wisp in WISP.query.order_by(WISP.id)] == ['ABC', 'XYZ']
+    indexes = db.session.scalars(text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'wisp'")).all()
+    assert {index.name for index in WISP.__table__.indexes} <= set(indexes)
+    assert add_wisp('New Co') == 4
+
+def test_export_includes_archived_wisps_when_asked(app):
+    wisp_ids = [add_wisp('ABC'), add_wisp('XYZ')]
+    archive.archive_wisps(wisp_ids[:1], RenderPool(0))
+
+    def exported_ids(**options):
+        lines = b''.join(export_wisps('jsonl', **options)).decode().splitlines()
+        return [json.loads(line)['id'] for line in lines]
+
+    assert exported_ids() == wisp_ids[1:]
+    assert exported_ids(include_archived=True) == wisp_ids
+
+def test_api_reads_archived_wisps_but_does_not_change_them(app):
+    app.config['API_TOKENS'] = ['test-token']
+    client = app.test_client()
+    headers = {'Authorization': 'Bearer test-token'}
+    wisp_id = add_wisp('ABC')
+    archive.archive_wisps([wisp_id], RenderPool(0))
+
+    response = client.get(f'/api/v1/wisps/{wisp_id}', headers=headers)
+    assert response.status_code == 200
+    assert response.json['company_name'] == 'ABC' and response.json['archived']
+    assert [wisp['id'] for wisp in client.get('/api/v1/wisps?archived=1', headers=headers).json['wisps']] == [wisp_id]
+    assert client.get('/api/v1/wisps', headers=headers).json['wisps'] == []
+    assert client.patch(f'/api/v1/wisps/{wisp_id}', json={'prepared_by': 'Pat'}, headers=headers).status_code == 409
+    assert client.delete(f'/api/v1/wisps/{wisp_id}', headers=headers).status_code == 409
+    assert db.session.get(ArchivedWISP, wisp_id) is not None
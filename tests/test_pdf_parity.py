@@ -0,0 +1,35 @@
+"""Both PDF engines render answers containing markup characters as text."""
+import pytest
+from bench_pdf_engines import SAMPLE_DATA, SampleWISP, extract_words
+from pdf_engines import ENGINES, render_wisp_pdf
+
+pytest.importorskip('pypdf')
+
+MARKUP = 'Co & Sons <b>'
+
+MARKUP_DATA = dict(
+    SAMPLE_DATA,
+    company_name=MARKUP,
+    street_address='1 <Main> & Elm',
+    contact_email='a&b@example.com',
+    prepared_by=MARKUP,
+    antivirus_solution=MARKUP,
+    endpoint_detection_solution='<i>EDR</i>',
+    intrusion_detection_solution='IDS & more',
+    qualified_individual_name=MARKUP,
+    qualified_individual_qualifications='</para>',
+    qualified_individual_supervisor='&amp;'
+)
+
+def render_words(template, engine):
+    pages, words = extract_words(render_wisp_pdf(SampleWISP(MARKUP_DATA), template, engine).getvalue())
+    return words
+
+@pytest.mark.parametrize('template', ['rightworks', 'executive_summary'])
+@pytest.mark.parametrize('engine', ENGINES)
+def test_markup_answers_render_as_text(template, engine):
+    text = ' '.join(render_words(template, engine))
+    assert MARKUP in text
+
+def test_engines_extract_the_same_words():
+    assert render_words('rightworks', 'canvas') == render_words('rightworks', 'platypus')
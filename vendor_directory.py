@@ -0,0 +1,164 @@
+"""Shared directory of vendor and solution names.
+
+Vendor and solution answers (antivirus, backup, MFA, ... and the vendor
+inventory) are free text, so the same product is spelled many ways across
+WISPs. Each distinct name is stored once in the vendor table under a
+normalized key, and wisp_vendor links every WISP field to its entry, so usage
+can be counted in SQL. An in-memory prefix index over the directory answers
+autocomplete lookups from the wizard.
+"""
+import importlib
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from sqlalchemy import select, func, insert
+
+# Single-name solution fields; the FTC checklist's Vendor/Date fields mix names
+# and dates, so they are not part of the directory
+SOLUTION_FIELDS = [
+    'antivirus_solution', 'endpoint_detection_solution', 'intrusion_detection_solution',
+    'backup_solution', 'firewall_solution', 'encryption_solution', 'mfa_solution',
+    'vpn_solution', 'rmm_solution', 'client_data_protection_solution'
+]
+# Inventory lists whose row names are vendors
+VENDOR_LISTS = ['vendors']
+
+# Trailing company suffixes ignored when comparing names
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company'}
+
+NAME_LENGTH = 200
+
+def normalize_name(name):
+    """Comparison key of a vendor name: case, punctuation, spacing and company suffixes ignored"""
+    words = re.sub(r'[^\w&+]+', ' ', name.casefold()).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)[:NAME_LENGTH]
+
+def vendor_names(data):
+    """(field, name) for each vendor or solution named in the answers"""
+    for field in SOLUTION_FIELDS:
+        name = (data.get(field) or '').strip()
+        if normalize_name(name):
+            yield field, name[:NAME_LENGTH]
+    for field in VENDOR_LISTS:
+        for row in data.get(field) or ():
+            name = (row.get('name') or '').strip() if isinstance(row, dict) else ''
+            if normalize_name(name):
+                yield field, name[:NAME_LENGTH]
+
+def resolve_vendors(names):
+    """Map each name to its directory entry id, adding entries for new names.
+
+    Safe against another request adding the same new name at the same time:
+    names inserted first elsewhere are skipped and then looked up.
+    """
+    from models import db, Vendor
+    names = list(names)
+    by_key = {}
+    for name in names:
+        by_key.setdefault(normalize_name(name), name)
+    if not by_key:
+        return {}
+    ids = dict(db.session.execute(
+        select(Vendor.normalized_name, Vendor.id).where(Vendor.normalized_name.in_(by_key))
+    ).all())
+    missing = [key for key in by_key if key not in ids]
+    if missing:
+        db.session.execute(_insert_ignoring_duplicates(Vendor, db.session.get_bind(Vendor).dialect.name),
+                           [{'name': by_key[key], 'normalized_name': key} for key in missing])
+        ids.update(db.session.execute(
+            select(Vendor.normalized_name, Vendor.id).where(Vendor.normalized_name.in_(missing))
+        ).all())
+    return {name: ids[normalize_name(name)] for name in names}
+
+def _insert_ignoring_duplicates(model, dialect):
+    """INSERT into model that skips rows whose unique key already exists"""
+    if dialect in ('sqlite', 'postgresql'):
+        module = importlib.import_module(f'sqlalchemy.dialects.{dialect}')
+        return module.insert(model).on_conflict_do_nothing()
+    if dialect in ('mysql', 'mariadb'):
+        return insert(model).prefix_with('IGNORE')
+    return insert(model)
+
+def vendor_usage(field=None, limit=50):
+    """Directory entries by number of WISPs naming them, optionally for one field"""
+    from models import db, Vendor, WISPVendor
+    wisps = func.count(func.distinct(WISPVendor.wisp_id))
+    stmt = (
+        select(Vendor.id, Vendor.name, wisps.label('wisps'))
+        .join(WISPVendor, WISPVendor.vendor_id == Vendor.id)
+        .group_by(Vendor.id, Vendor.name)
+        .order_by(wisps.desc(), Vendor.name)
+        .limit(limit)
+    )
+    if field is not None:
+        stmt = stmt.where(WISPVendor.field == field)
+    return [row._asdict() for row in db.session.execute(stmt)]
+
+class PrefixIndex:
+    """Sorted (key, id) list searched with bisect.
+
+    Every word of a name starts a key, so 'auth' finds 'Microsoft
+    Authenticator'. New directory entries are added incrementally: refresh()
+    loads only rows with a higher id than the last one seen, at most once per
+    refresh_interval seconds, so entries saved by other processes appear
+    without reloading the whole directory.
+    """
+
+    def __init__(self, refresh_interval=2.0):
+        self.refresh_interval = refresh_interval
+        self._keys = []
+        self._names = {}
+        self._last_id = 0
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+
+    def add(self, vendor_id, name):
+        key = normalize_name(name)
+        words = key.split()
+        with self._lock:
+            if vendor_id in self._names:
+                return  # Already added by a concurrent refresh
+            self._names[vendor_id] = (name, key)
+            for i in range(len(words)):
+                insort(self._keys, (' '.join(words[i:]), vendor_id))
+
+    def refresh(self, force=False):
+        """Add directory entries created since the last refresh"""
+        now = time.monotonic()
+        if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+            return
+        from models import db, Vendor
+        self._refreshed_at = now
+        rows = db.session.execute(
+            select(Vendor.id, Vendor.name).where(Vendor.id > self._last_id).order_by(Vendor.id)
+        ).all()
+        for vendor_id, name in rows:
+            self.add(vendor_id, name)
+        if rows:
+            self._last_id = rows[-1].id
+
+    def search(self, prefix, limit=10):
+        """[(id, name)] of up to limit entries with a word starting with prefix,
+        names starting with it first"""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        leading, inner = [], []
+        seen = set()
+        with self._lock:
+            for i in range(bisect_left(self._keys, (key,)), len(self._keys)):
+                candidate, vendor_id = self._keys[i]
+                if not candidate.startswith(key) or len(seen) >= limit:
+                    break
+                if vendor_id in seen:
+                    continue
+                seen.add(vendor_id)
+                name, name_key = self._names[vendor_id]
+                (leading if name_key == candidate else inner).append((vendor_id, name))
+        return leading + inner
+
+    def __len__(self):
+        return len(self._names)
@@ -0,0 +1,112 @@
+"""Typed view of the wizard answers stored for a WISP.
+
+WISPDocument is a slotted dataclass with one attribute per wizard field,
+generated from the wizard forms on first use. Values are converted once when a
+document is loaded, so consumers get bools for checkboxes, datetime.date for
+dates, None for unanswered fields and tuples of named rows for the inventory
+lists instead of whatever survived the JSON round trip.
+"""
+import dataclasses
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache, partial
+from models import parse_review_date
+from inventory import INVENTORIES, PII_CATEGORY_LABELS, upgrade_legacy_inventories, ordered_pii_locations
+
+def _to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_rows(row_type, value):
+    """Tuple of row_type for an inventory list, skipping rows without a name"""
+    rows = []
+    for row in value or ():
+        if isinstance(row, dict) and str(row.get('name') or '').strip():
+            rows.append(row_type(*[str(row.get(column) or '').strip() for column in row_type._fields]))
+    return tuple(rows)
+
+class WISPDocumentBase:
+    """Behaviour shared by the generated WISPDocument class"""
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a document from stored form data, converting each value once"""
+        data = upgrade_legacy_inventories(data)
+        return cls(*[convert(data.get(name)) for name, convert in cls.converters])
+
+    def get(self, name, default=None):
+        """Value of field name, or default when it is unanswered"""
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def label(self, name, default=''):
+        """Display label of a select field's answer"""
+        from forms import wizard_choice_labels
+        value = getattr(self, name, None)
+        if not value:
+            return default
+        return wizard_choice_labels().get(name, {}).get(value, value)
+
+    @staticmethod
+    def category_label(category):
+        """Display label of a PII location row's category"""
+        return PII_CATEGORY_LABELS.get(category, category)
+
+    @property
+    def pii_inventory(self):
+        """PII location rows grouped by category, in the order the documents list them"""
+        return ordered_pii_locations(self.pii_locations)
+
+    @property
+    def address_lines(self):
+        """Street address and 'City, ST ZIP' lines, as printed on the title page"""
+        lines = []
+        if self.street_address:
+            lines.append(self.street_address)
+        if self.city and self.state:
+            city_state = f'{self.city}, {self.state}'
+            if self.zip_code:
+                city_state += f' {self.zip_code}'
+            lines.append(city_state)
+        return lines
+
+@lru_cache(maxsize=None)
+def document_class():
+    """Generate the WISPDocument class from the wizard forms"""
+    from forms import iter_wizard_fields, InventoryField
+    from wtforms import BooleanField, IntegerField
+    from wtforms.fields import DateField
+
+    field_types = {
+        BooleanField: (bool, bool),
+        DateField: (date, parse_review_date),
+        IntegerField: (int, _to_int)
+    }
+    fields = []
+    converters = []
+    for name, field_class in iter_wizard_fields():
+        if field_class is InventoryField:
+            row_type = namedtuple(f"{name.title().replace('_', '')}Row", [column for column, header, width in INVENTORIES[name][1]])
+            fields.append((name, tuple, dataclasses.field(default=())))
+            converters.append((name, partial(_to_rows, row_type)))
+            continue
+        field_type, convert = field_types.get(field_class, (str, _to_text))
+        default = False if field_type is bool else None
+        fields.append((name, field_type, dataclasses.field(default=default)))
+        converters.append((name, convert))
+
+    cls = dataclasses.make_dataclass('WISPDocument', fields, bases=(WISPDocumentBase,), slots=True)
+    cls.converters = tuple(converters)
+    return cls
+
+def load_document(data):
+    """Build a WISPDocument from a dict of stored form data"""
+    return document_class().from_dict(data)
@@ -0,0 +1,140 @@
+import csv
+import heapq
+import io
+import json
+import zlib
+from operator import attrgetter
+from sqlalchemy import select, func
+from werkzeug.http import parse_date
+from functools import lru_cache
+from models import db, WISP, ArchivedWISP
+from inventory import upgrade_legacy_inventories
+
+YIELD_PER = 500
+FLUSH_BYTES = 64 * 1024
+
+RECORD_COLUMNS = ['id', 'created_at', 'updated_at']
+
+@lru_cache(maxsize=None)
+def export_schema():
+    """Return (columns, wizard_columns, date_columns).
+
+    Columns are the record metadata followed by every wizard field in step order.
+    Built on first use so importing this module does not load the forms.
+    """
+    from wtforms.fields import DateField
+    from forms import iter_wizard_fields
+    wizard_columns = [name for name, field_class in iter_wizard_fields()]
+    date_columns = {name for name, field_class in iter_wizard_fields() if issubclass(field_class, DateField)}
+    return RECORD_COLUMNS + wizard_columns, wizard_columns, date_columns
+
+def _stream(model):
+    """Rows of model in id order using a server-side cursor, YIELD_PER rows at a time"""
+    stmt = select(model).order_by(model.id).execution_options(yield_per=YIELD_PER, stream_results=True)
+    return db.session.execute(stmt).scalars()
+
+def iter_wisps(include_archived=False):
+    """Iterate every WISP in id order; include_archived merges in the WISPs in
+    the archive database. A WISP in both (an interrupted archive run) is taken
+    from the WISP table, as on its page."""
+    wisps = _stream(WISP)
+    if include_archived:
+        wisps = heapq.merge(wisps, _stream(ArchivedWISP), key=attrgetter('id'))
+    last_id = None
+    for wisp in wisps:
+        if wisp.id != last_id:
+            yield wisp
+        last_id = wisp.id
+
+def archived_count():
+    """Number of WISPs in the archive database, which exports leave out by default"""
+    return db.session.scalar(select(func.count(ArchivedWISP.id)))
+
+def _normalize_date(value):
+    """Dates are stored as HTTP dates by the wizard; export them as ISO dates"""
+    if not value:
+        return value
+    parsed = parse_date(value) if isinstance(value, str) else value
+    return parsed.date().isoformat() if parsed else value
+
+def flatten_wisp(wisp):
+    """Flatten a WISP into a dict with exactly the export_schema() columns as keys"""
+    columns, wizard_columns, date_columns = export_schema()
+    data = upgrade_legacy_inventories(wisp.get_data())
+    record = {
+        'id': wisp.id,
+        'created_at': wisp.created_at.isoformat() if wisp.created_at else None,
+        'updated_at': wisp.updated_at.isoformat() if wisp.updated_at else None
+    }
+    for column in wizard_columns:
+        value = data.get(column)
+        if column in date_columns:
+            value = _normalize_date(value)
+        record[column] = value
+    return record
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+def iter_jsonl(records):
+    for record in records:
+        yield json.dumps(record) + '\n'
+
+def iter_csv(records):
+    columns = export_schema()[0]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow([_csv_value(record[column]) for column in columns])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _encode(chunks):
+    """Encode text chunks, coalescing small ones into FLUSH_BYTES blocks"""
+    pending = []
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b''.join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b''.join(pending)
+
+def _gzip(blocks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_wisps(fmt, compress=False, include_archived=False):
+    """Yield the export of every WISP as encoded byte blocks, with archived
+    WISPs too when include_archived.
+
+    Memory use is bounded by YIELD_PER rows and one output block, regardless
+    of table size.
+    """
+    records = (flatten_wisp(wisp) for wisp in iter_wisps(include_archived))
+    if fmt == 'jsonl':
+        chunks = iter_jsonl(records)
+    elif fmt == 'csv':
+        chunks = iter_csv(records)
+    else:
+        raise ValueError(f'Unsupported export format: {fmt}')
+    blocks = _encode(chunks)
+    return _gzip(blocks) if compress else blocks
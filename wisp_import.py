@@ -0,0 +1,216 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from sqlalchemy import insert, select
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import http_date
+from models import db, WISP, WISPControl, WISPVendor, parse_review_date, content_hash
+from checklists import CONTROL_FIELDS
+from wisp_storage import encode_data
+from inventory import INVENTORIES, parse_inventory, upgrade_legacy_inventories
+from vendor_directory import vendor_names, resolve_vendors
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+# Values accepted as "checked" for BooleanField columns
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'on', 'x'}
+
+class ImportResult:
+    """Counts and per-row errors collected during an import"""
+
+    def __init__(self):
+        self.imported = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_chunk(self, chunk):
+        """Insert a chunk of valid rows, counting the ones that duplicate an existing WISP"""
+        wisp_ids, created = insert_wisps(chunk)
+        self.imported += created
+        self.duplicates += len(wisp_ids) - created
+
+    def add_error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, errors))
+
+def detect_format(filename):
+    """Guess the import format from a file name"""
+    name = (filename or '').lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return None
+
+def iter_rows(stream, fmt):
+    """Yield (row_number, row) pairs from a text stream without reading it all.
+
+    Rows that cannot be parsed are yielded with a string error in place of the dict.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for row_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield row_number, f'Invalid JSON: {e}'
+                continue
+            if not isinstance(row, dict):
+                yield row_number, 'Each line must be a JSON object'
+                continue
+            yield row_number, row
+    else:
+        raise ValueError(f'Unsupported import format: {fmt}')
+
+def _build_formdata(row, form, errors):
+    """Convert a raw CSV/JSON row into formdata for one wizard form.
+
+    Inventory lists that cannot be parsed are reported in errors and left empty.
+    """
+    formdata = MultiDict()
+    for field in form:
+        value = row.get(field.name)
+        if field.type == 'InventoryField':
+            # Arrays in JSON Lines, JSON text in a CSV cell
+            try:
+                rows = parse_inventory(value)
+            except ValueError as e:
+                errors[field.name] = [str(e)]
+                continue
+            for i, inventory_row in enumerate(rows):
+                for column, header, width in INVENTORIES[field.name][1]:
+                    formdata[f'{field.name}-{i}-{column}'] = str(inventory_row.get(column) or '')
+        elif field.type == 'BooleanField':
+            # BooleanField treats any non-empty string as checked
+            if value is True or str(value).strip().lower() in TRUE_VALUES:
+                formdata[field.name] = 'y'
+        else:
+            # Missing columns submit what an untouched wizard field would
+            if value is None:
+                value = field.default if field.default is not None else ''
+            formdata[field.name] = str(value)
+    return formdata
+
+class RowValidator:
+    """Validates rows against every wizard form.
+
+    The form instances are built once and re-processed for each row, since
+    constructing six forms per row dominates import time on large files.
+    """
+
+    def __init__(self):
+        from forms import WIZARD_FORMS  # Loaded on first import, not at app startup
+        self.forms = [form_class(formdata=None, meta={'csrf': False}) for form_class in WIZARD_FORMS]
+
+    def validate(self, row):
+        """Return (wisp_data, errors) where errors maps field names to messages"""
+        wisp_data = {}
+        errors = {}
+        row = upgrade_legacy_inventories(row)
+        for form in self.forms:
+            form.process(_build_formdata(row, form, errors))
+            if not form.validate():
+                errors.update(form.errors)
+            for field in form:
+                value = field.data
+                # Match the format the wizard stores dates in
+                if isinstance(value, date):
+                    value = http_date(value)
+                wisp_data[field.name] = value
+        return wisp_data, errors
+
+def insert_wisps(chunk):
+    """Insert validated rows with their control and vendor rows in one transaction.
+
+    Rows with the same answers as an existing WISP, or as an earlier row of
+    the chunk, are not inserted again. Returns (the WISP id of each row, the
+    number of WISPs created).
+    """
+    hashes = [content_hash(wisp_data) for wisp_data in chunk]
+    ids_by_hash = dict(db.session.execute(
+        select(WISP.content_hash, WISP.id).where(WISP.content_hash.in_(set(hashes)))
+    ).all())
+    new = {}
+    for digest, wisp_data in zip(hashes, chunk):
+        if digest not in ids_by_hash:
+            new.setdefault(digest, wisp_data)
+    if new:
+        ids_by_hash.update(zip(new, _insert_new(list(new), list(new.values()))))
+    db.session.commit()
+    return [ids_by_hash[digest] for digest in hashes], len(new)
+
+def _insert_new(hashes, chunk):
+    """Insert WISP rows with their control and vendor rows; returns the new ids"""
+    rows = [
+        {
+            'company_name': wisp_data['company_name'],
+            'data_blob': encode_data(wisp_data),
+            'review_due_date': parse_review_date(wisp_data.get('annual_review_date')),
+            'content_hash': digest
+        }
+        for digest, wisp_data in zip(hashes, chunk)
+    ]
+    wisp_ids = db.session.scalars(insert(WISP).returning(WISP.id, sort_by_parameter_order=True), rows).all()
+    controls = [
+        {'wisp_id': wisp_id, 'control': field, 'in_place': bool(wisp_data.get(field))}
+        for wisp_id, wisp_data in zip(wisp_ids, chunk)
+        for field in CONTROL_FIELDS
+    ]
+    db.session.execute(insert(WISPControl), controls)
+    names = [list(vendor_names(wisp_data)) for wisp_data in chunk]
+    vendor_ids = resolve_vendors(name for wisp_names in names for field, name in wisp_names)
+    vendor_links = {
+        (wisp_id, field, vendor_ids[name])
+        for wisp_id, wisp_names in zip(wisp_ids, names)
+        for field, name in wisp_names
+    }
+    if vendor_links:
+        db.session.execute(insert(WISPVendor), [
+            {'wisp_id': wisp_id, 'field': field, 'vendor_id': vendor_id}
+            for wisp_id, field, vendor_id in sorted(vendor_links)
+        ])
+    return wisp_ids
+
+def import_wisps(stream, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Import WISPs from a CSV or JSON Lines text stream.
+
+    Valid rows are inserted in chunks, one transaction per chunk. Invalid rows
+    are skipped and reported in the returned ImportResult, and rows with the
+    same answers as an existing WISP are counted as duplicates.
+    """
+    result = ImportResult()
+    validator = RowValidator()
+    chunk = []
+    for row_number, row in iter_rows(stream, fmt):
+        if isinstance(row, str):
+            result.add_error(row_number, {'row': [row]})
+            continue
+        wisp_data, errors = validator.validate(row)
+        if errors:
+            result.add_error(row_number, errors)
+            continue
+        chunk.append(wisp_data)
+        if len(chunk) >= chunk_size:
+            result.add_chunk(chunk)
+            chunk = []
+    if chunk:
+        result.add_chunk(chunk)
+    return result
+
+def open_text_stream(binary_stream, filename=None):
+    """Wrap an uploaded or opened binary file as a decoded text stream"""
+    if (filename or '').lower().endswith('.gz'):
+        binary_stream = gzip.GzipFile(fileobj=binary_stream)
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
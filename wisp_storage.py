@@ -0,0 +1,119 @@
+"""Compact, versioned storage format for the wizard answers in WISP.data_blob.
+
+A blob is one schema version byte followed by the answers as compact JSON,
+zlib-compressed with that version's preset dictionary. The dictionary is a
+typical answer payload, so field names and common values that repeat in every
+row cost only a few bits each.
+
+Dictionaries are frozen once released: to change one, add a new version and
+keep the old dictionary for decoding rows written with it.
+"""
+import json
+import zlib
+
+SCHEMA_VERSION = 2
+
+# Wizard fields with a typical answer, in step order, as of schema version 1
+_FIELDS_V1 = (
+    ('company_name', ''), ('street_address', ''), ('city', ''), ('state', ''), ('zip_code', ''),
+    ('contact_email', ''), ('phone_number', ''), ('website', ''), ('company_size', ''),
+    ('industry', ''), ('prepared_by', ''), ('annual_review_date', ''), ('ein_number', ''),
+    ('efin_number', ''), ('personal_info_types', ''), ('data_sources', ''), ('data_retention', ''),
+    ('data_destruction', False), ('third_party_apps_1', ''), ('third_party_apps_2', ''),
+    ('cloud_providers_1', ''), ('cloud_providers_2', ''), ('data_storage_1', ''),
+    ('data_storage_2', ''), ('email_providers_1', ''), ('email_providers_2', ''),
+    ('crm_systems_1', ''), ('crm_systems_2', ''), ('social_media_contractors_1', ''),
+    ('social_media_contractors_2', ''), ('quickbooks', False), ('adp', False), ('workday', False),
+    ('salesforce', False), ('office365', False), ('google_workspace', False),
+    ('custom_software', ''), ('qualified_individual_designated', False),
+    ('qualified_individual_vendor', None), ('risk_assessment_conducted', False),
+    ('risk_assessment_vendor', None), ('encryption_at_rest', False),
+    ('encryption_at_rest_vendor', None), ('encryption_in_transit', False),
+    ('encryption_in_transit_vendor', None), ('mfa_enabled', False), ('mfa_vendor', None),
+    ('continuous_monitoring', False), ('continuous_monitoring_vendor', None),
+    ('security_awareness_training', False), ('security_awareness_vendor', None),
+    ('assess_providers', False), ('assess_providers_vendor', None), ('annual_wisp_review', False),
+    ('annual_wisp_review_vendor', None), ('wisp_developed', False), ('wisp_developed_vendor', None),
+    ('annual_director_reports', False), ('annual_director_reports_vendor', None),
+    ('annual_disposal_records', False), ('annual_disposal_vendor', None),
+    ('restricted_access_data', False), ('restricted_access_vendor', None),
+    ('complex_passwords_required', False), ('complex_passwords_vendor', None),
+    ('firewall_protection', False), ('firewall_vendor', None), ('ids_enabled', False),
+    ('ids_vendor', None), ('segmented_network', False), ('segmented_network_vendor', None),
+    ('endpoint_security', False), ('endpoint_security_vendor', None),
+    ('third_party_patch_mgmt', False), ('third_party_patch_vendor', None),
+    ('windows_patch_mgmt', False), ('windows_patch_vendor', None), ('antivirus_solution', None),
+    ('endpoint_detection_solution', None), ('intrusion_detection_solution', None),
+    ('backup_solution', None), ('backup_encrypted', False), ('firewall_solution', None),
+    ('encryption_solution', None), ('mfa_solution', None), ('vpn_solution', None),
+    ('password_min_length', ''), ('password_complexity', False),
+    ('password_history_enabled', False), ('password_manager_required', False),
+    ('default_passwords_changed', False), ('password_secure_storage', False),
+    ('password_manager_mfa', False), ('wireless_wpa2_enabled', False),
+    ('wireless_ssid_hidden', False), ('wireless_guest_network', False),
+    ('wireless_admin_password_changed', False), ('wireless_tx_power_reduced', False),
+    ('wireless_wep_disabled', False), ('rmm_solution', None), ('browser_patch_mgmt', False),
+    ('stored_passwords_disabled', False), ('incident_response_printed', False),
+    ('security_training_method', ''), ('unnecessary_software_blocked', False),
+    ('device_inventory_performed', False), ('client_data_access_limited', False),
+    ('client_data_protection_solution', None), ('vendor_list', ''), ('vendor_agreements', False),
+    ('vendor_monitoring', False), ('access_control', False), ('employee_training', False),
+    ('training_frequency', ''), ('security_awareness_method', ''), ('incident_response', False),
+    ('background_checks', False), ('confidentiality_agreements', False),
+    ('employee_access_review', False), ('employee_termination_process', False),
+    ('remote_work_policy', False), ('qualified_individual_name', ''),
+    ('qualified_individual_qualifications', ''), ('qualified_individual_supervisor', ''),
+    ('incident_coordinator_name', ''), ('incident_coordinator_phone', ''),
+    ('incident_team_member_1', ''), ('incident_team_member_1_phone', ''),
+    ('incident_team_member_2', ''), ('incident_team_member_2_phone', ''), ('tech_company', ''),
+    ('tech_company_phone', ''), ('legal_counsel_name', ''), ('legal_counsel_phone', ''),
+    ('insurance_broker', ''), ('insurance_policy', ''), ('annual_penetration_test', False),
+    ('vulnerability_assessments', False), ('system_scans', False),
+    ('security_awareness_testing', False), ('efin_monitoring_process', False),
+    ('efin_status_check_frequency', ''),
+)
+
+# Schema version 2: the fixed PII location fields and the free-text software and
+# vendor lists became the pii_locations, systems and vendors row arrays
+_LEGACY_INVENTORY_FIELDS = {
+    'third_party_apps_1', 'third_party_apps_2', 'cloud_providers_1', 'cloud_providers_2',
+    'data_storage_1', 'data_storage_2', 'email_providers_1', 'email_providers_2',
+    'crm_systems_1', 'crm_systems_2', 'social_media_contractors_1', 'social_media_contractors_2',
+    'custom_software', 'vendor_list'
+}
+_FIELDS_V2 = tuple(field for field in _FIELDS_V1 if field[0] not in _LEGACY_INVENTORY_FIELDS) + (
+    ('pii_locations', [
+        {'category': 'third_party_apps', 'name': '', 'notes': ''},
+        {'category': 'cloud_providers', 'name': '', 'notes': ''},
+        {'category': 'data_storage', 'name': '', 'notes': ''},
+        {'category': 'email_providers', 'name': '', 'notes': ''},
+        {'category': 'crm_systems', 'name': '', 'notes': ''},
+        {'category': 'social_media_contractors', 'name': '', 'notes': ''}
+    ]),
+    ('systems', [{'name': '', 'purpose': ''}]),
+    ('vendors', [{'name': '', 'services': '', 'data_access': ''}]),
+)
+
+def _payload_dictionary(fields):
+    """Build a zlib preset dictionary from (field, typical value) pairs"""
+    return json.dumps(dict(fields), separators=(',', ':')).encode('utf-8')
+
+DICTIONARIES = {
+    1: _payload_dictionary(_FIELDS_V1),
+    2: _payload_dictionary(_FIELDS_V2)
+}
+
+def encode_data(data_dict, version=SCHEMA_VERSION):
+    """Encode wizard answers as a versioned, compressed blob"""
+    payload = json.dumps(data_dict, separators=(',', ':')).encode('utf-8')
+    compressor = zlib.compressobj(level=9, zdict=DICTIONARIES[version])
+    return bytes([version]) + compressor.compress(payload) + compressor.flush()
+
+def decode_data(blob):
+    """Decode a blob written by encode_data, with whichever schema version wrote it"""
+    version = blob[0]
+    if version not in DICTIONARIES:
+        raise ValueError(f'Unknown WISP storage schema version: {version}')
+    decompressor = zlib.decompressobj(zdict=DICTIONARIES[version])
+    payload = decompressor.decompress(blob[1:]) + decompressor.flush()
+    return json.loads(payload)